@@ -0,0 +1,304 @@
+from array import array
+from typing import Dict, List, Union
+
+import numpy as np
+
+# Names of the core columns in Arrow tables and pandas DataFrames (the first 3 for BedContainer).
+CORE_COLUMN_NAMES = ("chrom", "start", "end", "name", "score", "strand")
+# Keys of the Arrow schema metadata written by toArrow.
+_SORTED_KEY = b"biorsl.isSorted"
+_SCHEMA_KEY = b"biorsl.schema"
+
+
+def _importArrow():
+    """
+    Imports *pyarrow*, an optional dependency only needed by the Arrow, pandas and Parquet conversions.
+
+    | Because of its internal function inside the module, it remains private.
+
+    :return: The *pyarrow* module.
+    """
+    try:
+        import pyarrow
+    except ImportError as error:
+        raise ImportError("pyarrow is required to convert BedContainer objects to Arrow, pandas or Parquet "
+                          "(pip install pyarrow).") from error
+    return pyarrow
+
+
+def _int64Array(pa, buffer) -> object:
+    """
+    Wraps a buffer of 64 bits integers in an Arrow array, without copying it.
+
+    | Because of its internal function inside the module, it remains private.
+    """
+    return pa.Array.from_buffers(pa.int64(), len(buffer), [None, pa.py_buffer(buffer)])
+
+
+def _extraColumns(pa, extraFields: List, nExtras: int) -> List:
+    """
+    Splits the extra fields of a chromosome into *nExtras* Arrow string arrays (null where a row has fewer fields). Raw
+    tails are split by Arrow, and rows with a list of extra fields are split in Python.
+
+    | Because of its internal function inside the module, it remains private.
+
+    :param List extraFields: Extra fields of each row (*None*, List or raw tail).
+    :param int nExtras: Number of extra fields.
+    :return List: One string array per extra field.
+    """
+    try:
+        tails = pa.array(extraFields, pa.string())
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        rows = [extras.split("\t") if type(extras) == str else extras for extras in extraFields]
+        return [pa.array([row[position] if row is not None and position < len(row) else None for row in rows],
+                         pa.string()) for position in range(nExtras)]
+
+    lists = pa.compute.split_pattern(tails, "\t")
+    values = lists.flatten()
+    firstValues = lists.offsets.to_numpy()[:-1]
+    lengths = pa.compute.list_value_length(lists).fill_null(0).to_numpy()
+    return [values.take(pa.array(firstValues + position, mask=lengths <= position)) for position in range(nExtras)]
+
+
+def toArrow(container) -> object:
+    """
+    Converts a *BedContainer* to a *pyarrow.Table*, with one record batch per chromosome and the columns:
+
+    - chrom -> Chromosome names (dictionary encoded)
+    - start, end -> Coordinates (int64)
+    - name, score, strand -> Only for *BedContainer6*. Scores not integer (".") are null, and the strand is dictionary encoded
+    - extra0, extra1, ... -> Extra fields (strings), if *addExtras* is *True*. Schema fields are named and typed as in the schema
+
+    The coordinate columns share the memory of the *BedContainer*, without copying it. Since Arrow buffers are
+    immutable, and an array can't be resized while it shares its memory, the *BedContainer* columns are replaced by
+    read-only views of the same memory. They are copied back to arrays at its next change, so the table keeps the
+    values it was created with.
+
+    :param BedContainer container: *BedContainer* to convert.
+    :return pyarrow.Table: The Arrow table.
+    """
+    pa = _importArrow()
+    import pyarrow.compute
+    columnsClass = container._columnsClass
+    nCore = columnsClass.CORE_COLUMNS
+    chrList = container.select_Chromosomes()
+    schema = container.schema
+
+    nExtras = 0
+    if container.addExtras:
+        for chrom in chrList:
+            for extras in container.bedContainer[chrom].extraFields:
+                if extras is not None:
+                    nExtras = max(nExtras, extras.count("\t") + 1 if type(extras) == str else len(extras))
+        if schema is not None:
+            nExtras = max(nExtras, len(schema.fields))
+
+    fields = [pa.field("chrom", pa.dictionary(pa.int32(), pa.string())), pa.field("start", pa.int64()),
+              pa.field("end", pa.int64())]
+    if nCore == 6:
+        fields += [pa.field("name", pa.string()), pa.field("score", pa.int64()),
+                   pa.field("strand", pa.dictionary(pa.int8(), pa.string()))]
+    for position in range(nExtras):
+        if schema is not None and position < len(schema.fields):
+            field, dtype = schema.fields[position]
+            fields.append(pa.field(field, pa.from_numpy_dtype(np.dtype(dtype))))
+        else:
+            fields.append(pa.field("extra{}".format(position), pa.string()))
+    metadata = {_SORTED_KEY: b"1" if container.isSorted else b"0"}
+    if schema is not None:
+        metadata[_SCHEMA_KEY] = schema.name.encode()
+    tableSchema = pa.schema(fields, metadata=metadata)
+
+    chromNames = pa.array(chrList, pa.string())
+    strandNames = pa.array(["+", "-"], pa.string())
+    batches = []
+    for code, chrom in enumerate(chrList):
+        columns = container.bedContainer[chrom]
+        nRows = len(columns)
+        # An array can't be resized while Arrow holds its buffer, so the columns are swapped for read-only views
+        # (copied back to arrays by _makeWritable), instead of sharing a temporary view.
+        for attribute, _ in columnsClass.ARRAY_COLUMNS:
+            column = getattr(columns, attribute)
+            if isinstance(column, array):
+                setattr(columns, attribute, memoryview(column))
+
+        arrays = [pa.DictionaryArray.from_arrays(pa.array(np.full(nRows, code, dtype=np.int32)), chromNames),
+                  _int64Array(pa, columns.sCoords), _int64Array(pa, columns.eCoords)]
+        if nCore == 6:
+            arrays += [pa.array(columns.names, pa.string()),
+                       pa.array([score if type(score) == int else None for score in columns.scores], pa.int64()),
+                       pa.DictionaryArray.from_arrays(
+                           pa.array((np.frombuffer(columns.strands, dtype=np.int8) < 0).astype(np.int8)), strandNames)]
+        if nExtras:
+            extraColumns = _extraColumns(pa, columns.extraFields, nExtras)
+        for position in range(nExtras):
+            if schema is not None and position < len(schema.fields):
+                # Missing values (NaN) are null.
+                arrays.append(pa.array(container._schemaColumn(chrom, schema.fields[position][0]), from_pandas=True))
+            else:
+                arrays.append(extraColumns[position])
+        batches.append(pa.RecordBatch.from_arrays(arrays, schema=tableSchema))
+    return pa.Table.from_batches(batches, schema=tableSchema)
+
+
+def _chromSegments(pa, table) -> Dict[str, List]:
+    """
+    Splits the rows of an Arrow table by chromosome, as slices of its record batches (without copying them), in the
+    order the chromosomes first appear. Batches not grouped by chromosome are reordered (copied) before.
+
+    | Because of its internal function inside the module, it remains private.
+
+    :param pyarrow.Table table: The Arrow table.
+    :return Dict: Chromosome name -> List of record batches.
+    """
+    segments: Dict[str, List] = {}
+    for batch in table.to_batches():
+        if not batch.num_rows:
+            continue
+        chroms = batch.column(batch.schema.get_field_index("chrom"))
+        if chroms.null_count:
+            raise ValueError("Chromosome names can't be null.")
+        if not pa.types.is_dictionary(chroms.type):
+            chroms = chroms.dictionary_encode()
+        names = chroms.dictionary.to_pylist()
+        codes = chroms.indices.to_numpy(zero_copy_only=False)
+
+        runStarts = np.concatenate(([0], np.flatnonzero(codes[1:] != codes[:-1]) + 1))
+        if len(runStarts) > len(np.unique(codes)):
+            # Same chromosome in several runs: stable reorder of the batch, by first appearance of each chromosome.
+            uniqueCodes, firstRows = np.unique(codes, return_index=True)
+            rank = np.empty(uniqueCodes.max() + 1, dtype=np.int64)
+            rank[uniqueCodes[np.argsort(firstRows)]] = np.arange(len(uniqueCodes))
+            order = np.argsort(rank[codes], kind="stable")
+            batch = batch.take(pa.array(order))
+            codes = codes[order]
+            runStarts = np.concatenate(([0], np.flatnonzero(codes[1:] != codes[:-1]) + 1))
+
+        runEnds = np.append(runStarts[1:], len(codes))
+        for start, end in zip(runStarts.tolist(), runEnds.tolist()):
+            segments.setdefault(names[codes[start]], []).append(batch.slice(start, end - start))
+    return segments
+
+
+def _columnValues(segments: List, name: str, pa, dtype=None) -> Union[np.ndarray, List]:
+    """
+    Returns the values of column *name* of the record batches of a chromosome: a numpy array of *dtype* (a view of the
+    Arrow buffer, if possible) or, without *dtype*, a List.
+
+    | Because of its internal function inside the module, it remains private.
+    """
+    columns = [segment.column(segment.schema.get_field_index(name)) for segment in segments]
+    if dtype is None:
+        return [value for column in columns for value in column.to_pylist()]
+    if any(column.null_count for column in columns):
+        raise ValueError("Column {} can't have null values.".format(name))
+    arrays = [column.cast(dtype).to_numpy(zero_copy_only=False) for column in columns]
+    return arrays[0] if len(arrays) == 1 else np.concatenate(arrays)
+
+
+def fromArrow(containerClass, table, schema=None, addExtras: Union[None, bool] = None, trusted: bool = False):
+    """
+    Creates a *BedContainer* from a *pyarrow.Table* with the columns of :py:func:`~bedContainer.BedArrow.toArrow`:
+    "chrom", "start", "end" (and "name", "score", "strand" for *BedContainer6*) and, after them, the extra fields (all
+    other columns, in their order). Rows can be in any order, but are grouped by chromosome.
+
+    The coordinate columns share the memory of the Arrow table (when they are int64 without nulls), without copying
+    it. They are copied to arrays at the first change of the *BedContainer*.
+
+    :param type containerClass: *BedContainer* class to create.
+    :param pyarrow.Table table: The Arrow table.
+    :param None,str,BedSchema schema: Schema of the extra fields. (default the schema saved by *toArrow*, if any)
+    :param None,bool addExtras: *True* to keep the extra fields. (default *True* if the table has extra columns)
+    :param bool trusted: *True* to skip the coordinate rules (not negative, start lower than end). (default *False*)
+    :return: The new *BedContainer*.
+    """
+    pa = _importArrow()
+    import pyarrow.compute
+    columnsClass = containerClass._columnsClass
+    nCore = columnsClass.CORE_COLUMNS
+    coreNames = CORE_COLUMN_NAMES[:nCore]
+    missing = [name for name in coreNames if name not in table.column_names]
+    if missing:
+        raise ValueError("Columns {} are missing.".format(", ".join(missing)))
+    extraNames = [name for name in table.column_names if name not in coreNames]
+
+    metadata = table.schema.metadata or {}
+    if schema is None and _SCHEMA_KEY in metadata:
+        schema = metadata[_SCHEMA_KEY].decode()
+    if addExtras is None:
+        addExtras = bool(extraNames)
+    container = containerClass(addExtras, schema)
+    schema = container.schema
+
+    parsedColumns: Dict[str, Dict] = {}
+    for chrom, segments in _chromSegments(pa, table).items():
+        sCoords = _columnValues(segments, "start", pa, pa.int64())
+        eCoords = _columnValues(segments, "end", pa, pa.int64())
+        if not trusted:
+            invalid = np.flatnonzero((sCoords < 0) | (eCoords <= sCoords))
+            if len(invalid):
+                columnsClass._checkCoords(int(sCoords[invalid[0]]), int(eCoords[invalid[0]]))
+
+        container._addChr(chrom)
+        columns = container.bedContainer[chrom]
+        columns.sCoords = memoryview(sCoords).cast("B").cast("q")
+        columns.eCoords = memoryview(eCoords).cast("B").cast("q")
+        nRows = len(sCoords)
+
+        if nCore == 6:
+            names = _columnValues(segments, "name", pa)
+            if None in names:
+                raise ValueError("Column name can't have null values.")
+            columns.names = [name if type(name) == str else str(name) for name in names]
+            scores = segments
+            if pa.types.is_floating(segments[0].schema.field("score").type):
+                # Integer columns with nulls are float in pandas.
+                scores = [segment.set_column(segment.schema.get_field_index("score"), "score",
+                                             segment.column(segment.schema.get_field_index("score")).cast(pa.int64()))
+                          for segment in segments]
+            columns.scores = [score if type(score) == int else "." for score in _columnValues(scores, "score", pa)]
+            strands = pa.chunked_array([segment.column(segment.schema.get_field_index("strand"))
+                                        for segment in segments]).combine_chunks()
+            if not pa.types.is_dictionary(strands.type):
+                strands = strands.dictionary_encode()
+            dictionaryCodes = np.array([columnsClass.STRAND_CODES.get(strand, 0)
+                                        for strand in strands.dictionary.to_pylist()] + [0], dtype=np.int8)
+            # Null strands take the last code (0), refused as the unknown ones.
+            strandCodes = dictionaryCodes[strands.indices.fill_null(len(dictionaryCodes) - 1).to_numpy()]
+            if not strandCodes.all():
+                raise ValueError("Strand must to be \'+\' or \'-\'")
+            columns.strands = array('b', strandCodes.tobytes())
+
+        if addExtras and extraNames:
+            # Values are converted to text by Arrow, and joined in the raw tail of the extra fields.
+            texts = [pa.compute.cast(pa.chunked_array([segment.column(segment.schema.get_field_index(name))
+                                                       for segment in segments]), pa.string())
+                     for name in extraNames]
+            if not any(text.null_count for text in texts):
+                tails = pa.compute.binary_join_element_wise(*texts, "\t").to_pylist()
+            else:
+                tails = []
+                for values in zip(*[text.to_pylist() for text in texts]):
+                    # Trailing nulls are missing extra fields, and other nulls are written as ".".
+                    nFields = len(values)
+                    while nFields and values[nFields - 1] is None:
+                        nFields -= 1
+                    tails.append("\t".join("." if value is None else value for value in values[:nFields])
+                                 if nFields else None)
+            columns.extraFields = tails
+            if schema is not None:
+                # Typed schema columns are kept, so they are not parsed again from the extra fields.
+                parsedColumns[chrom] = {field: _columnValues(segments, field, pa, pa.from_numpy_dtype(np.dtype(dtype)))
+                                        for position, (field, dtype) in enumerate(schema.fields)
+                                        if position < len(extraNames) and extraNames[position] == field and
+                                        not any(segment.column(segment.schema.get_field_index(field)).null_count
+                                                for segment in segments)}
+        else:
+            columns.extraFields = [None] * nRows
+        container.entryCounts += nRows
+
+    container._invalidateIndexes()
+    for chrom, fields in parsedColumns.items():
+        container._schemaColumns[chrom] = {field: (values, len(values)) for field, values in fields.items()}
+    container.isSorted = metadata.get(_SORTED_KEY) == b"1"
+    return container
@@ -0,0 +1,821 @@
+from array import array
+from itertools import compress, islice, repeat
+from operator import le
+from typing import Generator, Iterable, Iterator, List, Tuple, Union
+
+from bedEntry.BedEntry import BedEntry
+from bedEntry.BedEntry6 import BedEntry6
+
+import numpy as np
+
+
+def _digitValues(buffer: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parses, in one vectorized pass, the integers written as plain digits in *buffer* (from *starts* up to *ends*).
+
+    | Because of its internal function inside the module, it remains private.
+
+    :param np.ndarray buffer: ASCII bytes of the Bed File lines.
+    :param np.ndarray starts: Offset of the first character of each field.
+    :param np.ndarray ends: Offset following the last character of each field.
+    :return tuple: The int64 values, and *True* for the fields that are plain digits (not empty, nor too long).
+    """
+    widths = ends - starts
+    maxWidth = min(int(widths.max()), 18) if len(widths) else 0
+    # One row of right aligned digits per integer, with zeros before its first digit.
+    positions = ends[:, np.newaxis] + np.arange(-maxWidth, 0)
+    digits = buffer[np.maximum(positions, 0)].astype(np.int64) - ord("0")
+    digits = np.where(positions >= starts[:, np.newaxis], digits, 0)
+    isNumber = (widths >= 1) & (widths <= maxWidth) & ((digits >= 0) & (digits <= 9)).all(axis=1)
+    return digits @ 10 ** np.arange(maxWidth - 1, -1, -1, dtype=np.int64), isNumber
+
+
+def _parseDigits(buffer: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Parses the integers written as plain digits in *buffer* (see *_digitValues*). A *ValueError* is raised if a field
+    is empty, too long, or has other characters (e.g. a sign).
+
+    | Because of its internal function inside the module, it remains private.
+
+    :param np.ndarray buffer: ASCII bytes of the Bed File lines.
+    :param np.ndarray starts: Offset of the first digit of each integer.
+    :param np.ndarray ends: Offset following the last digit of each integer.
+    :return np.ndarray: The int64 values.
+    """
+    values, isNumber = _digitValues(buffer, starts, ends)
+    if not isNumber.all():
+        raise ValueError("Coordinates are not plain integers.")
+    return values
+
+
+def _sliceFields(text: str, starts: np.ndarray, ends: np.ndarray) -> List[str]:
+    """
+    Returns the fields of *text* from *starts* up to *ends*.
+
+    | Because of its internal function inside the module, it remains private.
+
+    :param str text: Bed File lines.
+    :param np.ndarray starts: Offset of the first character of each field.
+    :param np.ndarray ends: Offset following the last character of each field.
+    :return List[str]: The fields.
+    """
+    return [text[start:end] for start, end in zip(starts.tolist(), ends.tolist())]
+
+
+class BedColumns(object):
+    """
+    Columnar storage of all the Bed rows (3 columns, plus possibly Extra Fields) of a single chromosome.
+
+    Start and end coordinates are kept in contiguous typed arrays, instead of one *BedEntry* object per row. The
+    *BedEntry* objects are only created when a row is requested (indexing or iteration), so changing a returned
+    *BedEntry* does not change the stored row.
+
+    The typed columns can also be read-only buffers (e.g. memory mapped from a binary snapshot). They are copied to
+    arrays at the first change.
+
+    """
+
+    CORE_COLUMNS = 3
+    ARRAY_COLUMNS = (("sCoords", "q"), ("eCoords", "q"))
+    # Fields that can be searched (see fieldValues) and their columns.
+    FIELD_COLUMNS = {"sCoord": "sCoords", "eCoord": "eCoords"}
+    OBJECT_COLUMNS = ("extraFields",)
+    _PARSE_ERRORS = (ValueError, IndexError, OverflowError)
+
+    def __init__(self, chrom: str) -> None:
+        """
+        Creates an empty column storage for one chromosome.
+
+        :param str chrom: The chromosome name of all rows stored.
+        """
+        self.chrom: str = chrom
+        self.sCoords: array = array('q')
+        self.eCoords: array = array('q')
+        # Extra fields of each row: None, a List, or the raw tail of its Bed File line (split only when read).
+        self.extraFields: List[Union[None, List, str]] = []
+
+    ##################
+    ##  Functions   ##
+    ##################
+
+    def _makeWritable(self) -> None:
+        """
+        Copies to arrays the typed columns which are read-only buffers, before changing them.
+        """
+        for attribute, typecode in self.ARRAY_COLUMNS:
+            column = getattr(self, attribute)
+            if not isinstance(column, array):
+                writable = array(typecode)
+                writable.frombytes(memoryview(column).cast("B"))
+                setattr(self, attribute, writable)
+
+    @staticmethod
+    def _checkCoords(sCoord: int, eCoord: int) -> None:
+        """
+        Applies the same coordinate rules of *BedEntry* setters, raising the same errors.
+
+        :param int sCoord: Start coordinate to check
+        :param int eCoord: End coordinate to check
+        """
+        if sCoord < 0:
+            raise ValueError("Start Position {} is negative.".format(sCoord))
+        if eCoord < 0:
+            raise ValueError("Start Position {} is negative.".format(eCoord))
+        if sCoord >= eCoord:
+            raise ValueError("Start Coordinate higher or equal than End Coordinate")
+
+    def appendFields(self, fields: List, addExtras: bool) -> None:
+        """
+        Validates and appends one row given by its fields, without the chromosome:
+
+        | ["*sCoord*", "*eCoord*", *extraField1*, *extraField2*, ...]
+
+        :param List fields: Row fields (strings or integers), following the chromosome column.
+        :param bool addExtras: *True* if the fields after the core columns are stored as extra fields.
+        """
+        sCoord = int(fields[0])
+        eCoord = int(fields[1])
+        self._checkCoords(sCoord, eCoord)
+        self._makeWritable()
+        self.sCoords.append(sCoord)
+        self.eCoords.append(eCoord)
+        self.extraFields.append(list(fields[2:]) if addExtras and len(fields) > 2 else None)
+
+    def extendLines(self, rows: List[List[str]], lineNumbers: List[Union[int, str]], addExtras: bool,
+                    trusted: bool = False) -> None:
+        """
+        Parses and appends, in one batch, the rows of Bed File lines of this chromosome. Each row is given by all its
+        fields (chromosome included), and its line number (or a label locating it) in *lineNumbers*.
+
+        If *trusted* is *True* the coordinate rules of *BedEntry* setters (not negative, start lower than end) are not
+        checked. Lines that can't be parsed are always reported, with their line number, in a *ValueError*. No row is
+        appended if one of them is malformed.
+
+        :param List rows: Fields of each Bed File line.
+        :param List[int,str] lineNumbers: Line number (or label) of each row, used to report malformed lines.
+        :param bool addExtras: *True* if the fields after the core columns are stored as extra fields.
+        :param bool trusted: *True* to skip the coordinate rules. (default *False*)
+        """
+        try:
+            parsed = self._parseLines(rows, addExtras, trusted)
+        except self._PARSE_ERRORS:
+            # Find the first malformed line to report it.
+            for lineNumber, fields in zip(lineNumbers, rows):
+                if len(fields) < self.CORE_COLUMNS:
+                    raise ValueError("Malformed Bed line {}: {} columns found, {} expected."
+                                     .format(lineNumber, len(fields), self.CORE_COLUMNS))
+                try:
+                    self._parseLines([fields], addExtras, trusted)
+                except self._PARSE_ERRORS as error:
+                    raise ValueError("Malformed Bed line {}: {}".format(lineNumber, error)) from error
+            raise
+        self._extendParsed(parsed)
+
+    def _parseLines(self, rows: List[List[str]], addExtras: bool, trusted: bool) -> List:
+        """
+        Parses the fields of Bed File lines into new columns, ready to be added by *_extendParsed*.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param List rows: Fields of each Bed File line.
+        :param bool addExtras: *True* if the fields after the core columns are stored as extra fields.
+        :param bool trusted: *True* to skip the coordinate rules.
+        :return List: The new columns.
+        """
+        sCoords = array('q', [int(fields[1]) for fields in rows])
+        eCoords = array('q', [int(fields[2]) for fields in rows])
+        if not trusted:
+            for sCoord, eCoord in zip(sCoords, eCoords):
+                self._checkCoords(sCoord, eCoord)
+        if addExtras:
+            # Lines are split up to the core columns, so a single field after them is the raw tail of extra fields.
+            nCore = self.CORE_COLUMNS
+            extraFields = [None if len(fields) <= nCore else fields[nCore] if len(fields) == nCore + 1
+                           else fields[nCore:] for fields in rows]
+        else:
+            extraFields = [None] * len(rows)
+        return [sCoords, eCoords, extraFields]
+
+    @classmethod
+    def _parseColumns(cls, text: str, buffer: np.ndarray, starts: np.ndarray, ends: np.ndarray, addExtras: bool,
+                      trusted: bool) -> List:
+        """
+        Parses, in bulk, Bed File lines all with the same number of fields into new columns, as *_parseLines*. The lines
+        are given by their text, its ASCII bytes in *buffer*, and the offsets where each field starts and ends (one
+        row per line, one column per field).
+
+        Only coordinates written as plain digits are parsed, and the coordinate rules are checked in one vectorized pass.
+        Otherwise a *ValueError* is raised without the malformed line, which *extendLines* reports.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param str text: Bed File lines.
+        :param np.ndarray buffer: ASCII bytes of *text*.
+        :param np.ndarray starts: Offset of the first character of each field.
+        :param np.ndarray ends: Offset following the last character of each field.
+        :param bool addExtras: *True* if the fields after the core columns are stored as extra fields.
+        :param bool trusted: *True* to skip the coordinate rules.
+        :return List: The new columns.
+        """
+        sCoords = _parseDigits(buffer, starts[:, 1], ends[:, 1])
+        eCoords = _parseDigits(buffer, starts[:, 2], ends[:, 2])
+        # Digits are never negative, so only the order of coordinates is left to check.
+        if not trusted and (sCoords >= eCoords).any():
+            raise ValueError("Start Coordinate higher or equal than End Coordinate")
+        nCore = cls.CORE_COLUMNS
+        if addExtras and starts.shape[1] > nCore:
+            # Extra fields are kept as the raw tail of the line, as *_parseLines*.
+            extraFields = _sliceFields(text, starts[:, nCore], ends[:, -1])
+        else:
+            extraFields = [None] * len(sCoords)
+        return [array('q', sCoords.tobytes()), array('q', eCoords.tobytes()), extraFields]
+
+    def _extendParsed(self, parsed: List) -> None:
+        """
+        Appends the columns returned by *_parseLines* or *_parseColumns*.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param List parsed: The new columns.
+        """
+        self._makeWritable()
+        self.sCoords.extend(parsed[0])
+        self.eCoords.extend(parsed[1])
+        self.extraFields.extend(parsed[2])
+
+    def appendEntry(self, obj: BedEntry) -> None:
+        """
+        Appends the values of a *BedEntry* object, which were already validated by its setters.
+
+        :param BedEntry obj: BedEntry object to store.
+        """
+        self._makeWritable()
+        self.sCoords.append(obj.sCoord)
+        self.eCoords.append(obj.eCoord)
+        extras = obj._extras
+        self.extraFields.append((extras if type(extras) == str else list(extras)) if extras else None)
+
+    def appendRowFrom(self, other: 'BedColumns', index: int) -> None:
+        """
+        Appends a copy of the row in position *index* of *other* (a column storage of the same class).
+
+        :param BedColumns other: Column storage to copy from.
+        :param int index: Row position in *other*.
+        """
+        self._makeWritable()
+        self.sCoords.append(other.sCoords[index])
+        self.eCoords.append(other.eCoords[index])
+        self.extraFields.append(other.extraFields[index])
+
+    def appendPieceFrom(self, other: 'BedColumns', index: int, sCoord: int, eCoord: int) -> None:
+        """
+        Appends a copy of the row in position *index* of *other*, with its coordinates replaced by the ones of a piece of
+        it. The piece coordinates are not checked, so they must be inside the row and *sCoord* lower than *eCoord*.
+
+        :param BedColumns other: Column storage to copy from.
+        :param int index: Row position in *other*.
+        :param int sCoord: Start coordinate of the piece.
+        :param int eCoord: End coordinate of the piece.
+        """
+        self.appendRowFrom(other, index)
+        self.sCoords[-1] = sCoord
+        self.eCoords[-1] = eCoord
+
+    def entry(self, index: int) -> BedEntry:
+        """
+        Builds the *BedEntry* object of the row in position *index*.
+
+        :param int index: Row position in the chromosome.
+        :return BedEntry: A new BedEntry object with the row values.
+        """
+        # Stored values were validated when added, so setters are skipped.
+        return BedEntry.fromValidated(self.chrom, self.sCoords[index], self.eCoords[index], self._entryExtras(index))
+
+    def _entryExtras(self, index: int) -> Union[tuple, str]:
+        """
+        Returns the extra fields of the row in position *index*, for a *BedEntry*: a tuple, or the raw tail of the Bed
+        File line if not split yet.
+
+        :param int index: Row position in the chromosome.
+        :return tuple,str: Extra fields in their order.
+        """
+        extras = self.extraFields[index]
+        if extras is None:
+            return ()
+        if type(extras) == str:
+            return extras
+        return tuple(extras)
+
+    @staticmethod
+    def _extrasTuple(extras: Union[None, List, str]) -> tuple:
+        """
+        Returns the extra fields of a row as a tuple, splitting a raw tail of a Bed File line.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param None,List,str extras: Extra fields of the row.
+        :return tuple: Extra fields in their order.
+        """
+        if extras is None:
+            return ()
+        if type(extras) == str:
+            return tuple(extras.split("\t"))
+        return tuple(extras)
+
+    @staticmethod
+    def _extraField(extras: Union[None, List, str], field: int) -> Union[None, str]:
+        """
+        Returns the extra field in position *field* of a row extra fields (*None* if missing), splitting a raw tail only
+        up to that field.
+
+        :param None,List,str extras: Extra fields of the row.
+        :param int field: Extra field position.
+        :return: The extra field value.
+        """
+        if extras is None:
+            return None
+        if type(extras) == str:
+            extras = extras.split("\t", field + 1)
+        return extras[field] if field < len(extras) else None
+
+    def matches(self, index: int, obj: BedEntry) -> bool:
+        """
+        Question if the row in position *index* is equal to *obj*, with the same rules of *BedEntry.__eq__*.
+
+        :param int index: Row position in the chromosome.
+        :param BedEntry obj: BedEntry object to compare with.
+        :return bool: *True* if both are equal, *False* otherwise.
+        """
+        return self.sCoords[index] == obj.sCoord and self.eCoords[index] == obj.eCoord
+
+    def fieldValues(self, field: Union[str, int], start: int = 0) -> Iterable:
+        """
+        Returns the values of a field for the rows from position *start*. The field is a name of *FIELD_COLUMNS*
+        ("sCoord", "eCoord" and, in 6 columns, "name", "score" and "strand", as stored) or the position of an extra field
+        (*None* for rows without it).
+
+        :param str,int field: Field name or extra field position.
+        :param int start: First row position. (default 0)
+        :return Iterable: The field values.
+        """
+        if isinstance(field, int):
+            extraField = self._extraField
+            return [extraField(extras, field) for extras in islice(self.extraFields, start, None)]
+        if field not in self.FIELD_COLUMNS:
+            raise ValueError("{} is not a searchable field.".format(field))
+        return islice(getattr(self, self.FIELD_COLUMNS[field]), start, None)
+
+    def fieldValue(self, field: Union[str, int], index: int) -> object:
+        """
+        Returns the value of a field (see :py:meth:`~bedContainer.BedColumns.BedColumns.fieldValues`) in the row in
+        position *index*.
+
+        :param str,int field: Field name or extra field position.
+        :param int index: Row position in the chromosome.
+        :return: The field value.
+        """
+        if isinstance(field, int):
+            return self._extraField(self.extraFields[index], field)
+        return getattr(self, self.FIELD_COLUMNS[field])[index]
+
+    def rowKey(self, index: int) -> tuple:
+        """
+        Returns the values of the row in position *index* compared by *BedEntry.__eq__*, as a hashable tuple.
+
+        :param int index: Row position in the chromosome.
+        :return tuple: (*sCoord*, *eCoord*)
+        """
+        return self.sCoords[index], self.eCoords[index]
+
+    @staticmethod
+    def entryKey(obj: BedEntry) -> tuple:
+        """
+        Returns the values of *obj* compared by *BedEntry.__eq__*, in the format of
+        :py:meth:`~bedContainer.BedColumns.BedColumns.rowKey`.
+
+        :param BedEntry obj: BedEntry object.
+        :return tuple: (*sCoord*, *eCoord*)
+        """
+        return obj.sCoord, obj.eCoord
+
+    def find(self, obj: BedEntry) -> int:
+        """
+        Returns the position of the first row equal to *obj*, or -1 if there is none.
+
+        :param BedEntry obj: BedEntry object to search.
+        :return int: Row position, or -1.
+        """
+        sCoord = obj.sCoord
+        sCoords = self.sCoords
+        for index in range(len(sCoords)):
+            if sCoords[index] == sCoord and self.matches(index, obj):
+                return index
+        return -1
+
+    def pop(self, index: int) -> None:
+        """
+        Removes the row in position *index*.
+
+        :param int index: Row position in the chromosome.
+        """
+        self._makeWritable()
+        del self.sCoords[index]
+        del self.eCoords[index]
+        del self.extraFields[index]
+
+    def compress(self, selectors: List[bool]) -> "BedColumns":
+        """
+        Returns a new column storage with only the rows whose selector is *True*, keeping their order.
+
+        :param List[bool] selectors: One selector per row.
+        :return BedColumns: The selected rows.
+        """
+        columns = type(self)(self.chrom)
+        for attribute, typecode in self.ARRAY_COLUMNS:
+            setattr(columns, attribute, array(typecode, compress(getattr(self, attribute), selectors)))
+        for attribute in self.OBJECT_COLUMNS:
+            setattr(columns, attribute, list(compress(getattr(self, attribute), selectors)))
+        return columns
+
+    def take(self, rows: List[int]) -> "BedColumns":
+        """
+        Returns a new column storage with copies of the rows in positions *rows*, in that order (a row may be repeated).
+
+        :param List[int] rows: Row positions.
+        :return BedColumns: The copied rows.
+        """
+        columns = type(self)(self.chrom)
+        for attribute, typecode in self.ARRAY_COLUMNS:
+            values = getattr(self, attribute)
+            setattr(columns, attribute, array(typecode, [values[row] for row in rows]))
+        for attribute in self.OBJECT_COLUMNS:
+            values = getattr(self, attribute)
+            setattr(columns, attribute, [values[row] for row in rows])
+        return columns
+
+    def reorder(self, order: List[int]) -> None:
+        """
+        Rearranges all rows, so that the new row *i* is the old row *order[i]*.
+
+        :param List[int] order: A permutation of the row positions.
+        """
+        sCoords = self.sCoords
+        eCoords = self.eCoords
+        extraFields = self.extraFields
+        self.sCoords = array('q', [sCoords[i] for i in order])
+        self.eCoords = array('q', [eCoords[i] for i in order])
+        self.extraFields = [extraFields[i] for i in order]
+
+    def sortKeys(self) -> List[int]:
+        """
+        Returns the sort key of every row: the start and end coordinates packed in a single integer, so keys are
+        compared as (*sCoord*, *eCoord*) tuples but much faster.
+
+        :return List[int]: Sort key of each row.
+        """
+        eCoords = self.eCoords
+        if not eCoords:
+            return []
+        step = max(eCoords) + 1
+        return [sCoord * step + eCoord for sCoord, eCoord in zip(self.sCoords, eCoords)]
+
+    def sort(self) -> None:
+        """
+        Sorts the rows by start coordinate (*sCoord*), then by end coordinate (*eCoord*) (see
+        :py:meth:`~bedContainer.BedColumns.BedColumns.sortKeys`). Rows with the same keys keep their relative order
+        (stable sort). Rows already sorted are left untouched.
+        """
+        keys = self.sortKeys()
+        if all(map(le, keys, islice(keys, 1, None))):
+            return
+        self.reorder(sorted(range(len(keys)), key=keys.__getitem__))
+
+    def coreLine(self, index: int) -> str:
+        """
+        Returns the core columns of the row in position *index*, as in *str(BedEntry)*.
+
+        :param int index: Row position in the chromosome.
+        :return str: Tab separated core columns.
+        """
+        return "{}\t{}\t{}".format(self.chrom, self.sCoords[index], self.eCoords[index])
+
+    def _coreColumns(self) -> List[Iterable]:
+        """
+        Returns the core columns, in the order of a Bed File line, to be read together with *zip*.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :return List: One iterable per core column.
+        """
+        return [repeat(self.chrom), self.sCoords, self.eCoords]
+
+    def rows(self, addExtras: bool = False) -> Iterator[tuple]:
+        """
+        Returns an iterator over the rows as tuples of the core columns (values as in *str(BedEntry)*), without creating
+        *BedEntry* objects.
+
+        :param bool addExtras: *True* to add the extra fields (tuple) as last value. (default *False*)
+        :return Iterator: Row tuples.
+        """
+        if addExtras:
+            return zip(*self._coreColumns(), map(self._extrasTuple, self.extraFields))
+        return zip(*self._coreColumns())
+
+    def line(self, index: int, addExtras: bool) -> str:
+        """
+        Returns the Bed File line (without the new line character) of the row in position *index*.
+
+        :param int index: Row position in the chromosome.
+        :param bool addExtras: *True* to write the extra fields after the core columns.
+        :return str: Bed File line.
+        """
+        core = self.coreLine(index)
+        extras = self.extraFields[index]
+        if addExtras and extras:
+            return "{}\t{}".format(core, extras if type(extras) == str else "\t".join(extras))
+        return core
+
+    ###########################
+    ##  Build-in Functions   ##
+    ###########################
+
+    def __iter__(self) -> Generator[BedEntry, None, None]:
+        # One pass over the columns, instead of indexing each of them per row (see entry).
+        fromValidated = BedEntry.fromValidated
+        chrom = self.chrom
+        for sCoord, eCoord, extras in zip(self.sCoords, self.eCoords, self.extraFields):
+            yield fromValidated(chrom, sCoord, eCoord,
+                                () if extras is None else extras if type(extras) == str else tuple(extras))
+
+    def __len__(self) -> int:
+        return len(self.sCoords)
+
+
+class BedColumns6(BedColumns):
+    """
+    Columnar storage of all the Bed rows (6 columns, plus possibly Extra Fields) of a single chromosome.
+
+    The strand is stored as one byte per row (+1 for "+" and -1 for "-").
+
+    """
+
+    CORE_COLUMNS = 6
+    ARRAY_COLUMNS = BedColumns.ARRAY_COLUMNS + (("strands", "b"),)
+    OBJECT_COLUMNS = BedColumns.OBJECT_COLUMNS + ("names", "scores")
+    FIELD_COLUMNS = dict(BedColumns.FIELD_COLUMNS, name="names", score="scores", strand="strands")
+    STRAND_CODES = {"+": 1, "-": -1}
+    STRAND_NAMES = {1: "+", -1: "-"}
+
+    def __init__(self, chrom: str) -> None:
+        super().__init__(chrom)
+        self.names: List[str] = []
+        self.scores: List[Union[int, str]] = []
+        self.strands: array = array('b')
+
+    ##################
+    ##  Functions   ##
+    ##################
+
+    def appendFields(self, fields: List, addExtras: bool) -> None:
+        """
+        Validates and appends one row given by its fields, without the chromosome:
+
+        | ["*sCoord*", "*eCoord*", "*name*", "*score*", "*strand*", *extraField1*, *extraField2*, ...]
+
+        :param List fields: Row fields (strings or integers), following the chromosome column.
+        :param bool addExtras: *True* if the fields after the core columns are stored as extra fields.
+        """
+        sCoord = int(fields[0])
+        eCoord = int(fields[1])
+        self._checkCoords(sCoord, eCoord)
+        name = fields[2]
+        if type(name) != str:
+            raise ValueError("Name {} is not a string type.".format(name))
+        score = fields[3]
+        strand = self.STRAND_CODES.get(fields[4])
+        if strand is None:
+            raise ValueError("Strand must to be \'+\' or \'-\'")
+
+        self._makeWritable()
+        self.sCoords.append(sCoord)
+        self.eCoords.append(eCoord)
+        self.names.append(name)
+        self.scores.append(score if type(score) == int else ".")
+        self.strands.append(strand)
+        self.extraFields.append(list(fields[5:]) if addExtras and len(fields) > 5 else None)
+
+    def _parseLines(self, rows: List[List[str]], addExtras: bool, trusted: bool) -> List:
+        """
+        Parses the fields of Bed File lines into new columns, ready to be added by *_extendParsed*.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param List rows: Fields of each Bed File line.
+        :param bool addExtras: *True* if the fields after the core columns are stored as extra fields.
+        :param bool trusted: *True* to skip the coordinate rules.
+        :return List: The new columns.
+        """
+        parsed = super()._parseLines(rows, addExtras, trusted)
+        strandCodes = self.STRAND_CODES
+        strands = [strandCodes.get(fields[5]) for fields in rows]
+        if None in strands:
+            raise ValueError("Strand must to be \'+\' or \'-\'")
+        names = [fields[3] for fields in rows]
+        # Scores written as plain digits are integers, and the others (e.g. ".") are "." as in the BedEntry6 setter.
+        scores = [int(fields[4]) if fields[4].isascii() and fields[4].isdigit() else "." for fields in rows]
+        return parsed + [names, scores, array('b', strands)]
+
+    @classmethod
+    def _parseColumns(cls, text: str, buffer: np.ndarray, starts: np.ndarray, ends: np.ndarray, addExtras: bool,
+                      trusted: bool) -> List:
+        """
+        Parses, in bulk, Bed File lines all with the same number of fields into new columns (see
+        :py:meth:`~bedContainer.BedColumns.BedColumns._parseColumns`).
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param str text: Bed File lines.
+        :param np.ndarray buffer: ASCII bytes of *text*.
+        :param np.ndarray starts: Offset of the first character of each field.
+        :param np.ndarray ends: Offset following the last character of each field.
+        :param bool addExtras: *True* if the fields after the core columns are stored as extra fields.
+        :param bool trusted: *True* to skip the coordinate rules.
+        :return List: The new columns.
+        """
+        parsed = super()._parseColumns(text, buffer, starts, ends, addExtras, trusted)
+        strandChars = buffer[starts[:, 5]]
+        isPlus = strandChars == ord("+")
+        if ((ends[:, 5] - starts[:, 5]) != 1).any() or not (isPlus | (strandChars == ord("-"))).all():
+            raise ValueError("Strand must to be \'+\' or \'-\'")
+        strands = np.where(isPlus, cls.STRAND_CODES["+"], cls.STRAND_CODES["-"]).astype(np.int8)
+        # Scores written as plain digits are integers, and the others "." as in *_parseLines*.
+        values, isNumber = _digitValues(buffer, starts[:, 4], ends[:, 4])
+        if isNumber.all():
+            scores = values.tolist()
+        elif not isNumber.any():
+            scores = ["."] * len(values)
+        else:
+            scores = np.where(isNumber, values.astype(object), ".").tolist()
+        return parsed + [_sliceFields(text, starts[:, 3], ends[:, 3]), scores, array('b', strands.tobytes())]
+
+    def _extendParsed(self, parsed: List) -> None:
+        """
+        Appends the columns returned by *_parseLines* or *_parseColumns*.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param List parsed: The new columns.
+        """
+        super()._extendParsed(parsed)
+        self.names.extend(parsed[3])
+        self.scores.extend(parsed[4])
+        self.strands.extend(parsed[5])
+
+    def appendEntry(self, obj: BedEntry6) -> None:
+        """
+        Appends the values of a *BedEntry6* object, which were already validated by its setters.
+
+        :param BedEntry6 obj: BedEntry6 object to store.
+        """
+        if not isinstance(obj, BedEntry6):
+            raise ValueError("{} is not a BedEntry6 object.".format(obj))
+        super().appendEntry(obj)
+        self.names.append(obj.name)
+        self.scores.append(obj.score)
+        self.strands.append(self.STRAND_CODES[obj.strand])
+
+    def appendRowFrom(self, other: 'BedColumns6', index: int) -> None:
+        """
+        Appends a copy of the row in position *index* of *other* (a column storage of the same class).
+
+        :param BedColumns6 other: Column storage to copy from.
+        :param int index: Row position in *other*.
+        """
+        super().appendRowFrom(other, index)
+        self.names.append(other.names[index])
+        self.scores.append(other.scores[index])
+        self.strands.append(other.strands[index])
+
+    def entry(self, index: int) -> BedEntry6:
+        """
+        Builds the *BedEntry6* object of the row in position *index*.
+
+        :param int index: Row position in the chromosome.
+        :return BedEntry6: A new BedEntry6 object with the row values.
+        """
+        # Stored values were validated when added, so setters are skipped.
+        return BedEntry6.fromValidated(self.chrom, self.sCoords[index], self.eCoords[index], self.names[index],
+                                       self.scores[index], self.STRAND_NAMES[self.strands[index]],
+                                       self._entryExtras(index))
+
+    def strand(self, index: int) -> str:
+        """
+        Returns the strand ("+" or "-") of the row in position *index*.
+
+        :param int index: Row position in the chromosome.
+        :return str: Row strand.
+        """
+        return self.STRAND_NAMES[self.strands[index]]
+
+    def matches(self, index: int, obj: BedEntry6) -> bool:
+        """
+        Question if the row in position *index* is equal to *obj*, with the same rules of *BedEntry6.__eq__*.
+
+        :param int index: Row position in the chromosome.
+        :param BedEntry6 obj: BedEntry6 object to compare with.
+        :return bool: *True* if both are equal, *False* otherwise.
+        """
+        return self.sCoords[index] == obj.sCoord and \
+               self.eCoords[index] == obj.eCoord and \
+               self.names[index] == obj.name and \
+               self.scores[index] == obj.score and \
+               self.strand(index) == obj.strand
+
+    def rowKey(self, index: int) -> tuple:
+        """
+        Returns the values of the row in position *index* compared by *BedEntry6.__eq__*, as a hashable tuple.
+
+        :param int index: Row position in the chromosome.
+        :return tuple: (*sCoord*, *eCoord*, *name*, *score*, *strand*)
+        """
+        return self.sCoords[index], self.eCoords[index], self.names[index], self.scores[index], self.strand(index)
+
+    @staticmethod
+    def entryKey(obj: BedEntry6) -> tuple:
+        """
+        Returns the values of *obj* compared by *BedEntry6.__eq__*, in the format of
+        :py:meth:`~bedContainer.BedColumns.BedColumns6.rowKey`.
+
+        :param BedEntry6 obj: BedEntry6 object.
+        :return tuple: (*sCoord*, *eCoord*, *name*, *score*, *strand*)
+        """
+        return obj.sCoord, obj.eCoord, obj.name, obj.score, obj.strand
+
+    def pop(self, index: int) -> None:
+        """
+        Removes the row in position *index*.
+
+        :param int index: Row position in the chromosome.
+        """
+        super().pop(index)
+        del self.names[index]
+        del self.scores[index]
+        del self.strands[index]
+
+    def reorder(self, order: List[int]) -> None:
+        """
+        Rearranges all rows, so that the new row *i* is the old row *order[i]*.
+
+        :param List[int] order: A permutation of the row positions.
+        """
+        super().reorder(order)
+        names = self.names
+        scores = self.scores
+        strands = self.strands
+        self.names = [names[i] for i in order]
+        self.scores = [scores[i] for i in order]
+        self.strands = array('b', [strands[i] for i in order])
+
+    def sortKeys(self) -> List[int]:
+        """
+        Returns the sort key of every row: the start and end coordinates and the strand packed in a single integer,
+        compared as (*sCoord*, *eCoord*, *strand*) tuples, with "+" before "-".
+
+        :return List[int]: Sort key of each row.
+        """
+        return [key * 2 + (strand < 0) for key, strand in zip(super().sortKeys(), self.strands)]
+
+    def _coreColumns(self) -> List[Iterable]:
+        """
+        Returns the core columns, in the order of a Bed File line, to be read together with *zip*. Strands are given
+        as "+" or "-".
+
+        | Because of its internal function inside the class, it remains private.
+
+        :return List: One iterable per core column.
+        """
+        return super()._coreColumns() + [self.names, self.scores, map(self.STRAND_NAMES.__getitem__, self.strands)]
+
+    def coreLine(self, index: int) -> str:
+        """
+        Returns the core columns of the row in position *index*, as in *str(BedEntry6)*.
+
+        :param int index: Row position in the chromosome.
+        :return str: Tab separated core columns.
+        """
+        return "{}\t{}\t{}\t{}\t{}\t{}".format(self.chrom, self.sCoords[index], self.eCoords[index],
+                                               self.names[index], self.scores[index], self.strand(index))
+
+    ###########################
+    ##  Build-in Functions   ##
+    ###########################
+
+    def __iter__(self) -> Generator[BedEntry6, None, None]:
+        # One pass over the columns, instead of indexing each of them per row (see entry).
+        fromValidated = BedEntry6.fromValidated
+        chrom = self.chrom
+        strandNames = self.STRAND_NAMES
+        for sCoord, eCoord, name, score, strand, extras in zip(self.sCoords, self.eCoords, self.names, self.scores,
+                                                               self.strands, self.extraFields):
+            yield fromValidated(chrom, sCoord, eCoord, name, score, strandNames[strand],
+                                () if extras is None else extras if type(extras) == str else tuple(extras))
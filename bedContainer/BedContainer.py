@@ -1,31 +1,87 @@
 from bedEntry.BedEntry import BedEntry
-from typing import Generator, List, Dict, Union
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import groupby, repeat
+from operator import itemgetter
+import gc
+import operator
+from bedContainer.BedColumns import BedColumns, BedColumns6, _sliceFields
+from bedContainer.BedContainerView import BedContainerView, _checkIndex
+from bedContainer.NCList import NCList
+from bedContainer.BedIO import HEADER_PREFIXES, openBedFile, readChromSizes, writeBedFile
+from bedContainer.BedSort import chromSortKey
+from bedContainer.BedArrow import _importArrow, fromArrow, toArrow
+from bedContainer.BedSchema import BedSchema, getSchema
+from bedContainer.BedSnapshot import loadBinary, saveBinary
+from bedContainer.ReadCounting import DEFAULT_FLAGS, countChrReads, countChrReadsTask
+from typing import Callable, Generator, Iterable, List, Dict, Tuple, Union
+
+import numpy as np
+import pysam
 
 
 class BedContainer(object):
     '''
     Represents a Python Container for BedEntry objects (bed file format rows with 3 columns, plus possibly Extra Fields).
 
+    Rows are stored by chromosome in a columnar layout (*BedColumns*), and the *BedEntry* objects are only created
+    when the container is indexed or iterated.
+
     '''
 
-    def __init__(self, addExtras: bool = False) -> None:
+    _columnsClass = BedColumns
+    READ_CHUNK_BYTES = 1 << 22
+
+    def __init__(self, addExtras: bool = False, schema: Union[None, str, BedSchema] = None) -> None:
         """
         Creates an instance of BedEntry object.
 
         :param bool addExtras: *True* if the Bed Entries have extra fields, *False* otherwise.
+        :param None,str,BedSchema schema: Schema of the typed extra fields (see :py:mod:`~bedContainer.BedSchema`), e.g. "bedGraph". Extra fields are then always kept. (optional)
         """
-        self.addExtras: bool = addExtras
+        self._schema: Union[None, BedSchema] = None
+        self._schemaColumns: Dict[str, Dict[str, Tuple[np.ndarray, int]]] = {}
+        self.schema = schema
+        self.addExtras: bool = addExtras or self.schema is not None
 
-        self.bedContainer: Dict[str, List[BedEntry]] = {}
+        self.bedContainer: Dict[str, BedColumns] = {}
         self.entryCounts: int = 0
         self.chrCounts: int = 0
         self.chrList: List[str] = []
         self.isSorted: bool = False
+        self._overlapIndex: Dict[str, NCList] = {}
+        self._offsets: Union[None, List[int]] = [0]
+        self._fieldIndexes: Dict[str, Dict[Union[str, int], Tuple[Dict, int]]] = {}
 
     ###################
     ##  Properties   ##
     ###################
 
+    @property
+    def schema(self) -> Union[None, BedSchema]:
+        """
+        Get the schema (*schema*) of the typed extra fields.
+
+        :getter: Returns the *BedSchema*, or *None*
+        :setter: Sets the schema, by name or *BedSchema* object. Its core columns must be the ones of the *BedContainer*.
+        :type: None,BedSchema
+
+        """
+        return self._schema
+
+    @schema.setter
+    def schema(self, value: Union[None, str, BedSchema]) -> None:
+        value = getSchema(value)
+        if value is not None:
+            if value.coreColumns != self._columnsClass.CORE_COLUMNS:
+                raise ValueError("Schema {} has {} core columns, but {} has {}."
+                                 .format(value.name, value.coreColumns, type(self).__name__,
+                                         self._columnsClass.CORE_COLUMNS))
+            self.addExtras = True
+        self._schema = value
+        self._schemaColumns = {}
+
     def empty(self) -> None:
         """
         Remove all BedEntries in the BedContainer. Also, reset all Counters.
@@ -36,17 +92,88 @@ class BedContainer(object):
         self.isSorted = False
         self.bedContainer = {}
         self.chrList = []
+        self._invalidateIndexes()
+
+    def _invalidateIndexes(self, chrom: Union[None, str] = None, appended: bool = False) -> None:
+        """
+        Discards the internal indexes built over the rows of chromosome *chrom* (or of all chromosomes, if *None*),
+        since they were changed. They are built again when needed.
+
+        If rows were only appended to *chrom*, the field indexes and schema columns are kept, and the new rows are added
+        to them at their next use.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param None,str chrom: The Chromosome name with changed rows, or *None* for all.
+        :param bool appended: *True* if rows were only appended to *chrom*.
+        """
+        if chrom is None:
+            self._overlapIndex = {}
+            self._offsets = None
+            self._fieldIndexes = {}
+            self._schemaColumns = {}
+        else:
+            self._overlapIndex.pop(chrom, None)
+            self._updateOffsets(chrom)
+            if not appended:
+                self._fieldIndexes.pop(chrom, None)
+                self._schemaColumns.pop(chrom, None)
+
+    def _updateOffsets(self, chrom: str) -> None:
+        """
+        Updates the prefix-offset table (position of the first row of each chromosome in *chrList*, plus the total)
+        after rows of chromosome *chrom* were changed.
+
+        Rows added to the last chromosome (or to a new one) only update the end of the table, the common case while
+        reading Bed Files. Other changes discard the table, which is rebuilt by the next indexing.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param str chrom: The Chromosome name with changed rows.
+        """
+        offsets = self._offsets
+        if offsets is None:
+            return
+        chrList = self.chrList
+        if chrList and chrList[-1] == chrom and chrom in self.bedContainer:
+            if len(offsets) == len(chrList):
+                offsets.append(offsets[-1] + len(self.bedContainer[chrom]))
+                return
+            if len(offsets) == len(chrList) + 1:
+                offsets[-1] = offsets[-2] + len(self.bedContainer[chrom])
+                return
+        self._offsets = None
+
+    def _locate(self, index: int) -> Tuple[BedColumns, int]:
+        """
+        Returns the chromosome rows and the row position of the non-negative *index* of the *BedContainer*, with a binary
+        search on the prefix-offset table (O(log chromosomes)).
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param int index: Position of the row in the *BedContainer* (0 to *len* - 1).
+        :return Tuple: (chromosome rows, row position in the chromosome)
+        """
+        offsets = self._offsets
+        if offsets is None:
+            offsets = [0]
+            for chrom in self.chrList:
+                offsets.append(offsets[-1] + len(self.bedContainer[chrom]))
+            self._offsets = offsets
+        position = bisect_right(offsets, index) - 1
+        return self.bedContainer[self.chrList[position]], index - offsets[position]
 
     def _addChr(self, chrom: str) -> None:
         """
-        Adds a Key in Internal Dictionary (*bedContainer*) with the input *chrom* name associated to an empty list.
+        Adds a Key in Internal Dictionary (*bedContainer*) with the input *chrom* name associated to an empty column
+        storage.
         Then, appends *chrom* name to the List of chromosomes (*chrList*) and increments 1 unite to the chromosome counter (*chrCounts*).
 
         | Because of its internal function inside the class, it remains private.
 
         :param str chrom: The Chromosome name to add
         """
-        self.bedContainer[chrom] = []
+        self.bedContainer[chrom] = self._columnsClass(chrom)
         self.chrList.append(chrom)
         self.chrCounts += 1
 
@@ -58,34 +185,93 @@ class BedContainer(object):
         """
         return self.chrList
 
-    def findEntriesWith(self, chr="Any", sCoord="Any", eCoord="Any") -> List[BedEntry]:
+    def findEntriesWith(self, chr="Any", sCoord="Any", eCoord="Any",
+                        extraFields: Union[None, Dict[int, object]] = None) -> List[BedEntry]:
         """
-        Return all BedEntry objects having chr or sCoord or eCoord equal to the given ones.
+        Return all BedEntry objects having chr or sCoord or eCoord (and extra fields) equal to the given ones.
+
+        Lookups use hash indexes (value -> rows) of the searched fields, built per chromosome at their first use, so
+        they take the time of the result size, not of the *BedContainer* size. Added rows are included in the indexes
+        at their next use, while removing or sorting rows discards the indexes of the changed chromosomes.
 
         :param str chr: the chromosome where region is located
         :param int sCoord: the start coordinate of the region
         :param int eCoord: the end coordinate of the region
+        :param None,Dict extraFields: Extra fields to match, as {position of the extra field: value}. (optional)
+        :return List: Return a list of BedEntry objects having the given features
+        """
+        conditions = {}
+        if sCoord != "Any":
+            conditions["sCoord"] = int(sCoord)
+        if eCoord != "Any":
+            conditions["eCoord"] = int(eCoord)
+        if extraFields:
+            conditions.update(extraFields)
+        return self._findEntries(chr, conditions)
+
+    def _findEntries(self, chr: str, conditions: Dict[Union[str, int], object]) -> List[BedEntry]:
+        """
+        Returns all BedEntry objects in chromosome *chr* (or in all, if "Any") whose fields are equal to *conditions*.
+
+        For each chromosome, the rows of the most selective condition are taken from its field index and checked against
+        the other conditions.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param str chr: Chromosome name, or "Any".
+        :param Dict conditions: Field (see :py:meth:`~bedContainer.BedColumns.BedColumns.fieldValues`) -> value.
         :return List: Return a list of BedEntry objects having the given features
         """
-        tmpList = []
         if chr != "Any":
-            if chr not in self.chrList:
+            if chr not in self.bedContainer:
                 raise ValueError("{} not in Chromosome List!".format(chr))
+            chromosomes = [chr]
+        else:
+            chromosomes = self.chrList
 
-            else:
-                tmpList = list(filter(lambda x: x.chr == chr, self.bedContainer[chr]))
+        tmpList = []
+        for chrom in chromosomes:
+            columns = self.bedContainer[chrom]
+            if not conditions:
+                tmpList.extend(columns)
+                continue
+            candidates = None
+            for field, value in conditions.items():
+                rows = self._fieldIndex(chrom, field).get(value, ())
+                if candidates is None or len(rows) < len(candidates):
+                    candidates, selectedField = rows, field
+            others = [(field, value) for field, value in conditions.items() if field != selectedField]
+            for index in candidates:
+                if all(columns.fieldValue(field, index) == value for field, value in others):
+                    tmpList.append(columns.entry(index))
 
-        elif chr == "Any":
-            for chr in self.chrList:
-                tmpList = tmpList + self.bedContainer[chr]
+        return tmpList
 
-        if sCoord != "Any":
-            tmpList = list(filter(lambda x: x.sCoord == int(sCoord), tmpList))
+    def _fieldIndex(self, chrom: str, field: Union[str, int]) -> Dict[object, List[int]]:
+        """
+        Returns the hash index (value -> ascending row positions) of *field* in chromosome *chrom*, building it, or
+        adding the rows appended since its last use.
 
-        if eCoord != "Any":
-            tmpList = list(filter(lambda x: x.eCoord == int(eCoord), tmpList))
+        | Because of its internal function inside the class, it remains private.
 
-        return tmpList
+        :param str chrom: Chromosome name (*chr*) present in the *BedContainer*.
+        :param str,int field: Field name or extra field position (see :py:meth:`~bedContainer.BedColumns.BedColumns.fieldValues`).
+        :return Dict: Value -> row positions.
+        """
+        chromIndexes = self._fieldIndexes.setdefault(chrom, {})
+        index, nIndexed = chromIndexes.get(field, (None, 0))
+        columns = self.bedContainer[chrom]
+        if index is None or nIndexed < len(columns):
+            if index is None:
+                index = {}
+            for row, value in enumerate(columns.fieldValues(field, nIndexed), nIndexed):
+                rows = index.get(value)
+                if rows is None:
+                    index[value] = [row]
+                else:
+                    rows.append(row)
+            chromIndexes[field] = (index, len(columns))
+        return index
 
     def select_EntriesInChr(self, chrom: str) -> List[BedEntry]:
         """
@@ -96,11 +282,26 @@ class BedContainer(object):
         :param str chrom: Chromosome name (*chr*) of *BedEntry* objects to return
         :return List: A List of all *BedEntry* located in *chrom*
         """
-        if chrom in self.select_Chromosomes():
-            return self.bedContainer[chrom]
+        if chrom in self.bedContainer:
+            return list(self.bedContainer[chrom])
         else:
             return []
 
+    def iterRows(self, chrom: Union[None, str] = None, addExtras: bool = False) -> Generator[tuple, None, None]:
+        """
+        Yields the rows as tuples of the core columns (*chr*, *sCoord*, *eCoord* and, in *BedContainer6*, *name*,
+        *score* and *strand*), in the *BedContainer* order, read directly from the columns without creating *BedEntry*
+        objects.
+
+        If *chrom* is not in the *BedContainer*, nothing is yielded.
+
+        :param None,str chrom: Chromosome name (*chr*) of the rows to yield, or *None* for all. (optional)
+        :param bool addExtras: *True* to add the extra fields (tuple) as last value. (default *False*)
+        :return tuple: A row tuple.
+        """
+        chromosomes = self.select_Chromosomes() if chrom is None else [chrom] if chrom in self.bedContainer else []
+        for chromosome in chromosomes:
+            yield from self.bedContainer[chromosome].rows(addExtras)
 
     def number_EntriesInChr(self, chrom: str) -> int:
         """
@@ -111,7 +312,7 @@ class BedContainer(object):
         :param str chrom: Chromosome name (*chr*) of *BedEntry* objects to count
         :return: Number of *BedEntry* with input chromosome name.
         """
-        if chrom in self.select_Chromosomes():
+        if chrom in self.bedContainer:
             return len(self.bedContainer[chrom])
         else:
             return 0
@@ -129,16 +330,15 @@ class BedContainer(object):
 
         :param List listBedEntry: A list of strings with the required properties to be initialized by *BedEntry* constructor.
         """
-        if listBedEntry[0] not in self.chrList:
-            self._addChr(listBedEntry[0])
+        chrom = listBedEntry[0]
+        if type(chrom) != str:
+            raise ValueError("Chromosome {} is not a string type.".format(chrom))
 
-        tmpBedEntry = BedEntry(listBedEntry[0], int(listBedEntry[1]), int(listBedEntry[2]))
+        if chrom not in self.bedContainer:
+            self._addChr(chrom)
 
-        if self.addExtras:
-            for field in listBedEntry[3:]:
-                tmpBedEntry.addExtraField(field)
-
-        self.bedContainer[listBedEntry[0]].append(tmpBedEntry)
+        self.bedContainer[chrom].appendFields(listBedEntry[1:], self.addExtras)
+        self._invalidateIndexes(chrom, appended=True)
         self.entryCounts += 1
         self.isSorted = False
 
@@ -153,9 +353,10 @@ class BedContainer(object):
         :param BedEntry obj: BedEntry object to add.
         """
         input_chr = obj.chr
-        if input_chr not in self.select_Chromosomes():
+        if input_chr not in self.bedContainer:
             self._addChr(input_chr)
-        self.bedContainer[input_chr].append(obj)
+        self.bedContainer[input_chr].appendEntry(obj)
+        self._invalidateIndexes(input_chr, appended=True)
         self.entryCounts += 1
         self.isSorted = False
 
@@ -169,14 +370,219 @@ class BedContainer(object):
         :param BedEntry entryBedObj: BedEntry object to remove
         """
         inputChr = entryBedObj.chr
-        self.bedContainer[inputChr].remove(entryBedObj)
+        columns = self.bedContainer.get(inputChr)
+        index = -1 if columns is None else columns.find(entryBedObj)
+        if index < 0:
+            raise ValueError("{} not in BedContainer!".format(entryBedObj))
+        columns.pop(index)
         self.entryCounts -= 1
 
         # update chrList and chrCounts, if necessary
-        for chr in self.chrList:
-            if self.number_EntriesInChr(chr) == 0:
-                self.chrList.remove(chr)
-                self.chrCounts -= 1
+        if len(columns) == 0:
+            del self.bedContainer[inputChr]
+            self.chrList.remove(inputChr)
+            self.chrCounts -= 1
+        self._invalidateIndexes(inputChr)
+
+    def _keepRows(self, chrom: str, selectors: List[bool]) -> int:
+        """
+        Keeps only the rows of chromosome *chrom* whose selector is *True*, updating the counters and removing the
+        chromosome if it becomes empty. The relative order of the rows is kept, so a sorted *BedContainer* stays sorted.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param str chrom: Chromosome name (*chr*) present in the *BedContainer*.
+        :param List[bool] selectors: One selector per row of *chrom*.
+        :return int: Number of removed rows.
+        """
+        columns = self.bedContainer[chrom]
+        kept = columns.compress(selectors)
+        nRemoved = len(columns) - len(kept)
+        if nRemoved == 0:
+            return 0
+        self.entryCounts -= nRemoved
+        if len(kept) == 0:
+            del self.bedContainer[chrom]
+            self.chrList.remove(chrom)
+            self.chrCounts -= 1
+        else:
+            self.bedContainer[chrom] = kept
+        self._invalidateIndexes(chrom)
+        return nRemoved
+
+    def removeEntries(self, entries: Iterable[BedEntry]) -> None:
+        """
+        Removes several *BedEntry* objects from *BedContainer*, in one pass per chromosome.
+
+        Each given *BedEntry* removes one equal row (the first one not yet removed, as
+        :py:meth:`~bedContainer.BedContainer.BedContainer.removeEntryBed`). If any of them is not in the *BedContainer*,
+        a *ValueError* is raised and nothing is removed. Counters and the Chromosome List are kept updated, and a sorted
+        *BedContainer* stays sorted.
+
+        :param Iterable[BedEntry] entries: BedEntry objects to remove
+        """
+        toRemove: Dict[str, Dict[tuple, int]] = {}
+        for entry in entries:
+            chromKeys = toRemove.setdefault(entry.chr, {})
+            key = self._columnsClass.entryKey(entry)
+            chromKeys[key] = chromKeys.get(key, 0) + 1
+
+        selectorsByChr = {}
+        for chrom, chromKeys in toRemove.items():
+            columns = self.bedContainer.get(chrom)
+            if columns is None:
+                raise ValueError("{} not in BedContainer!".format(chrom))
+            # Only rows starting where an entry to remove starts need the full comparison.
+            starts = {key[0] for key in chromKeys}
+            selectors = [True] * len(columns)
+            for index, sCoord in enumerate(columns.sCoords):
+                if sCoord in starts:
+                    key = columns.rowKey(index)
+                    count = chromKeys.get(key, 0)
+                    if count:
+                        chromKeys[key] = count - 1
+                        selectors[index] = False
+            missing = [key for key, count in chromKeys.items() if count]
+            if missing:
+                raise ValueError("{} {} not in BedContainer!".format(chrom, missing[0]))
+            selectorsByChr[chrom] = selectors
+
+        for chrom, selectors in selectorsByChr.items():
+            self._keepRows(chrom, selectors)
+
+    def removeWhere(self, predicate: Callable[[BedEntry], bool]) -> int:
+        """
+        Removes all *BedEntry* for which *predicate* returns *True*, in one pass per chromosome.
+
+        Counters and the Chromosome List are kept updated, and a sorted *BedContainer* stays sorted.
+
+        :param Callable predicate: Function receiving a *BedEntry* and returning *True* to remove it.
+        :return int: Number of removed *BedEntry*.
+        """
+        nRemoved = 0
+        for chrom in list(self.chrList):
+            columns = self.bedContainer[chrom]
+            nRemoved += self._keepRows(chrom, [not predicate(entry) for entry in columns])
+        return nRemoved
+
+    def filter(self, predicate: Callable[[BedEntry], bool]) -> object:
+        """
+        Returns a new *BedContainer*, of the same class, with the *BedEntry* for which *predicate* returns *True*.
+
+        The *BedEntry* order is kept, so if this *BedContainer* is sorted the new one is also sorted.
+
+        :param Callable predicate: Function receiving a *BedEntry* and returning *True* to keep it.
+        :return BedContainer: *BedContainer* with the selected *BedEntry*.
+        """
+        newContainer = type(self)(self.addExtras, self.schema)
+        for chrom in self.chrList:
+            columns = self.bedContainer[chrom].compress([bool(predicate(entry)) for entry in self.bedContainer[chrom]])
+            if len(columns):
+                newContainer._addChr(chrom)
+                newContainer.bedContainer[chrom] = columns
+                newContainer.entryCounts += len(columns)
+        newContainer._invalidateIndexes()
+        newContainer.isSorted = self.isSorted
+        return newContainer
+
+    def _schemaColumn(self, chrom: str, field: str) -> np.ndarray:
+        """
+        Returns the typed values of the schema *field* in chromosome *chrom*, parsing them, or the rows appended since
+        its last use, from the extra fields.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param str chrom: Chromosome name (*chr*) present in the *BedContainer*.
+        :param str field: Field name of the schema.
+        :return np.ndarray: Typed values of the chromosome rows.
+        """
+        chromColumns = self._schemaColumns.setdefault(chrom, {})
+        values, nParsed = chromColumns.get(field, (None, 0))
+        columns = self.bedContainer[chrom]
+        if values is None or nParsed < len(columns):
+            parsed = self._schema.parse(field, columns.fieldValues(self._schema.position(field), nParsed))
+            values = parsed if values is None else np.concatenate((values, parsed))
+            chromColumns[field] = (values, len(columns))
+        return values
+
+    def schemaColumn(self, field: str, chrom: Union[None, str] = None) -> np.ndarray:
+        """
+        Returns the typed values of a schema field (e.g. "qValue" of narrowPeak), for all entries in the *BedContainer*
+        order (as its iteration), or for the entries of chromosome *chrom*.
+
+        The extra fields are parsed once and kept as numeric columns, updated when entries are added.
+
+        :param str field: Field name of the schema.
+        :param None,str chrom: Chromosome name. (optional)
+        :return np.ndarray: Typed values.
+        """
+        if self._schema is None:
+            raise ValueError("The BedContainer has no schema.")
+        self._schema.position(field)
+        if chrom is not None:
+            if chrom not in self.bedContainer:
+                raise ValueError("{} not in Chromosome List!".format(chrom))
+            return self._schemaColumn(chrom, field)
+        dtype = self._schema.fields[self._schema.position(field)][1]
+        return np.concatenate([self._schemaColumn(chrom, field) for chrom in self.chrList] + [np.zeros(0, dtype)])
+
+    FILTER_OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+                        "==": operator.eq, "!=": operator.ne}
+
+    def filterField(self, field: str, op: str, value: Union[int, float]) -> object:
+        """
+        Returns a new *BedContainer*, of the same class and schema, with the entries whose schema *field* compares
+        with *value* by *op* (e.g. ``container.filterField("qValue", ">", 2)``).
+
+        The comparison is vectorized over the typed schema columns, instead of creating and checking each *BedEntry*
+        as :py:meth:`~bedContainer.BedContainer.BedContainer.filter`. The entry order is kept.
+
+        :param str field: Field name of the schema.
+        :param str op: ">", ">=", "<", "<=", "==" or "!=".
+        :param int,float value: Value to compare with.
+        :return BedContainer: *BedContainer* with the selected entries.
+        """
+        if op not in self.FILTER_OPERATORS:
+            raise ValueError("Operator {} is not one of {}.".format(op, ", ".join(self.FILTER_OPERATORS)))
+        compare = self.FILTER_OPERATORS[op]
+        if self._schema is None:
+            raise ValueError("The BedContainer has no schema.")
+        self._schema.position(field)
+
+        newContainer = type(self)(self.addExtras, self.schema)
+        for chrom in self.chrList:
+            selectors = compare(self._schemaColumn(chrom, field), value)
+            columns = self.bedContainer[chrom].compress(selectors.tolist())
+            if len(columns):
+                newContainer._addChr(chrom)
+                newContainer.bedContainer[chrom] = columns
+                newContainer.entryCounts += len(columns)
+        newContainer._invalidateIndexes()
+        newContainer.isSorted = self.isSorted
+        return newContainer
+
+    def topN(self, field: str, n: int, largest: bool = True) -> BedContainerView:
+        """
+        Returns the *n* entries with the largest (or smallest) values of a schema field (e.g. the top peaks by
+        "signalValue"), ordered by that value, as a *BedContainerView* (see
+        :py:meth:`~bedContainer.BedContainerView.BedContainerView.toContainer` to copy them). Ties keep the
+        *BedContainer* order.
+
+        :param str field: Field name of the schema.
+        :param int n: Number of entries.
+        :param bool largest: *True* for the largest values, *False* for the smallest. (default *True*)
+        :return BedContainerView: View with the selected entries.
+        """
+        values = self.schemaColumn(field)
+        if largest:
+            values = -values
+        n = min(max(n, 0), len(values))
+        if n == 0:
+            return BedContainerView(self, [])
+        # Only the entries up to the n-th value (found in linear time) are sorted.
+        candidates = np.flatnonzero(~(values > np.partition(values, n - 1)[n - 1]))
+        order = candidates[np.argsort(values[candidates], kind="stable")]
+        return BedContainerView(self, order[:n].tolist())
 
     @staticmethod
     def merge(other1: object, other2: object) -> object:
@@ -185,7 +591,8 @@ class BedContainer(object):
         advantage the preservation of *BedEntry* objects inside the input *BedContainer* objects.
 
         If at least one input *BedContainer* has flagged having extraField (*addExtras*), it ensures that the final
-        *BedContainer* output also has that flag as *True*.
+        *BedContainer* output also has that flag as *True*. If both inputs are from the same class (e.g. *BedContainer6*),
+        the output is also from that class.
 
         :param BedContainer other1: *BedContainer* to merge, 1!
         :param BedContainer other2: *BedContainer* to merge, 2!
@@ -201,7 +608,8 @@ class BedContainer(object):
         if other1.addExtras or other2.addExtras:
             addExtrasToNew = True
 
-        newObject : BedContainer = BedContainer(addExtrasToNew)
+        containerClass = type(other1) if type(other1) == type(other2) else BedContainer
+        newObject : BedContainer = containerClass(addExtrasToNew)
 
         for entryA in other1.__iter__():
             newObject.addFrom_BedEntryObj(entryA)
@@ -210,86 +618,1277 @@ class BedContainer(object):
 
         return newObject
 
-    def sort(self) -> None:
+    def sort(self, chromOrder: Union[str, List[str], Dict[str, int]] = "lexical") -> None:
         """
-        Sort the list of each chromosome in the *bedContainer* recursively and the Chromosome List (*chrList*).
+        Sort the rows of each chromosome in the *bedContainer* and the Chromosome List (*chrList*).
         Ensures that set the sorted flag to *True*
-        """
-        def sortWorker(chrEntries: List[BedEntry]):
-            return sorted(chrEntries)
 
+        Rows are sorted by start coordinate, then end coordinate (then strand, "+" before "-", in *BedContainer6*).
+        Rows with the same keys keep their insertion order (stable sort).
+
+        Chromosomes are sorted following *chromOrder* (see :py:func:`~bedContainer.BedSort.chromSortKey`): "lexical"
+        (chr1, chr10, chr2, ...), "natural" (chr1, chr2, ..., chr10), a list of names, chromosome sizes or the path to a
+        chrom-sizes file or FASTA index.
+
+        :param str,List,Dict chromOrder: Chromosome order. (default "lexical")
+        """
         # Sort Chromosome List names
-        self.chrList = sorted(self.select_Chromosomes())
+        self.chrList = sorted(self.select_Chromosomes(), key=chromSortKey(chromOrder))
 
-        # Sort BedEntry objects inside each Chromosome.
+        # Sort rows inside each Chromosome.
         for chrom in self.select_Chromosomes():
-            self.bedContainer[chrom] = sortWorker(self.bedContainer[chrom])
+            self.bedContainer[chrom].sort()
 
+        self._invalidateIndexes()
         self.isSorted = True
 
+    def buildOverlapIndex(self) -> None:
+        """
+        Builds the overlap index (a Nested Containment List per chromosome) used by
+        :py:meth:`~bedContainer.BedContainer.BedContainer.query`.
+
+        It is not required to call it, since :py:meth:`~bedContainer.BedContainer.BedContainer.query` builds the index
+        of a chromosome at its first use. Adding or removing entries discards only the index of the changed chromosome.
+        """
+        for chrom in self.chrList:
+            self._chrOverlapIndex(chrom)
+
+    def _chrOverlapIndex(self, chrom: str) -> NCList:
+        """
+        Returns the overlap index of chromosome *chrom*, building it if necessary.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param str chrom: Chromosome name (*chr*) present in the *BedContainer*.
+        :return NCList: The Nested Containment List of *chrom* rows.
+        """
+        index = self._overlapIndex.get(chrom)
+        if index is None:
+            columns = self.bedContainer[chrom]
+            index = NCList(columns.sCoords, columns.eCoords)
+            self._overlapIndex[chrom] = index
+        return index
+
+    def _overlappingRows(self, chr: str, start: int, end: int) -> List[int]:
+        """
+        Returns the positions, inside chromosome *chr* rows, of all entries overlapping the region.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param str chr: the chromosome where region is located
+        :param int start: the start coordinate of the region
+        :param int end: the end coordinate of the region
+        :return List[int]: Sorted row positions.
+        """
+        if chr not in self.bedContainer:
+            return []
+        return self._chrOverlapIndex(chr).query(start, end)
+
+    def query(self, chr: str, start: int, end: int, strand: Union[None, str] = None) -> List[BedEntry]:
+        """
+        Returns all *BedEntry* objects overlapping the region, in O(log n + k) time using the overlap index.
+
+        It is used the same rule of :py:meth:`~bedEntry.BedEntry.BedEntry.isOverlapping`, so entries just touching
+        the region are also returned. The entries are returned in the *BedContainer* order.
+
+        :param str chr: the chromosome where region is located
+        :param int start: the start coordinate of the region
+        :param int end: the end coordinate of the region
+        :param None,str strand: Only available for *BedContainer6*.
+        :return List: A List of all *BedEntry* overlapping the region.
+        """
+        if strand is not None:
+            raise ValueError("BedContainer entries have no strand, please use BedContainer6.")
+        columns = self.bedContainer.get(chr)
+        return [columns.entry(row) for row in self._overlappingRows(chr, start, end)]
+
+    def _addRowFrom(self, columns: BedColumns, index: int) -> None:
+        """
+        Adds a copy of the row in position *index* of *columns* (from a *BedContainer* of the same class), without
+        creating a *BedEntry* object. Counters and indexes are updated as in
+        :py:meth:`~bedContainer.BedContainer.BedContainer.addFrom_BedEntryObj`.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param BedColumns columns: Column storage to copy from.
+        :param int index: Row position in *columns*.
+        """
+        chrom = columns.chrom
+        if chrom not in self.bedContainer:
+            self._addChr(chrom)
+        self.bedContainer[chrom].appendRowFrom(columns, index)
+        self._invalidateIndexes(chrom, appended=True)
+        self.entryCounts += 1
+        self.isSorted = False
+
+    def _hasStrand(self) -> bool:
+        """
+        Question if the rows of the *BedContainer* have DNA strand (*BedContainer6*).
+
+        | Because of its internal function inside the class, it remains private.
+
+        :return bool: *True* if rows have strand, *False* otherwise.
+        """
+        return issubclass(self._columnsClass, BedColumns6)
+
+    def _rowOverlaps(self, other: object, chrom: str, considerStrand: bool = False) \
+            -> Generator[Tuple[int, List[int]], None, None]:
+        """
+        Yields each row position of chromosome *chrom* of this *BedContainer*, in order, with the sorted list of row
+        positions of the same chromosome of *other* overlapping it (same rule of *BedEntry.isOverlapping*).
+
+        Overlaps are found with the overlap index (Nested Containment List) of *other*, in O(log n + k) time per row,
+        so rows containing many others (e.g. a long interval before many short ones) don't slow down the next rows.
+        With *considerStrand*, an index is built for each strand of *other* rows, and each row only queries the index
+        of its strand.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param BedContainer other: *BedContainer* to compare with.
+        :param str chrom: Chromosome name (*chr*) present in this *BedContainer*.
+        :param bool considerStrand: If *True*, only rows in the same DNA strand overlap.
+        """
+        columnsA = self.bedContainer[chrom]
+        sCoordsA, eCoordsA = columnsA.sCoords, columnsA.eCoords
+        if chrom not in other.bedContainer:
+            for indexA in range(len(sCoordsA)):
+                yield indexA, []
+            return
+
+        if not considerStrand:
+            query = other._chrOverlapIndex(chrom).query
+            for indexA in range(len(sCoordsA)):
+                yield indexA, query(sCoordsA[indexA], eCoordsA[indexA])
+            return
+
+        columnsB = other.bedContainer[chrom]
+        strandIndexes = {}
+        for strandCode in columnsB.STRAND_NAMES:
+            rowsB = [indexB for indexB, strand in enumerate(columnsB.strands) if strand == strandCode]
+            index = NCList(array('q', [columnsB.sCoords[indexB] for indexB in rowsB]),
+                           array('q', [columnsB.eCoords[indexB] for indexB in rowsB]))
+            strandIndexes[strandCode] = (index.query, rowsB)
+        strandsA = columnsA.strands
+        for indexA in range(len(sCoordsA)):
+            query, rowsB = strandIndexes[strandsA[indexA]]
+            # Strand rows keep the order of *other* rows, so sorted positions stay sorted.
+            yield indexA, [rowsB[row] for row in query(sCoordsA[indexA], eCoordsA[indexA])]
+
+    def intersect(self, other: object, considerStrand: bool = False, mode: str = "pairs") \
+            -> Union[List[Tuple[BedEntry, BedEntry]], object]:
+        """
+        Finds the overlaps between the entries of this *BedContainer* (A) and *other* (B), similar to
+        ``bedtools intersect``. It is used the same rule of :py:meth:`~bedEntry.BedEntry.BedEntry.isOverlapping`.
+
+        A entries are visited in order, chromosome by chromosome, and their B overlaps are found with the overlap index
+        of B (see :py:meth:`~bedContainer.BedContainer.BedContainer.buildOverlapIndex`), in the B order. This
+        *BedContainer* is sorted first with :py:meth:`~bedContainer.BedContainer.BedContainer.sort`, unless already
+        flagged as sorted (*isSorted*), while *other* is left unchanged.
+
+        Modes:
+
+        - "pairs" -> List of (*entryA*, *entryB*) tuples, for every overlapping pair (``-wa -wb``)
+        - "overlapping" -> *BedContainer* with the A entries overlapping at least one B entry (``-u``)
+        - "notOverlapping" -> *BedContainer* with the A entries not overlapping any B entry (``-v``)
+
+        :param BedContainer other: *BedContainer* to intersect with.
+        :param bool considerStrand: If *True*, only entries in the same DNA strand overlap. Both containers must be *BedContainer6*.
+        :param str mode: "pairs", "overlapping" or "notOverlapping". (default "pairs")
+        :return: List of overlapping pairs, or a sorted *BedContainer* of the same class with the selected A entries.
+        """
+        if mode not in ("pairs", "overlapping", "notOverlapping"):
+            raise ValueError("Mode {} is not \'pairs\', \'overlapping\' or \'notOverlapping\'.".format(mode))
+        if considerStrand and not (self._hasStrand() and other._hasStrand()):
+            raise ValueError("Strand can only be considered between BedContainer6 objects.")
+
+        if not self.isSorted:
+            self.sort()
+
+        pairs = []
+        newObject = type(self)(self.addExtras, self.schema)
+        for chrom in self.chrList:
+            columnsA = self.bedContainer[chrom]
+            columnsB = other.bedContainer.get(chrom, other._columnsClass(chrom))
+            for indexA, overlaps in self._rowOverlaps(other, chrom, considerStrand):
+                if mode == "pairs":
+                    if overlaps:
+                        entryA = columnsA.entry(indexA)
+                        pairs.extend((entryA, columnsB.entry(indexB)) for indexB in overlaps)
+                elif bool(overlaps) == (mode == "overlapping"):
+                    newObject._addRowFrom(columnsA, indexA)
+
+        if mode == "pairs":
+            return pairs
+        newObject.isSorted = True
+        return newObject
+
+    def subtract(self, other: object, considerStrand: bool = False) -> object:
+        """
+        Returns a new *BedContainer*, of the same class, with the pieces of the entries of this *BedContainer* (A) not
+        covered by any entry of *other* (B), similar to ``bedtools subtract``. Each piece keeps the other fields (name,
+        score, strand, extra fields) of its A entry, and A entries without overlaps are kept whole.
+
+        Covered portions are computed on the Bed half-open coordinates, so B entries just touching an A entry remove
+        nothing from it. B overlaps of each A entry are found with the overlap index of B, as in
+        :py:meth:`~bedContainer.BedContainer.BedContainer.intersect`. This *BedContainer* is sorted first with
+        :py:meth:`~bedContainer.BedContainer.BedContainer.sort`, unless already flagged as sorted (*isSorted*), while
+        *other* is left unchanged.
+
+        :param BedContainer other: *BedContainer* with the regions to remove.
+        :param bool considerStrand: If *True*, only entries in the same DNA strand are removed. Both containers must be *BedContainer6*.
+        :return: A sorted *BedContainer* of the same class with the remaining pieces.
+        """
+        if considerStrand and not (self._hasStrand() and other._hasStrand()):
+            raise ValueError("Strand can only be considered between BedContainer6 objects.")
+
+        if not self.isSorted:
+            self.sort()
+
+        newObject = type(self)(self.addExtras, self.schema)
+        for chrom in self.chrList:
+            columnsA = self.bedContainer[chrom]
+            columnsB = other.bedContainer.get(chrom, other._columnsClass(chrom))
+            sCoordsB, eCoordsB = columnsB.sCoords, columnsB.eCoords
+            newObject._addChr(chrom)
+            newColumns = newObject.bedContainer[chrom]
+            for indexA, overlaps in self._rowOverlaps(other, chrom, considerStrand):
+                if not overlaps:
+                    newColumns.appendRowFrom(columnsA, indexA)
+                    continue
+                # Overlapping B rows are taken by start coordinate, so the uncovered pieces are found left to right.
+                if not other.isSorted:
+                    overlaps.sort(key=sCoordsB.__getitem__)
+                cursor = columnsA.sCoords[indexA]
+                eCoordA = columnsA.eCoords[indexA]
+                for indexB in overlaps:
+                    if sCoordsB[indexB] > cursor:
+                        newColumns.appendPieceFrom(columnsA, indexA, cursor, sCoordsB[indexB])
+                    cursor = max(cursor, eCoordsB[indexB])
+                    if cursor >= eCoordA:
+                        break
+                if cursor < eCoordA:
+                    newColumns.appendPieceFrom(columnsA, indexA, cursor, eCoordA)
+
+            if len(newColumns) == 0:
+                del newObject.bedContainer[chrom]
+                newObject.chrList.remove(chrom)
+                newObject.chrCounts -= 1
+                continue
+            # Pieces of an A entry may start after the next A entries.
+            newColumns.sort()
+            newObject.entryCounts += len(newColumns)
+
+        newObject._invalidateIndexes()
+        newObject.isSorted = True
+        return newObject
+
+    def _checkChromSizes(self, chromSizes: Union[str, Dict[str, int]]) -> Dict[str, int]:
+        """
+        Returns the chromosome sizes (reading them, if a path is given), ensuring all chromosomes of the
+        *BedContainer* are there.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param str,Dict chromSizes: Chromosome sizes, or the path to a chrom-sizes file or FASTA index (".fai").
+        :return Dict: Chromosome name -> chromosome size.
+        """
+        if isinstance(chromSizes, str):
+            chromSizes = readChromSizes(chromSizes)
+        missing = [chrom for chrom in self.chrList if chrom not in chromSizes]
+        if missing:
+            raise ValueError("{} not in Chromosome Sizes!".format(missing[0]))
+        return chromSizes
+
+    def complement(self, chromSizes: Union[str, Dict[str, int]]) -> object:
+        """
+        Returns a new *BedContainer* with the regions of the genome not covered by any entry, similar to
+        ``bedtools complement``. Gaps are computed on the Bed half-open coordinates, so book-ended entries leave no gap.
+
+        Every chromosome of *chromSizes* is included, in its order (chromosomes without entries are a single gap).
+        Entries in chromosomes missing from *chromSizes* raise a *ValueError*. This *BedContainer* is sorted first with
+        :py:meth:`~bedContainer.BedContainer.BedContainer.sort`, unless already flagged as sorted (*isSorted*).
+
+        :param str,Dict chromSizes: Chromosome sizes, or the path to a chrom-sizes file or FASTA index (".fai").
+        :return: A sorted *BedContainer* (3 columns) with the gaps.
+        """
+        chromSizes = self._checkChromSizes(chromSizes)
+        if not self.isSorted:
+            self.sort()
+
+        newObject = BedContainer()
+        for chrom, chromSize in chromSizes.items():
+            gaps = []
+            cursor = 0
+            columns = self.bedContainer.get(chrom)
+            if columns is not None:
+                for sCoord, eCoord in zip(columns.sCoords, columns.eCoords):
+                    if sCoord >= chromSize:
+                        break
+                    if sCoord > cursor:
+                        gaps.append([chrom, cursor, sCoord])
+                    cursor = max(cursor, eCoord)
+            if cursor < chromSize:
+                gaps.append([chrom, cursor, chromSize])
+            if not gaps:
+                continue
+            # Gaps are built from validated rows, so they are added in one batch without checks.
+            newObject._addChr(chrom)
+            newObject.bedContainer[chrom].extendLines(gaps, list(range(1, len(gaps) + 1)), False, trusted=True)
+            newObject.entryCounts += len(gaps)
+
+        newObject._invalidateIndexes()
+        newObject.isSorted = True
+        return newObject
+
+    def _sideAmounts(self, columns: BedColumns, left: int, right: int, considerStrand: bool) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the number of bp of each row on its Left and Right side, for the *left* (5' end) and *right* (3' end)
+        amounts. With *considerStrand*, they are swapped in "-" strand rows, as in *BedEntry6.addLeftClip*.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param BedColumns columns: Rows of a chromosome.
+        :param int left: Number of bp on the Left side (5' end).
+        :param int right: Number of bp on the Right side (3' end).
+        :param bool considerStrand: *True* to consider the strand of the rows.
+        :return Tuple[np.ndarray, np.ndarray]: Number of bp on the Left side and on the Right side of each row.
+        """
+        if not considerStrand:
+            return np.full(len(columns), left, dtype=np.int64), np.full(len(columns), right, dtype=np.int64)
+        minus = np.frombuffer(columns.strands, dtype=np.int8) < 0
+        return np.where(minus, right, left).astype(np.int64), np.where(minus, left, right).astype(np.int64)
+
+    def _checkSideArguments(self, considerStrand: bool, chromSizes: Union[None, str, Dict[str, int]]) \
+            -> Union[None, Dict[str, int]]:
+        """
+        Checks the arguments shared by *slop*, *flank* and *shift*, returning the chromosome sizes (*None* if not
+        given).
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param bool considerStrand: *True* to consider the strand of the rows.
+        :param None,str,Dict chromSizes: Chromosome sizes, or the path to a chrom-sizes file or FASTA index (".fai").
+        :return None,Dict: Chromosome name -> chromosome size.
+        """
+        if considerStrand and not self._hasStrand():
+            raise ValueError("Strand can only be considered in BedContainer6 objects.")
+        return None if chromSizes is None else self._checkChromSizes(chromSizes)
+
+    @staticmethod
+    def _clipCoords(sCoords: np.ndarray, eCoords: np.ndarray, chromSize: Union[None, int]) -> np.ndarray:
+        """
+        Clips, in place, the coordinates of a chromosome to [0, *chromSize*] (only to 0, without *chromSize*), and returns
+        which rows are still regions (*sCoord* lower than *eCoord*).
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param np.ndarray sCoords: Start coordinates.
+        :param np.ndarray eCoords: End coordinates.
+        :param None,int chromSize: Chromosome size.
+        :return np.ndarray: *True* for the rows to keep.
+        """
+        np.clip(sCoords, 0, chromSize, out=sCoords)
+        np.clip(eCoords, 0, chromSize, out=eCoords)
+        return sCoords < eCoords
+
+    def _moveCoords(self, chrom: str, sCoords: np.ndarray, eCoords: np.ndarray, chromSize: Union[None, int]) -> int:
+        """
+        Replaces the coordinates of chromosome *chrom*, clipped to the chromosome (see *_clipCoords*), removing the rows
+        left without length.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param str chrom: Chromosome name (*chr*) present in the *BedContainer*.
+        :param np.ndarray sCoords: New start coordinates.
+        :param np.ndarray eCoords: New end coordinates.
+        :param None,int chromSize: Chromosome size.
+        :return int: Number of removed rows.
+        """
+        kept = self._clipCoords(sCoords, eCoords, chromSize)
+        columns = self.bedContainer[chrom]
+        columns.sCoords = array('q', sCoords.tobytes())
+        columns.eCoords = array('q', eCoords.tobytes())
+        self._invalidateIndexes(chrom)
+        return 0 if kept.all() else self._keepRows(chrom, kept.tolist())
+
+    def slop(self, left: int, right: Union[None, int] = None, considerStrand: bool = False,
+             chromSizes: Union[None, str, Dict[str, int]] = None) -> int:
+        """
+        Extends all entries *left* bp on the Left side and *right* bp on the Right side (the same as *left*, if *None*),
+        in one vectorized pass per chromosome, similar to ``bedtools slop``. Negative values shrink the entries.
+
+        With *considerStrand*, *left* is added on the 5' end and *right* on the 3' end (the Right and Left sides of "-"
+        strand entries), as :py:meth:`~bedEntry.BedEntry6.BedEntry6.addLeftClip` and
+        :py:meth:`~bedEntry.BedEntry6.BedEntry6.addRightClip`.
+
+        Instead of raising a *ValueError*, as the *BedEntry* setters, coordinates are clipped to [0, chromosome size]
+        (only to 0, without *chromSizes*). Entries left without length are removed. A sorted *BedContainer* may become
+        unsorted, so it is flagged as not sorted.
+
+        :param int left: Number of bp to add on the Left side (5' end, with *considerStrand*).
+        :param None,int right: Number of bp to add on the Right side (3' end, with *considerStrand*). (default *left*)
+        :param bool considerStrand: If *True*, sides follow the DNA strand. *BedContainer6* only. (default *False*)
+        :param None,str,Dict chromSizes: Chromosome sizes, or the path to a chrom-sizes file or FASTA index (".fai"). (optional)
+        :return int: Number of removed entries.
+        """
+        chromSizes = self._checkSideArguments(considerStrand, chromSizes)
+        right = left if right is None else right
+        nRemoved = 0
+        for chrom in list(self.chrList):
+            columns = self.bedContainer[chrom]
+            leftAmounts, rightAmounts = self._sideAmounts(columns, left, right, considerStrand)
+            sCoords = np.frombuffer(columns.sCoords, dtype=np.int64) - leftAmounts
+            eCoords = np.frombuffer(columns.eCoords, dtype=np.int64) + rightAmounts
+            nRemoved += self._moveCoords(chrom, sCoords, eCoords, None if chromSizes is None else chromSizes[chrom])
+        self.isSorted = False
+        return nRemoved
+
+    def shift(self, value: int, considerStrand: bool = False,
+              chromSizes: Union[None, str, Dict[str, int]] = None) -> int:
+        """
+        Shifts all entries *value* bp to the right, if *value* is positive, or to the left, if negative, in one vectorized
+        pass per chromosome, similar to ``bedtools shift``.
+
+        With *considerStrand*, positive values shift downstream and negative values upstream ("-" strand entries move
+        to the left), as :py:meth:`~bedEntry.BedEntry6.BedEntry6.shift`.
+
+        Coordinates are clipped and entries left without length removed, as in
+        :py:meth:`~bedContainer.BedContainer.BedContainer.slop`.
+
+        :param int value: Number of bp to shift the entries.
+        :param bool considerStrand: If *True*, shift follows the DNA strand. *BedContainer6* only. (default *False*)
+        :param None,str,Dict chromSizes: Chromosome sizes, or the path to a chrom-sizes file or FASTA index (".fai"). (optional)
+        :return int: Number of removed entries.
+        """
+        chromSizes = self._checkSideArguments(considerStrand, chromSizes)
+        nRemoved = 0
+        for chrom in list(self.chrList):
+            columns = self.bedContainer[chrom]
+            shifts, _ = self._sideAmounts(columns, value, -value, considerStrand)
+            sCoords = np.frombuffer(columns.sCoords, dtype=np.int64) + shifts
+            eCoords = np.frombuffer(columns.eCoords, dtype=np.int64) + shifts
+            nRemoved += self._moveCoords(chrom, sCoords, eCoords, None if chromSizes is None else chromSizes[chrom])
+        self.isSorted = False
+        return nRemoved
+
+    def flank(self, left: int, right: Union[None, int] = None, considerStrand: bool = False,
+              chromSizes: Union[None, str, Dict[str, int]] = None) -> object:
+        """
+        Returns a new *BedContainer*, of the same class, with the flanking regions of all entries: *left* bp before
+        the Left side and *right* bp after the Right side (the same as *left*, if *None*), similar to ``bedtools flank``.
+        Each flank keeps the other fields of its entry, and flanks of an entry are in genomic order.
+
+        With *considerStrand*, *left* is the upstream (5') flank and *right* the downstream (3') flank, as in
+        :py:meth:`~bedContainer.BedContainer.BedContainer.slop`.
+
+        Flanks are clipped to [0, chromosome size] (only to 0, without *chromSizes*), and the ones left without length
+        are not added. The new *BedContainer* is not sorted.
+
+        :param int left: Length of the Left flank (5' flank, with *considerStrand*).
+        :param None,int right: Length of the Right flank (3' flank, with *considerStrand*). (default *left*)
+        :param bool considerStrand: If *True*, flanks follow the DNA strand. *BedContainer6* only. (default *False*)
+        :param None,str,Dict chromSizes: Chromosome sizes, or the path to a chrom-sizes file or FASTA index (".fai"). (optional)
+        :return BedContainer: *BedContainer* with the flanks.
+        """
+        right = left if right is None else right
+        if left < 0 or right < 0:
+            raise ValueError("Flank lengths can't be negative.")
+        chromSizes = self._checkSideArguments(considerStrand, chromSizes)
+
+        newContainer = type(self)(self.addExtras, self.schema)
+        for chrom in self.chrList:
+            columns = self.bedContainer[chrom]
+            leftAmounts, rightAmounts = self._sideAmounts(columns, left, right, considerStrand)
+            sCoords = np.frombuffer(columns.sCoords, dtype=np.int64)
+            eCoords = np.frombuffer(columns.eCoords, dtype=np.int64)
+            # Rows of the Left and Right flanks of each entry, interleaved.
+            flankStarts = np.column_stack((sCoords - leftAmounts, eCoords)).ravel()
+            flankEnds = np.column_stack((sCoords, eCoords + rightAmounts)).ravel()
+            kept = self._clipCoords(flankStarts, flankEnds, None if chromSizes is None else chromSizes[chrom])
+            rows = np.flatnonzero(kept)
+            if not len(rows):
+                continue
+            flanks = columns.take((rows // 2).tolist())
+            flanks.sCoords = array('q', flankStarts[rows].tobytes())
+            flanks.eCoords = array('q', flankEnds[rows].tobytes())
+            newContainer._addChr(chrom)
+            newContainer.bedContainer[chrom] = flanks
+            newContainer.entryCounts += len(rows)
+        newContainer._invalidateIndexes()
+        return newContainer
+
+    @staticmethod
+    def _coverageRuns(starts: List[int], ends: List[int], chromSize: Union[None, int]) \
+            -> Generator[Tuple[int, int, int], None, None]:
+        """
+        Sweeps the sorted start and end coordinates of the entries of a chromosome (the depth goes up at each start
+        and down at each end), yielding (start, end, depth) runs of constant depth. Runs without depth are only yielded
+        if *chromSize* is given, from 0 to the chromosome end, and runs past *chromSize* are clipped.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param List[int] starts: Sorted start coordinates.
+        :param List[int] ends: Sorted end coordinates.
+        :param None,int chromSize: Chromosome size. (optional)
+        """
+        limit = chromSize if chromSize is not None else float("inf")
+        nEntries = len(starts)
+        depth = position = 0
+        runStart = runDepth = None
+        nextStart = nextEnd = 0
+        while nextEnd < nEntries and position < limit:
+            eventPosition = min(starts[nextStart], ends[nextEnd]) if nextStart < nEntries else ends[nextEnd]
+            eventPosition = min(eventPosition, limit)
+            if eventPosition > position and (depth or chromSize is not None):
+                # Consecutive runs with the same depth (an entry starting where another ends) are joined.
+                if runStart is not None and runDepth == depth and runEnd == position:
+                    runEnd = eventPosition
+                else:
+                    if runStart is not None:
+                        yield runStart, runEnd, runDepth
+                    runStart, runEnd, runDepth = position, eventPosition, depth
+            position = eventPosition
+            while nextStart < nEntries and starts[nextStart] == position:
+                depth += 1
+                nextStart += 1
+            while nextEnd < nEntries and ends[nextEnd] == position:
+                depth -= 1
+                nextEnd += 1
+        if chromSize is not None and position < chromSize:
+            if runStart is not None and runDepth == 0 and runEnd == position:
+                runEnd = chromSize
+            else:
+                if runStart is not None:
+                    yield runStart, runEnd, runDepth
+                runStart, runEnd, runDepth = position, chromSize, 0
+        if runStart is not None:
+            yield runStart, runEnd, runDepth
+
+    def _iterCoverage(self, chromSizes: Union[None, Dict[str, int]], strandCodes: List[Union[None, int]]) \
+            -> Generator[Tuple[str, int, int, int, Union[None, int]], None, None]:
+        """
+        Yields the coverage runs (chromosome, start, end, depth, strand code), chromosome by chromosome, and for each one
+        strand by strand.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param None,Dict chromSizes: Chromosome sizes, or *None* for the *BedContainer* chromosomes.
+        :param List strandCodes: Strand codes to compute separately, or [*None*] for all entries together.
+        """
+        chromosomes = self.chrList if chromSizes is None else chromSizes
+        for chrom in chromosomes:
+            columns = self.bedContainer.get(chrom)
+            chromSize = None if chromSizes is None else chromSizes[chrom]
+            for strandCode in strandCodes:
+                if columns is None:
+                    starts = ends = []
+                elif strandCode is None:
+                    starts, ends = sorted(columns.sCoords), sorted(columns.eCoords)
+                else:
+                    rows = [row for row in range(len(columns)) if columns.strands[row] == strandCode]
+                    starts = sorted(columns.sCoords[row] for row in rows)
+                    ends = sorted(columns.eCoords[row] for row in rows)
+                for start, end, depth in self._coverageRuns(starts, ends, chromSize):
+                    yield chrom, start, end, depth, strandCode
+
+    def iterCoverage(self, chromSizes: Union[None, str, Dict[str, int]] = None, considerStrand: bool = False) \
+            -> Generator[Tuple, None, None]:
+        """
+        Yields the per-base depth of the entries, run-length encoded as (*chr*, start, end, depth) tuples (plus the strand,
+        if *considerStrand* is *True*), similar to ``bedtools genomecov -bg``. It is computed chromosome by chromosome,
+        with a sweep over the sorted coordinates (not per base), so only the runs of one chromosome are in memory.
+
+        Coordinates are half-open, as in Bed Files. Without *chromSizes*, only runs with depth are given, for the
+        *BedContainer* chromosomes. With *chromSizes*, zero depth runs are also given (as ``-bga``), for every chromosome
+        of *chromSizes* in its order, and runs past the chromosome end are clipped.
+
+        :param None,str,Dict chromSizes: Chromosome sizes, or the path to a chrom-sizes file or FASTA index (".fai"). (optional)
+        :param bool considerStrand: If *True*, depth is computed separately for each DNA strand ("+" runs, then "-" runs, for each chromosome). *BedContainer6* only. (default *False*)
+        """
+        if considerStrand and not self._hasStrand():
+            raise ValueError("Strand can only be considered in BedContainer6 objects.")
+        if chromSizes is not None:
+            chromSizes = self._checkChromSizes(chromSizes)
+        if not considerStrand:
+            for chrom, start, end, depth, _ in self._iterCoverage(chromSizes, [None]):
+                yield chrom, start, end, depth
+            return
+        strandNames = self._columnsClass.STRAND_NAMES
+        for chrom, start, end, depth, strandCode in self._iterCoverage(chromSizes, list(strandNames)):
+            yield chrom, start, end, depth, strandNames[strandCode]
+
+    def coverage(self, chromSizes: Union[None, str, Dict[str, int]] = None, considerStrand: bool = False) -> object:
+        """
+        Returns the per-base depth of the entries, run-length encoded, in a new sorted *BedContainer* (see
+        :py:meth:`~bedContainer.BedContainer.BedContainer.iterCoverage` for the rules).
+
+        - *considerStrand* is *False* -> *BedContainer* with the depth as extra field (string, as read from a Bed File)
+        - *considerStrand* is *True* -> *BedContainer6* with the depth as score, the strand, and "." as name
+
+        To keep memory bounded for large inputs, write the runs with
+        :py:meth:`~bedContainer.BedContainer.BedContainer.writeBedGraph` or consume
+        :py:meth:`~bedContainer.BedContainer.BedContainer.iterCoverage` instead.
+
+        :param None,str,Dict chromSizes: Chromosome sizes, or the path to a chrom-sizes file or FASTA index (".fai"). (optional)
+        :param bool considerStrand: If *True*, depth is computed separately for each DNA strand. *BedContainer6* only. (default *False*)
+        :return: A sorted *BedContainer* (or *BedContainer6*) with the depth runs.
+        """
+        newObject = type(self)(False) if considerStrand else BedContainer(True)
+        runs = self.iterCoverage(chromSizes, considerStrand)
+        for chrom, chromRuns in groupby(runs, key=itemgetter(0)):
+            chromRuns = list(chromRuns)
+            if considerStrand:
+                rows = [[chrom, start, end, ".", ".", strand] for _, start, end, _, strand in chromRuns]
+            else:
+                rows = [[chrom, start, end, str(depth)] for _, start, end, depth in chromRuns]
+            # Runs are built from validated rows, so they are added in one batch without checks.
+            newObject._addChr(chrom)
+            newColumns = newObject.bedContainer[chrom]
+            newColumns.extendLines(rows, list(range(1, len(rows) + 1)), not considerStrand, trusted=True)
+            if considerStrand:
+                # Integer scores are kept, as by the BedEntry6 score setter.
+                newColumns.scores = [run[3] for run in chromRuns]
+                newColumns.sort()
+            newObject.entryCounts += len(rows)
+        newObject._invalidateIndexes()
+        newObject.isSorted = True
+        return newObject
+
+    def writeBedGraph(self, BedFilePath: str, chromSizes: Union[None, str, Dict[str, int]] = None,
+                      strand: Union[None, str] = None, compression: Union[None, str] = None) -> None:
+        """
+        Writes the per-base depth of the entries in a bedGraph file (*chr*, start, end, depth), streaming the runs of
+        :py:meth:`~bedContainer.BedContainer.BedContainer.iterCoverage` one chromosome at a time.
+
+        The file is compressed as described in :py:func:`~bedContainer.BedIO.openBedFile`.
+
+        :param str BedFilePath: The path where the bedGraph file will be writen.
+        :param None,str,Dict chromSizes: Chromosome sizes, or the path to a chrom-sizes file or FASTA index (".fai"). (optional)
+        :param None,"+","-" strand: If given, only the depth of entries in this DNA strand. *BedContainer6* only. (optional)
+        :param None,str compression: "bgzf", "gzip" or *None*. (optional)
+        """
+        if strand is not None:
+            if not self._hasStrand():
+                raise ValueError("Strand can only be considered in BedContainer6 objects.")
+            strandCode = self._columnsClass.STRAND_CODES[strand]
+        else:
+            strandCode = None
+        if chromSizes is not None:
+            chromSizes = self._checkChromSizes(chromSizes)
+        runs = self._iterCoverage(chromSizes, [strandCode])
+        writeBedFile(BedFilePath, ((chrom, start, end, depth) for chrom, start, end, depth, _ in runs),
+                     compression=compression)
+
+    def countReads(self, bam: Union[str, pysam.AlignmentFile], considerStrand: bool = False, mapq: int = 0,
+                   flags: int = DEFAULT_FLAGS, fragmentMode: bool = False, maxFragmentLength: int = 1000,
+                   processes: int = 1) -> np.ndarray:
+        """
+        Counts the reads of a BAM file overlapping each entry, with one pass over the BAM file per chromosome (see
+        :py:func:`~bedContainer.ReadCounting.countChrReads`), instead of one *fetch* and list of reads per entry as
+        :py:meth:`~bedEntry.BedEntry.BedEntry.getReadsOverlapping`.
+
+        With *processes* higher than 1, the entries are split in chunks counted in parallel (see
+        :py:meth:`~bedContainer.BedContainer.BedContainer.countReadsMatrix`).
+
+        :param str,pysam.AlignmentFile bam: Path to an indexed BAM file, or the opened file.
+        :param bool considerStrand: If *True*, reads are only counted in entries of their strand (*BedContainer6* only). (default *False*)
+        :param int mapq: Minimum mapping quality. (default 0)
+        :param int flags: Reads with any of these SAM flags are not counted. (default 0x704: unmapped, not primary, QC fail, duplicate)
+        :param bool fragmentMode: *True* to count each pair of mates once, over its fragment. (default *False*)
+        :param int maxFragmentLength: Length (bp) fetched before each entry in *fragmentMode*. (default 1000)
+        :param int processes: Number of worker processes. (default 1)
+        :return np.ndarray: Number of reads of each entry, in the *BedContainer* order (as its iteration).
+        """
+        if considerStrand and not self._hasStrand():
+            raise ValueError("Strand can only be considered in BedContainer6 objects.")
+        if processes > 1:
+            return self.countReadsMatrix([bam], considerStrand, mapq, flags, fragmentMode, maxFragmentLength,
+                                         processes)[0]
+        bamFile = pysam.AlignmentFile(bam) if isinstance(bam, str) else bam
+        try:
+            counts = [countChrReads(bamFile, chrom, self.bedContainer[chrom].sCoords, self.bedContainer[chrom].eCoords,
+                                    self.bedContainer[chrom].strands if considerStrand else None, mapq, flags,
+                                    fragmentMode, maxFragmentLength)
+                      for chrom in self.chrList]
+        finally:
+            if bamFile is not bam:
+                bamFile.close()
+        return np.concatenate(counts) if counts else np.zeros(0, dtype=np.int64)
+
+    def _countChunks(self, nChunks: int) -> List[Tuple[str, List[int]]]:
+        """
+        Splits the rows of each chromosome, sorted by start coordinate, in genomic chunks with about the same number of
+        entries, to have at least *nChunks* chunks in total.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param int nChunks: Minimum number of chunks.
+        :return List: (*chr*, row positions) of each chunk.
+        """
+        chunkSize = max(-(-self.entryCounts // nChunks), 1)
+        chunks = []
+        for chrom in self.chrList:
+            columns = self.bedContainer[chrom]
+            rows = sorted(range(len(columns)), key=columns.sCoords.__getitem__)
+            for first in range(0, len(rows), chunkSize):
+                chunks.append((chrom, rows[first:first + chunkSize]))
+        return chunks
+
+    def countReadsMatrix(self, bams: List[Union[str, pysam.AlignmentFile]], considerStrand: bool = False,
+                         mapq: int = 0, flags: int = DEFAULT_FLAGS, fragmentMode: bool = False,
+                         maxFragmentLength: int = 1000, processes: int = 1) -> np.ndarray:
+        """
+        Counts the reads of several BAM files (e.g. samples) overlapping each entry, as
+        :py:meth:`~bedContainer.BedContainer.BedContainer.countReads`, returning a count matrix.
+
+        With *processes* higher than 1, the work is split by BAM file and by genomic chunks of entries (sorted by start,
+        with about the same number of entries, a few per process), run by a *ProcessPoolExecutor*. Each worker opens its
+        own *pysam.AlignmentFile*, and only coordinates and count arrays are sent between processes.
+
+        :param List bams: Paths to indexed BAM files (or the opened files, reopened by path in the workers).
+        :param bool considerStrand: If *True*, reads are only counted in entries of their strand (*BedContainer6* only). (default *False*)
+        :param int mapq: Minimum mapping quality. (default 0)
+        :param int flags: Reads with any of these SAM flags are not counted. (default 0x704)
+        :param bool fragmentMode: *True* to count each pair of mates once, over its fragment. (default *False*)
+        :param int maxFragmentLength: Length (bp) fetched before each entry in *fragmentMode*. (default 1000)
+        :param int processes: Number of worker processes. (default 1)
+        :return np.ndarray: Count matrix with one row per BAM file and one column per entry, in the *BedContainer* order.
+        """
+        if considerStrand and not self._hasStrand():
+            raise ValueError("Strand can only be considered in BedContainer6 objects.")
+        if processes <= 1:
+            matrix = np.zeros((len(bams), self.entryCounts), dtype=np.int64)
+            for bamIndex, bam in enumerate(bams):
+                matrix[bamIndex] = self.countReads(bam, considerStrand, mapq, flags, fragmentMode, maxFragmentLength)
+            return matrix
+
+        paths = [bam if isinstance(bam, str) else bam.filename.decode() for bam in bams]
+        chromOffsets = {}
+        offset = 0
+        for chrom in self.chrList:
+            chromOffsets[chrom] = offset
+            offset += len(self.bedContainer[chrom])
+
+        matrix = np.zeros((len(paths), self.entryCounts), dtype=np.int64)
+        chunks = self._countChunks(processes * 4)
+        with ProcessPoolExecutor(processes) as executor:
+            futures = {}
+            for chrom, rows in chunks:
+                columns = self.bedContainer[chrom]
+                sCoords = array('q', [columns.sCoords[row] for row in rows])
+                eCoords = array('q', [columns.eCoords[row] for row in rows])
+                strands = array('b', [columns.strands[row] for row in rows]) if considerStrand else None
+                positions = np.array(rows, dtype=np.int64) + chromOffsets[chrom]
+                for bamIndex, path in enumerate(paths):
+                    future = executor.submit(countChrReadsTask, path, chrom, sCoords, eCoords, strands, mapq, flags,
+                                             fragmentMode, maxFragmentLength)
+                    futures[future] = (bamIndex, positions)
+            for future in as_completed(futures):
+                bamIndex, positions = futures[future]
+                matrix[bamIndex, positions] = future.result()
+        return matrix
+
+    MERGE_OPERATIONS = ("count", "sum", "mean", "max", "distinct")
+
+    @staticmethod
+    def _mergeRows(columns: BedColumns, rows: Iterable[int], distance: int) \
+            -> Generator[Tuple[int, int, List[int]], None, None]:
+        """
+        Groups sorted rows of a column storage into clusters of overlapping rows, or rows apart up to *distance* bp,
+        in a single pass. Yields (start, end, row positions) of each cluster.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param BedColumns columns: Sorted column storage.
+        :param Iterable[int] rows: Row positions to group, in sorted order.
+        :param int distance: Maximum distance (bp) between rows of the same cluster.
+        """
+        sCoords, eCoords = columns.sCoords, columns.eCoords
+        clusterRows: List[int] = []
+        clusterStart = clusterEnd = 0
+        for row in rows:
+            sCoord = sCoords[row]
+            if clusterRows and sCoord <= clusterEnd + distance:
+                clusterRows.append(row)
+                clusterEnd = max(clusterEnd, eCoords[row])
+            else:
+                if clusterRows:
+                    yield clusterStart, clusterEnd, clusterRows
+                clusterStart, clusterEnd, clusterRows = sCoord, eCoords[row], [row]
+        if clusterRows:
+            yield clusterStart, clusterEnd, clusterRows
+
+    @staticmethod
+    def _aggregate(values: List, operation: str) -> Union[int, float, str]:
+        """
+        Aggregates the values of a merged field (see :py:meth:`~bedContainer.BedContainer.BedContainer.mergeIntervals`).
+
+        Missing extra fields (*None*) are ignored, and "." is given if there are no values left. Numeric operations also
+        ignore the values that are not numbers (e.g. "." scores).
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param List values: Values of the merged rows.
+        :param str operation: One of *MERGE_OPERATIONS*.
+        :return: The aggregated value.
+        """
+        if operation == "count":
+            return len(values)
+        values = [value for value in values if value is not None]
+        if operation == "distinct":
+            return ",".join(str(value) for value in dict.fromkeys(values)) or "."
+
+        numbers = []
+        for value in values:
+            if isinstance(value, str):
+                try:
+                    value = int(value)
+                except ValueError:
+                    try:
+                        value = float(value)
+                    except ValueError:
+                        continue
+            numbers.append(value)
+        if not numbers:
+            return "."
+        if operation == "sum":
+            return sum(numbers)
+        if operation == "mean":
+            return sum(numbers) / len(numbers)
+        return max(numbers)
+
+    def mergeIntervals(self, distance: int = 0, considerStrand: bool = False,
+                       aggregate: Union[None, Dict[Union[str, int], Union[str, List[str]]]] = None) -> object:
+        """
+        Returns a new *BedContainer* with the overlapping entries of each chromosome merged into a single entry, similar
+        to ``bedtools merge``. Overlapping follows the rule of :py:meth:`~bedEntry.BedEntry.BedEntry.isOverlapping`,
+        so book-ended entries are also merged. With *distance*, entries apart up to *distance* bp are merged too.
+
+        The entries are merged in one pass per chromosome, so this *BedContainer* is sorted first with
+        :py:meth:`~bedContainer.BedContainer.BedContainer.sort`, unless already flagged as sorted (*isSorted*).
+
+        *aggregate* gives the fields of the merged entries to summarize, and how, as
+        {field: operation (or List of operations)}. Fields are "sCoord", "eCoord", "name" and "score" (*BedContainer6*), or
+        the position of an extra field (if *addExtras*; rows without it are ignored), and the operations are "count", "sum", "mean", "max" and "distinct" (comma separated unique values).
+        The results are added as extra fields (strings, as read from a Bed File) of the merged entries, in the given
+        order. E.g.
+        ``mergeIntervals(aggregate={"name": "distinct", "score": ["count", "max"]})``.
+
+        :param int distance: Maximum distance (bp) between merged entries. (default 0)
+        :param bool considerStrand: If *True*, only entries in the same DNA strand are merged (*BedContainer6* only). (default *False*)
+        :param None,Dict aggregate: Fields to aggregate -> operation(s). (optional)
+        :return: A sorted *BedContainer* with the merged entries, or a *BedContainer6* (with the strand, and "." as name and score) if *considerStrand*.
+        """
+        if considerStrand and not self._hasStrand():
+            raise ValueError("Strand can only be considered in BedContainer6 objects.")
+        operations = []
+        fieldNames = [field for field in self._columnsClass.FIELD_COLUMNS if field != "strand"]
+        for field, fieldOperations in (aggregate or {}).items():
+            if field == "strand":
+                raise ValueError("Strand can not be aggregated.")
+            if type(field) == int:
+                if field < 0:
+                    raise ValueError("Extra field position {} is negative.".format(field))
+                if not self.addExtras:
+                    raise ValueError("Extra field {} can not be aggregated, since the BedContainer has no extra fields "
+                                     "(addExtras is False).".format(field))
+            elif field not in fieldNames:
+                raise ValueError("Field {} is not one of {} or an extra field position."
+                                 .format(field, ", ".join(fieldNames)))
+            for operation in [fieldOperations] if isinstance(fieldOperations, str) else fieldOperations:
+                if operation not in self.MERGE_OPERATIONS:
+                    raise ValueError("Operation {} is not one of {}.".format(operation, ", ".join(self.MERGE_OPERATIONS)))
+                operations.append((field, operation))
+
+        if not self.isSorted:
+            self.sort()
+
+        newObject = (type(self) if considerStrand else BedContainer)(bool(operations))
+        for chrom in self.chrList:
+            columns = self.bedContainer[chrom]
+            if considerStrand:
+                groups = [(strand, [row for row in range(len(columns)) if columns.strands[row] == strandCode])
+                          for strand, strandCode in columns.STRAND_CODES.items()]
+            else:
+                groups = [(None, range(len(columns)))]
+            mergedRows = []
+            for strand, rows in groups:
+                for start, end, clusterRows in self._mergeRows(columns, rows, distance):
+                    coreFields = [chrom, start, end] if strand is None else [chrom, start, end, ".", ".", strand]
+                    extras = [str(len(clusterRows) if operation == "count" else
+                                  self._aggregate([columns.fieldValue(field, row) for row in clusterRows], operation))
+                              for field, operation in operations]
+                    mergedRows.append(coreFields + extras)
+            if not mergedRows:
+                continue
+            # Merged coordinates come from validated rows, so they are added in one batch without checks.
+            newObject._addChr(chrom)
+            newColumns = newObject.bedContainer[chrom]
+            newColumns.extendLines(mergedRows, list(range(1, len(mergedRows) + 1)), bool(operations), trusted=True)
+            if considerStrand:
+                newColumns.sort()
+            newObject.entryCounts += len(mergedRows)
+
+        newObject._invalidateIndexes()
+        newObject.isSorted = True
+        return newObject
+
     ######################
     ##  IO Management   ##
     ######################
 
-    def readFromBedFile(self, BedFilePath: str) -> None:
+    def readFromBedFile(self, BedFilePath: str, trusted: bool = False) -> None:
         """
         Read a Bed File with 3 Columns (is possible to add more in extraFields) and store in the *BedContainer* object.
+        Header lines (*track*, *browser* and *#* comments) and empty lines are skipped. gzip and BGZF compressed files
+        are also read (see :py:func:`~bedContainer.BedIO.openBedFile`).
+
+        The file is read in large chunks. Chunks whose lines all have the same number of fields are parsed in bulk, one
+        vectorized pass per column, and the other chunks line by line, in one batch per chromosome. With *trusted* as
+        *True*, the coordinate rules of *BedEntry* setters (not negative, start lower than end) are not checked, for
+        files already validated. Malformed lines are always reported with their line number.
 
         :param str BedFilePath: Path to Bed File Format
+        :param bool trusted: *True* to skip the coordinate rules. (default *False*)
         """
-        with open(BedFilePath) as readFile:
-            for line in readFile:
-                self.addFrom_List(line.strip().split("\t"))
+        # The parsed rows are all kept alive until added, so the cyclic garbage collector would only waste time.
+        gcEnabled = gc.isenabled()
+        gc.disable()
+        try:
+            lineNumber = 0
+            with openBedFile(BedFilePath) as readFile:
+                while True:
+                    text = readFile.read(self.READ_CHUNK_BYTES)
+                    if not text:
+                        break
+                    if not text.endswith("\n"):
+                        text += readFile.readline()
+                    lineNumber = self._addLines(text, lineNumber, trusted)
+        finally:
+            if gcEnabled:
+                gc.enable()
         self.isSorted = False
 
-    def writeToBedFile(self, BedFilePath: str) -> None:
+    def _addLines(self, text: str, lineNumber: int, trusted: bool) -> int:
+        """
+        Adds a chunk of whole Bed File lines in bulk (see *_addColumnarLines*) or, if it can't, in one batch per
+        chromosome.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param str text: Bed File lines.
+        :param int lineNumber: Number of lines read before this chunk.
+        :param bool trusted: *True* to skip the coordinate rules.
+        :return int: Number of lines read including this chunk.
+        """
+        # Header lines are usually at the start of the file, so they are skipped before adding the chunk in bulk.
+        offset = 0
+        while offset < len(text):
+            lineEnd = text.find("\n", offset)
+            lineEnd = len(text) if lineEnd < 0 else lineEnd
+            first = text[offset:lineEnd].strip().split("\t", 1)[0]
+            if first and not first.startswith(HEADER_PREFIXES):
+                break
+            offset = lineEnd + 1
+        if offset < len(text) and self._addColumnarLines(text[offset:] if offset else text, trusted):
+            return lineNumber + text.count("\n") + (not text.endswith("\n"))
+
+        lines = text.split("\n")
+        if not lines[-1]:
+            lines.pop()
+        batches: Dict[str, Tuple[List, List[int]]] = {}
+        # Extra fields are kept as the raw tail of the line, split only when read.
+        maxSplit = self._columnsClass.CORE_COLUMNS
+        for line in lines:
+            lineNumber += 1
+            fields = line.strip().split("\t", maxSplit)
+            batch = batches.get(fields[0])
+            if batch is None:
+                # Header and empty lines are only checked for new first fields, instead of every line.
+                if not fields[0] or fields[0].startswith(HEADER_PREFIXES):
+                    continue
+                batch = batches[fields[0]] = ([], [])
+            batch[0].append(fields)
+            batch[1].append(lineNumber)
+
+        for chrom, (rows, lineNumbers) in batches.items():
+            if chrom not in self.bedContainer:
+                self._addChr(chrom)
+            self.bedContainer[chrom].extendLines(rows, lineNumbers, self.addExtras, trusted)
+            self._invalidateIndexes(chrom, appended=True)
+            self.entryCounts += len(rows)
+        return lineNumber
+
+    def _addColumnarLines(self, text: str, trusted: bool) -> bool:
+        """
+        Adds a chunk of Bed File lines all with the same number of fields (the common case) in bulk. The field offsets
+        of all lines are found at once, from the tabs and new lines of the chunk bytes, and each column is parsed by
+        :py:meth:`~bedContainer.BedColumns.BedColumns._parseColumns`. Rows are then grouped by chromosome with a stable
+        sort, keeping their order.
+
+        Nothing is added, and *False* is returned, if the chunk is not ASCII, has lines with other number of fields,
+        header or empty lines, surrounding white space, or fields that can't be parsed in bulk. These chunks are added
+        line by line by *_addLines*, which reports the malformed lines.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param str text: Bed File lines.
+        :param bool trusted: *True* to skip the coordinate rules.
+        :return bool: *True* if the lines were added.
+        """
+        columnsClass = self._columnsClass
+        if not text.endswith("\n"):
+            text += "\n"
+        if not text.isascii() or "\r" in text:
+            return False
+        buffer = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+        newLines = np.flatnonzero(buffer == ord("\n"))
+        tabs = np.flatnonzero(buffer == ord("\t"))
+        nLines = len(newLines)
+        nTabs = len(tabs) // nLines
+        if nTabs < columnsClass.CORE_COLUMNS - 1 or len(tabs) != nTabs * nLines:
+            return False
+        tabs = tabs.reshape(nLines, nTabs)
+        lineStarts = np.concatenate(([0], newLines[:-1] + 1))
+        # Every line holds its share of tabs, and doesn't start or end with white space (stripped by the slow path).
+        if not ((tabs[:, 0] > lineStarts).all() and (tabs[:, -1] < newLines).all() and
+                (buffer[lineStarts] > ord(" ")).all() and (buffer[newLines - 1] > ord(" ")).all()):
+            return False
+
+        starts = np.empty((nLines, nTabs + 1), dtype=np.int64)
+        ends = np.empty((nLines, nTabs + 1), dtype=np.int64)
+        starts[:, 0] = lineStarts
+        starts[:, 1:] = tabs + 1
+        ends[:, :-1] = tabs
+        ends[:, -1] = newLines
+        chroms = _sliceFields(text, lineStarts, tabs[:, 0])
+        chromOrder = list(dict.fromkeys(chroms))
+        if any(chrom.startswith(HEADER_PREFIXES) for chrom in chromOrder):
+            return False
+        bounds = [0, nLines]
+        if len(chromOrder) > 1:
+            # Lines are grouped by chromosome before parsing, so each one gets a slice of the new columns.
+            codeOf = {chrom: code for code, chrom in enumerate(chromOrder)}
+            codes = np.fromiter(map(codeOf.__getitem__, chroms), dtype=np.int64, count=nLines)
+            order = np.argsort(codes, kind="stable")
+            starts = starts[order]
+            ends = ends[order]
+            bounds = np.searchsorted(codes[order], np.arange(len(chromOrder) + 1)).tolist()
+        try:
+            parsed = columnsClass._parseColumns(text, buffer, starts, ends, self.addExtras, trusted)
+        except columnsClass._PARSE_ERRORS:
+            return False
+
+        for code, chrom in enumerate(chromOrder):
+            if chrom not in self.bedContainer:
+                self._addChr(chrom)
+            self.bedContainer[chrom]._extendParsed([column[bounds[code]:bounds[code + 1]] for column in parsed])
+            self._invalidateIndexes(chrom, appended=True)
+        self.entryCounts += nLines
+        return True
+
+    def writeToBedFile(self, BedFilePath: str, entries: Union[None, Iterable] = None,
+                       compression: Union[None, str] = None) -> None:
         """
         Writes in a Bed File Format all *BedEntry* objects inside *BedContainer*.
         If the BedContainer has defined having the flag *addExtras* as *True*, the extra fields will also be write in the
         Bed File, in the same order as they are registered in *BedContainer* object.
 
+        If *entries* is given (e.g. a stream from :py:func:`~bedContainer.BedIO.iterBedFile`), those are written instead
+        of the *BedContainer* content, one at a time, with the same *addExtras* rule.
+
+        The file is compressed as described in :py:func:`~bedContainer.BedIO.openBedFile`: BGZF for paths ending in
+        ".gz", so it can be indexed with tabix.
+
         :param str BedFilePath: The path where the bed file will be writen.
+        :param None,Iterable entries: *BedEntry* objects or tuples to write instead of the *BedContainer* content. (optional)
+        :param None,str compression: "bgzf", "gzip" or *None*. (optional)
         """
-        with open(BedFilePath, 'w') as writeFile:
+        if entries is not None:
+            writeBedFile(BedFilePath, entries, self.addExtras, compression)
+            return
+
+        with openBedFile(BedFilePath, 'w', compression) as writeFile:
             for chromosome in self.select_Chromosomes():
-                for entry in self.bedContainer[chromosome]:
-                    if self.addExtras:
-                        tmpList = []
-                        for key in entry.extraFields.keys():
-                            tmpList.append(entry.extraFields[key])
-                        tmpList = "\t".join(tmpList)
-                        writeFile.write("{}\t{}\n".format(str(entry), str(tmpList)))
-                    else:
-                        writeFile.write("{}\n".format(str(entry)))
+                columns = self.bedContainer[chromosome]
+                for index in range(len(columns)):
+                    writeFile.write("{}\n".format(columns.line(index, self.addExtras)))
+
+    def save_binary(self, BedFilePath: str) -> None:
+        """
+        Saves the *BedContainer* in a compact binary snapshot, to be reloaded with
+        :py:meth:`~bedContainer.BedContainer.BedContainer.load_binary` much faster than parsing a Bed File.
+
+        It stores the chromosome list, the coordinate columns (raw arrays), the sorted flag and the extra fields, with
+        a format version and a checksum in the header.
+
+        :param str BedFilePath: Path of the snapshot file.
+        """
+        saveBinary(self, BedFilePath)
+
+    @classmethod
+    def load_binary(cls, BedFilePath: str, mmap: bool = True, verify: bool = False) -> object:
+        """
+        Loads a *BedContainer* saved by :py:meth:`~bedContainer.BedContainer.BedContainer.save_binary`.
+
+        With *mmap* as *True* the coordinate columns are memory mapped: the reload is near-instant and the pages are
+        shared by all processes using the same snapshot. Columns are only copied to memory when the container changes.
+        Snapshots with other format version, a wrong size or a wrong metadata checksum raise *ValueError*. The checksum
+        of the coordinate columns reads the whole file, so it is only checked with *verify* as *True*.
+
+        :param str BedFilePath: Path of the snapshot file.
+        :param bool mmap: *True* to memory map the coordinate columns. (default *True*)
+        :param bool verify: *True* to also check the checksum of the coordinate columns. (default *False*)
+        :return: The loaded *BedContainer* (of the class used to call it).
+        """
+        return loadBinary(cls, BedFilePath, mmap, verify)
+
+    def to_arrow(self) -> object:
+        """
+        Converts the *BedContainer* to a *pyarrow.Table* (see :py:func:`~bedContainer.BedArrow.toArrow` for its
+        columns), sharing the coordinate columns instead of creating *BedEntry* objects. Requires *pyarrow*.
+
+        The shared columns of the *BedContainer* are kept as read-only buffers (as after
+        :py:meth:`~bedContainer.BedContainer.BedContainer.load_binary`). They are copied back to arrays at its next
+        change, which the table never sees.
+
+        :return pyarrow.Table: The Arrow table.
+        """
+        return toArrow(self)
+
+    def to_pandas(self) -> object:
+        """
+        Converts the *BedContainer* to a *pandas.DataFrame*, with the columns of
+        :py:meth:`~bedContainer.BedContainer.BedContainer.to_arrow` (chromosome and strand as categorical), which
+        also leaves the shared columns as read-only buffers. Requires *pyarrow* and *pandas*.
+
+        :return pandas.DataFrame: The DataFrame.
+        """
+        return toArrow(self).to_pandas()
+
+    @classmethod
+    def from_arrow(cls, table: object, schema: Union[None, str, BedSchema] = None, addExtras: Union[None, bool] = None,
+                   trusted: bool = False) -> object:
+        """
+        Creates a *BedContainer* from a *pyarrow.Table* (see :py:func:`~bedContainer.BedArrow.fromArrow`), sharing its
+        coordinate buffers when possible. Requires *pyarrow*.
+
+        :param pyarrow.Table table: Table with "chrom", "start" and "end" columns (plus "name", "score" and "strand" for *BedContainer6*), and the extra fields.
+        :param None,str,BedSchema schema: Schema of the extra fields. (optional)
+        :param None,bool addExtras: *True* to keep the extra fields. (default *True* if the table has extra columns)
+        :param bool trusted: *True* to skip the coordinate rules. (default *False*)
+        :return: The new *BedContainer* (of the class used to call it).
+        """
+        return fromArrow(cls, table, schema, addExtras, trusted)
+
+    @classmethod
+    def from_pandas(cls, dataFrame: object, schema: Union[None, str, BedSchema] = None,
+                    addExtras: Union[None, bool] = None, trusted: bool = False) -> object:
+        """
+        Creates a *BedContainer* from a *pandas.DataFrame*, with the columns of
+        :py:meth:`~bedContainer.BedContainer.BedContainer.from_arrow` (the index is ignored). Requires *pyarrow* and
+        *pandas*.
+
+        :param pandas.DataFrame dataFrame: The DataFrame.
+        :param None,str,BedSchema schema: Schema of the extra fields. (optional)
+        :param None,bool addExtras: *True* to keep the extra fields. (default *True* if the DataFrame has extra columns)
+        :param bool trusted: *True* to skip the coordinate rules. (default *False*)
+        :return: The new *BedContainer* (of the class used to call it).
+        """
+        pa = _importArrow()
+        return fromArrow(cls, pa.Table.from_pandas(dataFrame, preserve_index=False), schema, addExtras, trusted)
+
+    def save_parquet(self, ParquetFilePath: str) -> None:
+        """
+        Saves the *BedContainer* in a Parquet file, with the columns of
+        :py:meth:`~bedContainer.BedContainer.BedContainer.to_arrow`. Requires *pyarrow*.
+
+        :param str ParquetFilePath: Path of the Parquet file.
+        """
+        _importArrow()
+        import pyarrow.parquet
+        pyarrow.parquet.write_table(toArrow(self), ParquetFilePath)
+
+    @classmethod
+    def load_parquet(cls, ParquetFilePath: str, schema: Union[None, str, BedSchema] = None,
+                     trusted: bool = False) -> object:
+        """
+        Loads a *BedContainer* from a Parquet file (e.g. saved by
+        :py:meth:`~bedContainer.BedContainer.BedContainer.save_parquet`). Requires *pyarrow*.
+
+        :param str ParquetFilePath: Path of the Parquet file.
+        :param None,str,BedSchema schema: Schema of the extra fields. (default the saved schema, if any)
+        :param bool trusted: *True* to skip the coordinate rules. (default *False*)
+        :return: The loaded *BedContainer* (of the class used to call it).
+        """
+        _importArrow()
+        import pyarrow.parquet
+        return fromArrow(cls, pyarrow.parquet.read_table(ParquetFilePath), schema, None, trusted)
+
+    def save_arrow(self, ArrowFilePath: str) -> None:
+        """
+        Saves the *BedContainer* in an uncompressed Arrow IPC (Feather) file, with the columns of
+        :py:meth:`~bedContainer.BedContainer.BedContainer.to_arrow`. Requires *pyarrow*.
+
+        :param str ArrowFilePath: Path of the Arrow file.
+        """
+        _importArrow()
+        import pyarrow.feather
+        pyarrow.feather.write_feather(toArrow(self), ArrowFilePath, compression="uncompressed")
+
+    @classmethod
+    def load_arrow(cls, ArrowFilePath: str, schema: Union[None, str, BedSchema] = None, mmap: bool = True,
+                   trusted: bool = False) -> object:
+        """
+        Loads a *BedContainer* from an Arrow IPC (Feather) file (e.g. saved by
+        :py:meth:`~bedContainer.BedContainer.BedContainer.save_arrow`). With *mmap* as *True* (and an uncompressed
+        file), the coordinate columns are memory mapped, as in :py:meth:`~bedContainer.BedContainer.BedContainer.load_binary`.
+        Requires *pyarrow*.
+
+        :param str ArrowFilePath: Path of the Arrow file.
+        :param None,str,BedSchema schema: Schema of the extra fields. (default the saved schema, if any)
+        :param bool mmap: *True* to memory map the file. (default *True*)
+        :param bool trusted: *True* to skip the coordinate rules. (default *False*)
+        :return: The loaded *BedContainer* (of the class used to call it).
+        """
+        _importArrow()
+        import pyarrow.feather
+        return fromArrow(cls, pyarrow.feather.read_table(ArrowFilePath, memory_map=mmap), schema, None, trusted)
 
     ###########################
     ##  Build-in Functions   ##
     ###########################
 
-    def __getitem__(self, item: int) -> BedEntry:
+    def __getitem__(self, item: Union[int, slice, Iterable[int]]) -> Union[BedEntry, BedContainerView]:
         '''
         Getter item function for BedContainer class.
-        Design to return a single BedEntry per time. Slices are not accepted, by now.
 
-        :param int item: Index of BedEntry to retrieve
-        :return BedEntry: A BedEntry Object(s)
-        '''
+        - Integer -> A single BedEntry. Negative indexes count from the end.
+        - Slice or List (or array) of integers -> A :py:class:`~bedContainer.BedContainerView.BedContainerView` with the selected rows, without copying them.
 
-        if item < 0:
-            raise ValueError("Negative index value is not accepted.")
+        Indexes out of boundaries raise a *ValueError*.
 
-        total = 0
-        for chromosome in self.select_Chromosomes():
-            nEntries = self.number_EntriesInChr(chromosome)
-            total += nEntries
-            if item < total:
-                return (self.bedContainer[chromosome][item - (total - nEntries)])
-        raise ValueError("Index out of boundaries")
+        :param int,slice,Iterable[int] item: Index (or indexes) of BedEntry to retrieve
+        :return: A BedEntry Object, or a BedContainerView with the selected rows
+        '''
+        if isinstance(item, slice):
+            return BedContainerView(self, range(self.entryCounts)[item])
+        try:
+            index = operator.index(item)
+        except TypeError:
+            return BedContainerView(self, [_checkIndex(i, self.entryCounts) for i in item])
+        columns, row = self._locate(_checkIndex(index, self.entryCounts))
+        return columns.entry(row)
 
     def __iter__(self) -> Generator[BedEntry, None, None]:
         '''
         Iterator function for BedContainer class.
 
+        Rows are stored in columns, so a new *BedEntry* is created for each row given. This keeps the memory of large
+        containers low, but iterating is slower than over a List of *BedEntry* objects already created. To only read
+        the values of many rows, :py:meth:`~bedContainer.BedContainer.BedContainer.iterRows` is several times faster.
+
         :return BedEntry:  A BedEntry Object
         '''
         for chromosome in self.select_Chromosomes():
@@ -1,8 +1,16 @@
-
+from bedEntry.BedEntry import BedEntry
 from bedEntry.BedEntry6 import BedEntry6
 
 from bedContainer.BedContainer import BedContainer
-from typing import Iterator, TypeVar, Generator, Generic, List, Dict, Union
+from bedContainer.BedColumns import BedColumns, BedColumns6
+from bedContainer.BedContainerView import BedContainerView
+from bedContainer.BedSchema import BedSchema
+from bedContainer.ReadCounting import DEFAULT_FLAGS, binnedReads, chrReadIntervals
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, TypeVar, Generator, Generic, List, Dict, Tuple, Union
+
+import numpy as np
+import pysam
 
 class BedContainer6(BedContainer):
     '''
@@ -11,9 +19,12 @@ class BedContainer6(BedContainer):
 
 
     '''
-    def __init__(self, addExtras: bool = False):
-        super().__init__(addExtras)
-        self.bedContainer: Dict[str, List[BedEntry6]] = {}
+
+    _columnsClass = BedColumns6
+
+    def __init__(self, addExtras: bool = False, schema: Union[None, str, BedSchema] = None):
+        super().__init__(addExtras, schema)
+        self.bedContainer: Dict[str, BedColumns6] = {}
         self.entryCounts: int = 0
         self.chrCounts: int = 0
         self.chrList: List[str] = []
@@ -36,78 +47,288 @@ class BedContainer6(BedContainer):
 
         :param List listBedEntry: A list of strings with the required properties to be initialized by *BedEntry* constructor.
         """
+        super().addFrom_List(listBedEntry)
+
+    def findEntriesWith(self, chr="Any", sCoord="Any", eCoord="Any", name="Any", strand="Any",
+                        extraFields: Union[None, Dict[int, object]] = None) -> List[BedEntry6]:
+        """
+        Return all BedEntry6 objects having chr, sCoord, eCoord, name or strand (and extra fields) equal to the given ones.
+
+        Lookups use hash indexes of the searched fields, as in
+        :py:meth:`~bedContainer.BedContainer.BedContainer.findEntriesWith`, so finding e.g. all entries with a given
+        name takes the time of the result size.
+
+        :param str chr: the chromosome where region is located
+        :param int sCoord: the start coordinate of the region
+        :param int eCoord: the end coordinate of the region
+        :param str name: the name of the entry
+        :param "+","-" strand: the DNA strand of the entry
+        :param None,Dict extraFields: Extra fields to match, as {position of the extra field: value}. (optional)
+        :return List: Return a list of BedEntry6 objects having the given features
+        """
+        conditions = {}
+        if sCoord != "Any":
+            conditions["sCoord"] = int(sCoord)
+        if eCoord != "Any":
+            conditions["eCoord"] = int(eCoord)
+        if name != "Any":
+            conditions["name"] = name
+        if strand != "Any":
+            if strand not in BedColumns6.STRAND_CODES:
+                raise ValueError("Strand must to be '+' or '-'")
+            conditions["strand"] = BedColumns6.STRAND_CODES[strand]
+        if extraFields:
+            conditions.update(extraFields)
+        return self._findEntries(chr, conditions)
+
+    def query(self, chr: str, start: int, end: int, strand: Union[None, str] = None) -> List[BedEntry6]:
+        """
+        Returns all *BedEntry6* objects overlapping the region, in O(log n + k) time using the overlap index.
+
+        It is used the same rule of :py:meth:`~bedEntry.BedEntry6.BedEntry6.isOverlapping`, so entries just touching
+        the region are also returned. The entries are returned in the *BedContainer6* order.
+
+        :param str chr: the chromosome where region is located
+        :param int start: the start coordinate of the region
+        :param int end: the end coordinate of the region
+        :param None,"+","-" strand: If given, only entries in this DNA strand are returned.
+        :return List: A List of all *BedEntry6* overlapping the region.
+        """
+        columns = self.bedContainer.get(chr)
+        rows = self._overlappingRows(chr, start, end)
+        if strand is not None:
+            strandCode = BedColumns6.STRAND_CODES[strand]
+            rows = [row for row in rows if columns.strands[row] == strandCode]
+        return [columns.entry(row) for row in rows]
+
+    @staticmethod
+    def _closestIndex(columns: BedColumns, strandCode: Union[None, int]) -> Tuple[List[int], List[int], List[int], List[int]]:
+        """
+        Builds the search arrays of :py:meth:`~bedContainer.BedContainer6.BedContainer6.closest` for the rows of a
+        chromosome (only the ones in the strand *strandCode*, if given): row positions sorted by start coordinate and
+        their starts, and row positions sorted by end coordinate and their ends.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param BedColumns columns: Column storage of the chromosome.
+        :param None,int strandCode: Strand code of the rows to include, or *None* for all.
+        :return Tuple: (rows by start, starts, rows by end, ends)
+        """
+        sCoords, eCoords = columns.sCoords, columns.eCoords
+        rows = range(len(columns))
+        if strandCode is not None:
+            rows = [row for row in rows if columns.strands[row] == strandCode]
+        byStart = sorted(rows, key=sCoords.__getitem__)
+        byEnd = sorted(rows, key=eCoords.__getitem__)
+        return byStart, [sCoords[row] for row in byStart], byEnd, [eCoords[row] for row in byEnd]
+
+    def closest(self, other: BedContainer, k: int = 1, considerStrand: bool = False, direction: str = "any") \
+            -> List[Tuple[BedEntry6, BedEntry, int]]:
+        """
+        Finds, for every entry of this *BedContainer6* (A), the *k* nearest entries of *other* (B) in the same chromosome,
+        similar to ``bedtools closest -k -D a``.
+
+        Distances are signed: 0 for overlapping entries (same rule of
+        :py:meth:`~bedEntry.BedEntry6.BedEntry6.isOverlapping`, so book-ended entries overlap), negative for B entries
+        upstream of A and positive for downstream ones. Upstream is the Left side, or, if *considerStrand* is *True*, the
+        5' end of A (as in :py:meth:`~bedEntry.BedEntry6.BedEntry6.addLeftClip`): Left side for "+" and Right side for
+        "-". With *considerStrand*, only B entries in the same DNA strand of A are searched.
+
+        *direction* "upstream" or "downstream" only searches B entries on that side (overlapping ones are always
+        included).
+
+        Instead of comparing every pair, the B entries of each chromosome are kept sorted by start and by end coordinate,
+        and the nearest ones on each side are found by binary search (overlapping ones with the overlap index).
+
+        :param BedContainer other: *BedContainer* (or *BedContainer6*) with the entries to search.
+        :param int k: Number of nearest entries to report for each A entry. (default 1)
+        :param bool considerStrand: If *True*, only entries in the same DNA strand, and upstream/downstream follow the A strand. *other* must be a *BedContainer6*. (default *False*)
+        :param str direction: "any", "upstream" or "downstream". (default "any")
+        :return List: (*entryA*, *entryB*, signed distance) tuples, ordered by A entry and then by distance. A entries without any B entry are not reported.
+        """
+        if direction not in ("any", "upstream", "downstream"):
+            raise ValueError("Direction {} is not \'any\', \'upstream\' or \'downstream\'.".format(direction))
+        if k < 1:
+            raise ValueError("k must be at least 1.")
+        if considerStrand and not other._hasStrand():
+            raise ValueError("Strand can only be considered between BedContainer6 objects.")
+
+        closestList = []
+        for chrom in self.chrList:
+            columnsB = other.bedContainer.get(chrom)
+            if columnsB is None:
+                continue
+            columnsA = self.bedContainer[chrom]
+            searchIndexes = {}
+            for indexA in range(len(columnsA)):
+                sCoordA = columnsA.sCoords[indexA]
+                eCoordA = columnsA.eCoords[indexA]
+                strandCode = columnsA.strands[indexA] if considerStrand else None
+                if strandCode not in searchIndexes:
+                    searchIndexes[strandCode] = self._closestIndex(columnsB, strandCode)
+                byStart, starts, byEnd, ends = searchIndexes[strandCode]
+
+                overlaps = other._overlappingRows(chrom, sCoordA, eCoordA)
+                if strandCode is not None:
+                    overlaps = [indexB for indexB in overlaps if columnsB.strands[indexB] == strandCode]
+                found = [(indexB, 0) for indexB in overlaps[:k]]
+
+                # The Left side is upstream, except for "-" entries when the strand is considered.
+                leftSign = 1 if strandCode is not None and strandCode < 0 else -1
+                searchLeft = direction == "any" or (direction == "upstream") == (leftSign < 0)
+                searchRight = direction == "any" or (direction == "downstream") == (leftSign < 0)
+                left = bisect_left(ends, sCoordA) - 1 if searchLeft else -1
+                right = bisect_right(starts, eCoordA) if searchRight else len(starts)
+                while len(found) < k and (left >= 0 or right < len(starts)):
+                    leftGap = sCoordA - ends[left] if left >= 0 else None
+                    rightGap = starts[right] - eCoordA if right < len(starts) else None
+                    if rightGap is None or (leftGap is not None and leftGap <= rightGap):
+                        found.append((byEnd[left], leftSign * leftGap))
+                        left -= 1
+                    else:
+                        found.append((byStart[right], -leftSign * rightGap))
+                        right += 1
+
+                if found:
+                    entryA = columnsA.entry(indexA)
+                    closestList.extend((entryA, columnsB.entry(indexB), distance) for indexB, distance in found)
+        return closestList
+
+    def profileMatrix(self, bam: Union[str, pysam.AlignmentFile], nBin: int = 100, flankUp: int = 0,
+                      flankDown: int = 0, considerStrand: bool = True, normalize: Union[None, str] = None,
+                      coverage: bool = False, mapq: int = 0, flags: int = DEFAULT_FLAGS, fragmentMode: bool = False,
+                      maxFragmentLength: int = 1000) -> np.ndarray:
+        """
+        Computes the binned profile of a BAM file over every entry (e.g. a metagene plot or heatmap): each entry, extended
+        *flankUp* bp upstream and *flankDown* bp downstream, is divided in *nBin* bins (as
+        :py:meth:`~bedEntry.BedEntry6.BedEntry6.binRegion`), and the reads overlapping each bin are counted (or, with
+        *coverage*, the mean depth of the bin is computed). Bins outside the chromosome are 0.
 
-        if listBedEntry[0] not in self.chrList:
-            self._addChr(listBedEntry[0])
+        With *considerStrand*, upstream follows the strand of each entry (Right side for "-"), and the bins of "-"
+        entries are reversed, so every row goes from 5' to 3'. Reads of both strands are counted.
 
-        tmpBedEntry = BedEntry6(listBedEntry[0], int(listBedEntry[1]), int(listBedEntry[2]),
-                                listBedEntry[3], listBedEntry[4], listBedEntry[5])
-        if self.addExtras:
-            for field in listBedEntry[6:]:
-                tmpBedEntry.addExtraField(field)
+        The reads are fetched once per chromosome (filtered as in
+        :py:meth:`~bedContainer.BedContainer.BedContainer.countReads`) and all bins are computed together with binary
+        searches over the read coordinates, without creating bin *BedEntry6* objects.
 
-        self.bedContainer[listBedEntry[0]].append(tmpBedEntry)
+        | *normalize* options:
 
-        self.entryCounts += 1
+        - *None* -> Read counts (or mean depth)
+        - "cpm" -> Counts (or depth) per million mapped reads of the BAM file
+        - "rpkm" -> Counts per kb of bin and per million mapped reads (not available with *coverage*)
+
+        :param str,pysam.AlignmentFile bam: Path to an indexed BAM file, or the opened file.
+        :param int nBin: Number of bins of each entry. (default 100)
+        :param int flankUp: Number of bp added upstream. (default 0)
+        :param int flankDown: Number of bp added downstream. (default 0)
+        :param bool considerStrand: If *True*, upstream and the bin order follow the entry strand. (default *True*)
+        :param None,str normalize: None, "cpm" or "rpkm". (default *None*)
+        :param bool coverage: *True* for the mean depth of each bin instead of read counts. (default *False*)
+        :param int mapq: Minimum mapping quality. (default 0)
+        :param int flags: Reads with any of these SAM flags are not counted. (default 0x704)
+        :param bool fragmentMode: *True* to count each pair of mates once, over its fragment. (default *False*)
+        :param int maxFragmentLength: Length (bp) fetched before each entry in *fragmentMode*. (default 1000)
+        :return np.ndarray: Matrix with one row per entry, in the *BedContainer6* order, and one column per bin.
+        """
+        if nBin < 1:
+            raise ValueError("nBin must be at least 1.")
+        if normalize not in (None, "cpm", "rpkm"):
+            raise ValueError("Normalization {} is not None, \'cpm\' or \'rpkm\'.".format(normalize))
+        if normalize == "rpkm" and coverage:
+            raise ValueError("RPKM normalization is only available for read counts.")
+
+        bamFile = pysam.AlignmentFile(bam) if isinstance(bam, str) else bam
+        try:
+            matrices = []
+            for chrom in self.chrList:
+                columns = self.bedContainer[chrom]
+                sCoords = np.frombuffer(columns.sCoords, dtype=np.int64)
+                eCoords = np.frombuffer(columns.eCoords, dtype=np.int64)
+                minus = np.frombuffer(columns.strands, dtype=np.int8) < 0 if considerStrand \
+                    else np.zeros(len(columns), dtype=bool)
+                starts = sCoords - np.where(minus, flankDown, flankUp)
+                ends = eCoords + np.where(minus, flankUp, flankDown)
+
+                # Bin edges as in binRegion: the first (length % nBin) bins are 1 bp longer.
+                quotients, remainders = np.divmod(np.maximum(ends - starts, 0), nBin)
+                binPositions = np.arange(nBin + 1)
+                edges = starts[:, None] + binPositions * quotients[:, None] + \
+                    np.minimum(binPositions, remainders[:, None])
+
+                chromLength = bamFile.get_reference_length(chrom) if bamFile.get_tid(chrom) >= 0 else 0
+                edges = np.clip(edges, 0, chromLength)
+                readStarts, readEnds = chrReadIntervals(bamFile, chrom, edges[:, 0].tolist(), edges[:, -1].tolist(),
+                                                        mapq, flags, fragmentMode, maxFragmentLength)
+                matrix = binnedReads(readStarts, readEnds, edges, coverage)
+                if normalize == "rpkm":
+                    widths = edges[:, 1:] - edges[:, :-1]
+                    matrix = np.divide(matrix * 1e3, widths, out=np.zeros(matrix.shape), where=widths > 0)
+                matrix[minus] = matrix[minus, ::-1]
+                matrices.append(matrix)
+            mappedReads = bamFile.mapped if normalize else 0
+        finally:
+            if bamFile is not bam:
+                bamFile.close()
+
+        profile = np.concatenate(matrices) if matrices else np.zeros((0, nBin), dtype=np.float64 if coverage else np.int64)
+        if normalize:
+            profile = profile * 1e6 / mappedReads if mappedReads else np.zeros(profile.shape)
+        return profile
 
     ######################
     ##  IO Management   ##
     ######################
 
-    def readFromBedFile(self, BedFilePath: str) -> None:
+    def readFromBedFile(self, BedFilePath: str, trusted: bool = False) -> None:
         """
         Read a Bed File with 6 Columns (is possible to add more in extraFields) and store in the *BedContainer6* object.
+        Header lines (*track*, *browser* and *#* comments) and empty lines are skipped. gzip and BGZF compressed files
+        are also read (see :py:func:`~bedContainer.BedIO.openBedFile`). Scores written as plain digits are stored as
+        integers, and the others (e.g. ".") as ".".
+
+        The file is read in large chunks. Chunks whose lines all have the same number of fields are parsed in bulk, one
+        vectorized pass per column, and the other chunks line by line, in one batch per chromosome. With *trusted* as
+        *True*, the coordinate rules of *BedEntry* setters (not negative, start lower than end) are not checked, for
+        files already validated. Malformed lines are always reported with their line number.
 
         :param str BedFilePath: Path to Bed File Format
+        :param bool trusted: *True* to skip the coordinate rules. (default *False*)
         """
-        with open(BedFilePath) as readFile:
-            for line in readFile:
-                self.addFrom_List(line.strip().split("\t"))
-        self.isSorted = False
+        super().readFromBedFile(BedFilePath, trusted)
 
-    def writeToBedFile(self, BedFilePath: str) -> None:
+    def writeToBedFile(self, BedFilePath: str, entries: Union[None, Iterable] = None,
+                       compression: Union[None, str] = None) -> None:
         """
         Writes in a Bed File Format all *BedEntry6* objects inside *BedContainer6*.
         If the BedContainer6 has defined having the flag *addExtras* as *True*, the extra fields will also be write in the
         Bed File, in the same order as they are registered in *BedContainer* object.
 
+        If *entries* is given (e.g. a stream from :py:func:`~bedContainer.BedIO.iterBedFile`), those are written instead
+        of the *BedContainer6* content, one at a time, with the same *addExtras* rule.
+
+        The file is compressed as described in :py:func:`~bedContainer.BedIO.openBedFile`: BGZF for paths ending in
+        ".gz", so it can be indexed with tabix.
+
         :param str BedFilePath: The path where the bed file will be writen.
+        :param None,Iterable entries: *BedEntry6* objects or tuples to write instead of the *BedContainer6* content. (optional)
+        :param None,str compression: "bgzf", "gzip" or *None*. (optional)
         """
-        with open(BedFilePath, 'w') as writeFile:
-            for chromosome in self.select_Chromosomes():
-                for entry in self.bedContainer[chromosome]:
-                    if self.addExtras:
-                        tmpList = []
-                        for key in entry.extraFields.keys():
-                            tmpList.append(entry.extraFields[key])
-                        tmpList = "\t".join(tmpList)
-                        writeFile.write("{}\t{}\n".format(str(entry), str(tmpList)))
-                    else:
-                        writeFile.write("{}\n".format(str(entry)))
+        super().writeToBedFile(BedFilePath, entries, compression)
 
 
     ###########################
     ##  Build-in Functions   ##
     ###########################
 
-    def __getitem__(self, item: int) -> BedEntry6:
+    def __getitem__(self, item: Union[int, slice, Iterable[int]]) -> Union[BedEntry6, BedContainerView]:
         '''
         Getter item function for BedContainer class.
-        Design to return a single BedEntry per time. Slices are not accepted, by now.
+        Same rules of :py:meth:`~bedContainer.BedContainer.BedContainer.__getitem__`.
 
-        :param int item: Index of BedEntry to retrieve
-        :return BedEntry: A BedEntry Object
+        :param int,slice,Iterable[int] item: Index (or indexes) of BedEntry to retrieve
+        :return: A BedEntry6 Object, or a BedContainerView with the selected rows
         '''
-
-        if item < 0:
-            raise ValueError("Negative index value is not accepted.")
-        total = 0
-        for chromosome in self.select_Chromosomes():
-            nEntries = self.number_EntriesInChr(chromosome)
-            total += nEntries
-            if item < total:
-                return self.bedContainer[chromosome][item - (total - nEntries)]
-        raise ValueError("Index out of boundaries")
+        return super().__getitem__(item)
 
     def __iter__(self) -> Generator[BedEntry6, BedEntry6, None]:
         '''
@@ -115,5 +336,4 @@ class BedContainer6(BedContainer):
 
         :return BedEntry:  A BedEntry Object
         '''
-        for chromosome in self.select_Chromosomes():
-            yield from self.bedContainer[chromosome]
+        return super().__iter__()
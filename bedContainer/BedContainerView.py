@@ -0,0 +1,106 @@
+from bedEntry.BedEntry import BedEntry
+from typing import Generator, Iterable, Sequence, Union
+import operator
+
+
+class BedContainerView(object):
+    '''
+    Represents a lightweight, read-only, view of some rows of a *BedContainer*, returned when it is indexed with a slice
+    or a list of positions (e.g. *container[10:20]* or *container[[1, 5, 7]]*).
+
+    Only the positions are kept (a *range* for slices), so no row is copied. The *BedEntry* objects are created when
+    requested, from the current content of the *BedContainer*: if rows are added or removed from it, the view positions
+    may then refer to other rows.
+
+    '''
+
+    def __init__(self, container, indices: Sequence[int]) -> None:
+        """
+        Creates an instance of BedContainerView object.
+
+        :param BedContainer container: *BedContainer* with the rows.
+        :param Sequence[int] indices: Non-negative positions of the rows in the *BedContainer*.
+        """
+        self.container = container
+        self.indices: Sequence[int] = indices
+
+    def toContainer(self) -> object:
+        """
+        Returns a new *BedContainer*, of the same class, with a copy of the rows in the view.
+
+        :return BedContainer: *BedContainer* with the rows in the view.
+        """
+        container = self.container
+        newContainer = type(container)(container.addExtras, container.schema)
+        for index in self.indices:
+            columns, row = container._locate(index)
+            newContainer._addRowFrom(columns, row)
+        return newContainer
+
+    ###########################
+    ##  Build-in Functions   ##
+    ###########################
+
+    def __getitem__(self, item: Union[int, slice, Iterable[int]]) -> Union[BedEntry, "BedContainerView"]:
+        '''
+        Getter item function for BedContainerView class, with the same rules of
+        :py:meth:`~bedContainer.BedContainer.BedContainer.__getitem__`.
+
+        :param int,slice,Iterable[int] item: Index (or indexes) of BedEntry to retrieve, relative to the view
+        :return: A BedEntry Object, or a BedContainerView with the selected rows
+        '''
+        if isinstance(item, slice):
+            return BedContainerView(self.container, self.indices[item])
+        indices = self.indices
+        try:
+            index = operator.index(item)
+        except TypeError:
+            return BedContainerView(self.container, [indices[_checkIndex(i, len(indices))] for i in item])
+        columns, row = self.container._locate(indices[_checkIndex(index, len(indices))])
+        return columns.entry(row)
+
+    def __iter__(self) -> Generator[BedEntry, None, None]:
+        '''
+        Iterator function for BedContainerView class.
+
+        :return BedEntry:  A BedEntry Object
+        '''
+        locate = self.container._locate
+        for index in self.indices:
+            columns, row = locate(index)
+            yield columns.entry(row)
+
+    def __len__(self):
+        """
+        Returns the number of rows in the view.
+
+        :return: Number of rows
+        """
+        return len(self.indices)
+
+    def __str__(self):
+        """
+        A meta representation of the *BedContainerView*
+
+        :return: String with the *BedContainerView* meta representation.
+        """
+        return "BED CONTAINER VIEW:\n\nNumber Entries: {}\nContainer Entries: {}".format(len(self), len(self.container))
+
+
+def _checkIndex(index: int, size: int) -> int:
+    """
+    Returns the non-negative position of *index* (negative indexes count from the end) in a sequence of *size* rows,
+    raising a *ValueError* if out of boundaries.
+
+    | Because of its internal function inside the module, it remains private.
+
+    :param int index: Position, possibly negative.
+    :param int size: Number of rows.
+    :return int: Position from 0 to *size* - 1.
+    """
+    index = operator.index(index)
+    if index < 0:
+        index += size
+    if not 0 <= index < size:
+        raise ValueError("Index out of boundaries")
+    return index
@@ -0,0 +1,308 @@
+from bedEntry.BedEntry import BedEntry
+from bedEntry.BedEntry6 import BedEntry6
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, Generator, IO, Iterable, List, Tuple, Union
+import gzip
+import io
+import os
+import struct
+import zlib
+
+import pysam
+
+HEADER_PREFIXES = ("track", "browser", "#")
+GZIP_MAGIC = b"\x1f\x8b"
+DECOMPRESSION_THREADS = min(8, os.cpu_count() or 1)
+
+
+def openBedFile(BedFilePath: str, mode: str = "r", compression: Union[None, str] = None,
+                threads: Union[None, int] = None) -> IO:
+    """
+    Opens a Bed File as a text file, for reading (*mode* "r") or writing (*mode* "w"), handling compressed files.
+
+    When reading, compression is detected from the file content:
+
+    - BGZF (bgzip) -> Blocks are decompressed in parallel, by a pool of *threads*, since they are independent
+    - gzip -> Decompressed sequentially
+    - Otherwise -> Plain text
+
+    When writing, *compression* can be "bgzf" (tabix-indexable, written with *pysam.BGZFile*), "gzip" or *None* (plain
+    text). If not given, "bgzf" is used for paths ending in ".gz" (BGZF files are also valid gzip files).
+
+    :param str BedFilePath: Path to Bed File Format
+    :param str mode: "r" to read, "w" to write. (default "r")
+    :param None,str compression: Compression used when writing: "bgzf", "gzip" or *None*. (optional)
+    :param None,int threads: Number of threads decompressing BGZF blocks. (default *DECOMPRESSION_THREADS*)
+    :return: A text file object.
+    """
+    if mode == "r":
+        with open(BedFilePath, 'rb') as readFile:
+            header = readFile.read(18)
+        if not header.startswith(GZIP_MAGIC):
+            return open(BedFilePath)
+        if _isBgzfHeader(header):
+            rawFile = _BgzfParallelReader(BedFilePath, threads or DECOMPRESSION_THREADS)
+            return io.TextIOWrapper(io.BufferedReader(rawFile, buffer_size=1 << 20))
+        return gzip.open(BedFilePath, 'rt')
+
+    if mode == "w":
+        if compression is None and BedFilePath.endswith(".gz"):
+            compression = "bgzf"
+        if compression == "bgzf":
+            return io.TextIOWrapper(pysam.BGZFile(BedFilePath, 'wb'))
+        if compression == "gzip":
+            return gzip.open(BedFilePath, 'wt')
+        if compression is None:
+            return open(BedFilePath, 'w')
+        raise ValueError("Compression {} is not \'bgzf\', \'gzip\' or None.".format(compression))
+
+    raise ValueError("Mode {} is not \'r\' or \'w\'.".format(mode))
+
+
+def _isBgzfHeader(header: bytes) -> bool:
+    """
+    Question if a gzip member header is from a BGZF block (extra field with the "BC" subfield).
+
+    :param bytes header: First bytes of a gzip member.
+    :return bool: *True* if it is a BGZF block, *False* otherwise.
+    """
+    return len(header) >= 18 and header[3] & 4 != 0 and header[12:14] == b"BC"
+
+
+class _BgzfParallelReader(io.RawIOBase):
+    """
+    Raw binary reader of a BGZF file, which decompresses its blocks in a thread pool (zlib releases the GIL) while
+    keeping their order. Only a bounded number of blocks is in memory at any time.
+
+    | Because of its internal function inside the module, it remains private.
+
+    """
+
+    def __init__(self, BedFilePath: str, threads: int) -> None:
+        super().__init__()
+        self._file: BinaryIO = open(BedFilePath, 'rb')
+        self._executor = ThreadPoolExecutor(threads)
+        self._window = threads * 16
+        self._blocks = self._decompressedBlocks()
+        self._buffer = memoryview(b"")
+
+    def _compressedBlocks(self) -> Generator[bytes, None, None]:
+        """
+        Yields the compressed data (raw deflate) of each BGZF block, reading them sequentially.
+        """
+        while True:
+            header = self._file.read(12)
+            if not header:
+                return
+            if len(header) < 12 or not header.startswith(GZIP_MAGIC):
+                raise ValueError("Malformed BGZF block in {}.".format(self._file.name))
+            extraLength = struct.unpack("<H", header[10:12])[0]
+            extra = self._file.read(extraLength)
+            blockSize = None
+            position = 0
+            while position + 4 <= len(extra):
+                subfieldLength = struct.unpack("<H", extra[position + 2:position + 4])[0]
+                if extra[position:position + 2] == b"BC":
+                    blockSize = struct.unpack("<H", extra[position + 4:position + 6])[0] + 1
+                position += 4 + subfieldLength
+            if blockSize is None:
+                raise ValueError("Malformed BGZF block in {}.".format(self._file.name))
+            # Compressed data, followed by CRC32 and uncompressed size (4 bytes each).
+            yield self._file.read(blockSize - 12 - extraLength)
+
+    @staticmethod
+    def _inflate(block: bytes) -> bytes:
+        """
+        Decompresses the data of one BGZF block, checking its CRC32 and size.
+        """
+        data = zlib.decompress(block[:-8], -15)
+        crc, size = struct.unpack("<II", block[-8:])
+        if zlib.crc32(data) != crc or len(data) != size:
+            raise ValueError("Corrupted BGZF block (CRC32 or size mismatch).")
+        return data
+
+    def _decompressedBlocks(self) -> Generator[bytes, None, None]:
+        """
+        Yields the decompressed BGZF blocks in order, keeping up to *_window* blocks being decompressed.
+        """
+        pending = deque()
+        for block in self._compressedBlocks():
+            pending.append(self._executor.submit(self._inflate, block))
+            if len(pending) >= self._window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer:
+            block = next(self._blocks, None)
+            if block is None:
+                return 0
+            self._buffer = memoryview(block)
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._executor.shutdown(cancel_futures=True)
+            self._file.close()
+        super().close()
+
+
+def readChromSizes(ChromSizesPath: str) -> Dict[str, int]:
+    """
+    Reads the chromosome sizes from a chrom-sizes file (*chr* <tab> *size*) or a FASTA index (".fai"), keeping the
+    order of the file.
+
+    :param str ChromSizesPath: Path to the chrom-sizes or FASTA index file.
+    :return Dict: Chromosome name -> chromosome size.
+    """
+    chromSizes = {}
+    with openBedFile(ChromSizesPath) as readFile:
+        for line in readFile:
+            if isHeaderLine(line):
+                continue
+            fields = line.split("\t")
+            chromSizes[fields[0]] = int(fields[1])
+    return chromSizes
+
+
+def isHeaderLine(line: str) -> bool:
+    """
+    Question if a Bed File line is a header (*track*, *browser* or *#* comment) or an empty line.
+
+    :param str line: Bed File line.
+    :return bool: *True* if the line has no Bed entry, *False* otherwise.
+    """
+    return not line.strip() or line.startswith(HEADER_PREFIXES)
+
+
+def _parseLine(fields: List[str], columns: int, addExtras: bool, asTuples: bool) -> Union[BedEntry, Tuple]:
+    """
+    Builds a *BedEntry*/*BedEntry6* object, or a tuple, from the fields of a Bed File line.
+
+    :param List[str] fields: Fields of the Bed File line.
+    :param int columns: Number of core columns (3 or 6).
+    :param bool addExtras: *True* to keep the fields after the core columns.
+    :param bool asTuples: *True* to return a tuple instead of an object.
+    :return: The parsed Bed entry.
+    """
+    extras = fields[columns:] if addExtras else []
+    if asTuples:
+        return (fields[0], int(fields[1]), int(fields[2])) + tuple(fields[3:columns]) + tuple(extras)
+    if columns == 6:
+        return BedEntry6(fields[0], int(fields[1]), int(fields[2]), fields[3], fields[4], fields[5], extras)
+    return BedEntry(fields[0], int(fields[1]), int(fields[2]), extras)
+
+
+def iterBedFile(BedFilePath: str, columns: int = 3, addExtras: bool = False, asTuples: bool = False,
+                chunkSize: Union[None, int] = None, groupByChr: bool = False) -> Generator:
+    """
+    Reads a Bed File lazily, one line at a time, so any file size is processed in constant memory.
+    Header lines (*track*, *browser* and *#* comments) and empty lines are skipped. gzip and BGZF compressed files are
+    also read (see :py:func:`~bedContainer.BedIO.openBedFile`).
+
+    Each Bed entry is given as a *BedEntry* (3 columns) or *BedEntry6* (6 columns) object, or as a lightweight tuple
+    if *asTuples* is *True*: (*chr*, *sCoord*, *eCoord*, [*name*, *score*, *strand*,] *extraField1*, ...).
+
+    What is yielded:
+
+    - Default -> One Bed entry per time
+    - *chunkSize* -> Lists with up to *chunkSize* Bed entries
+    - *groupByChr* -> (*chr*, List of Bed entries) tuples, one per chromosome. The file must be sorted (grouped) by chromosome.
+
+    :param str BedFilePath: Path to Bed File Format
+    :param int columns: Number of core columns, 3 or 6. (default 3)
+    :param bool addExtras: *True* to keep the fields after the core columns as extra fields. (default *False*)
+    :param bool asTuples: *True* to yield tuples instead of *BedEntry* objects. (default *False*)
+    :param None,int chunkSize: Number of Bed entries yielded together. (optional)
+    :param bool groupByChr: *True* to yield all the Bed entries of each chromosome together. (default *False*)
+    :return: Generator of Bed entries, chunks or chromosome groups.
+    """
+    if columns not in (3, 6):
+        raise ValueError("Number of columns {} is not 3 or 6.".format(columns))
+
+    entries = (_parseLine(line.strip().split("\t"), columns, addExtras, asTuples)
+               for line in _iterLines(BedFilePath) if not isHeaderLine(line))
+
+    if groupByChr:
+        yield from _groupByChr(entries, asTuples)
+    elif chunkSize is not None:
+        chunk = []
+        for entry in entries:
+            chunk.append(entry)
+            if len(chunk) == chunkSize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    else:
+        yield from entries
+
+
+def _iterLines(BedFilePath: str) -> Generator[str, None, None]:
+    """
+    Yields the lines of a Bed File, plain or compressed (see :py:func:`~bedContainer.BedIO.openBedFile`).
+
+    :param str BedFilePath: Path to Bed File Format
+    """
+    with openBedFile(BedFilePath) as readFile:
+        yield from readFile
+
+
+def _groupByChr(entries: Iterable, asTuples: bool) -> Generator[Tuple[str, List], None, None]:
+    """
+    Groups consecutive Bed entries of the same chromosome. Raises *ValueError* if a chromosome appears again after
+    its group, since the input is not sorted.
+
+    :param Iterable entries: Bed entries (objects or tuples).
+    :param bool asTuples: *True* if the entries are tuples.
+    """
+    seen = set()
+    chrom = None
+    group = []
+    for entry in entries:
+        entryChr = entry[0] if asTuples else entry.chr
+        if entryChr != chrom:
+            if group:
+                yield chrom, group
+            if entryChr in seen:
+                raise ValueError("Chromosome {} is not grouped, the Bed File must be sorted.".format(entryChr))
+            seen.add(entryChr)
+            chrom = entryChr
+            group = []
+        group.append(entry)
+    if group:
+        yield chrom, group
+
+
+def writeBedFile(BedFilePath: str, entries: Iterable, addExtras: bool = False,
+                 compression: Union[None, str] = None) -> None:
+    """
+    Writes Bed entries in a Bed File, one line at a time, so it can be given directly the output of
+    :py:func:`~bedContainer.BedIO.iterBedFile` (or any other generator).
+
+    The Bed entries can be *BedEntry*/*BedEntry6* objects (extra fields written if *addExtras* is *True*) or tuples
+    (all fields written).
+
+    The file is compressed as described in :py:func:`~bedContainer.BedIO.openBedFile` (BGZF for paths ending in ".gz").
+
+    :param str BedFilePath: The path where the bed file will be writen.
+    :param Iterable entries: Bed entries to write.
+    :param bool addExtras: *True* to also write the extra fields of *BedEntry* objects. (default *False*)
+    :param None,str compression: "bgzf", "gzip" or *None*. (optional)
+    """
+    with openBedFile(BedFilePath, 'w', compression) as writeFile:
+        for entry in entries:
+            if isinstance(entry, tuple):
+                writeFile.write("{}\n".format("\t".join(str(field) for field in entry)))
+            elif addExtras and entry.hasExtraFields():
+                writeFile.write("{}\t{}\n".format(str(entry), entry.rawExtras))
+            else:
+                writeFile.write("{}\n".format(str(entry)))
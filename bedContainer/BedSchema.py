@@ -0,0 +1,89 @@
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+
+class BedSchema(object):
+    '''
+    Describes the typed extra fields of a Bed File format (e.g. ENCODE narrowPeak): their names and numeric types,
+    after a number of core columns.
+
+    A *BedContainer* with a schema parses these extra fields once into numeric columns, which can be filtered and
+    sorted with vectorized operations (see :py:meth:`~bedContainer.BedContainer.BedContainer.filterField`).
+
+    '''
+
+    def __init__(self, name: str, coreColumns: int, fields: List[Tuple[str, str]]) -> None:
+        """
+        Creates an instance of BedSchema object.
+
+        :param str name: Name of the format.
+        :param int coreColumns: Number of core columns before the extra fields (3 or 6).
+        :param List fields: (*field name*, numpy type) of each extra field, in their order. Types are "float64" or "int64".
+        """
+        self.name: str = name
+        self.coreColumns: int = coreColumns
+        self.fields: List[Tuple[str, str]] = list(fields)
+        self.positions: Dict[str, int] = {field: position for position, (field, _) in enumerate(self.fields)}
+
+    def position(self, field: str) -> int:
+        """
+        Returns the extra field position of *field*.
+
+        :param str field: Field name.
+        :return int: Extra field position.
+        """
+        if field not in self.positions:
+            raise ValueError("{} is not a field of the {} schema.".format(field, self.name))
+        return self.positions[field]
+
+    def parse(self, field: str, values: List[str]) -> np.ndarray:
+        """
+        Converts the values of *field*, as read from the Bed File, to its numeric type. Missing values (*None*) are NaN
+        for "float64" fields, and refused for "int64" ones.
+
+        :param str field: Field name.
+        :param List values: Field values (strings).
+        :return np.ndarray: Typed values.
+        """
+        dtype = self.fields[self.position(field)][1]
+        try:
+            return np.array(values, dtype=dtype)
+        except (TypeError, ValueError) as error:
+            raise ValueError("Field {} of the {} schema has values missing or not {}.".format(field, self.name, dtype)) \
+                from error
+
+    def __str__(self):
+        """
+        A meta representation of the *BedSchema*
+
+        :return: String with the *BedSchema* meta representation.
+        """
+        return "BED SCHEMA {}:\n\nCore Columns: {}\nFields: {}" \
+            .format(self.name, self.coreColumns, ", ".join("{} ({})".format(*field) for field in self.fields))
+
+
+# ENCODE narrowPeak (BED6+4): signalValue, pValue and qValue (-1 if not available) and peak (summit offset, -1 if none).
+NARROW_PEAK = BedSchema("narrowPeak", 6, [("signalValue", "float64"), ("pValue", "float64"), ("qValue", "float64"),
+                                          ("peak", "int64")])
+# ENCODE broadPeak (BED6+3): as narrowPeak, without the peak.
+BROAD_PEAK = BedSchema("broadPeak", 6, [("signalValue", "float64"), ("pValue", "float64"), ("qValue", "float64")])
+# bedGraph (BED3+1): the value of each region.
+BED_GRAPH = BedSchema("bedGraph", 3, [("value", "float64")])
+
+SCHEMAS = {schema.name: schema for schema in (NARROW_PEAK, BROAD_PEAK, BED_GRAPH)}
+
+
+def getSchema(schema: Union[None, str, BedSchema]) -> Union[None, BedSchema]:
+    """
+    Returns the *BedSchema* given by its name ("narrowPeak", "broadPeak" or "bedGraph"), or *schema* itself if it is
+    already a *BedSchema* (or *None*).
+
+    :param None,str,BedSchema schema: Schema name or object.
+    :return None,BedSchema: The schema.
+    """
+    if schema is None or isinstance(schema, BedSchema):
+        return schema
+    if schema not in SCHEMAS:
+        raise ValueError("Schema {} is not one of {}.".format(schema, ", ".join(SCHEMAS)))
+    return SCHEMAS[schema]
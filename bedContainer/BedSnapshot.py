@@ -0,0 +1,142 @@
+from bedContainer.BedColumns import BedColumns
+from bedContainer.BedSchema import SCHEMAS, BedSchema
+from typing import Dict, List
+import gc
+import mmap as mmapModule
+import pickle
+import struct
+import zlib
+
+SNAPSHOT_MAGIC = b"BIORSLBC"
+SNAPSHOT_VERSION = 3
+# magic, version, core columns, isSorted, addExtras, metadata length, payload length, metadata CRC32, columns CRC32
+_HEADER = struct.Struct("<8sIBBBxQQII")
+
+
+def _padding(size: int) -> int:
+    """
+    Number of bytes to add after *size* bytes, so the next typed column starts aligned to 8 bytes.
+    """
+    return -size % 8
+
+
+def saveBinary(container, BedFilePath: str) -> None:
+    """
+    Writes a *BedContainer* in the binary snapshot format.
+
+    | Layout:
+
+    - Header -> magic, format version, number of core columns, flags, sizes and the CRC32 of the metadata and of the typed columns
+    - Metadata -> pickle with the chromosome list, the number of rows per chromosome, the object columns (extra fields, names, ...) and the schema (name, core columns and fields)
+    - Typed columns -> raw bytes of each array column (coordinates, strands), chromosome by chromosome, aligned to 8 bytes
+
+    :param BedContainer container: *BedContainer* to save.
+    :param str BedFilePath: Path of the snapshot file.
+    """
+    columnsClass = container._columnsClass
+    chrList = container.select_Chromosomes()
+    schema = container.schema
+    metadata = pickle.dumps({
+        "schema": None if schema is None else (schema.name, schema.coreColumns, schema.fields),
+        "chrList": chrList,
+        "rows": [len(container.bedContainer[chrom]) for chrom in chrList],
+        "objects": {chrom: {attribute: getattr(container.bedContainer[chrom], attribute)
+                            for attribute in columnsClass.OBJECT_COLUMNS} for chrom in chrList},
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+
+    chunks = [metadata, b"\0" * _padding(len(metadata))]
+    for chrom in chrList:
+        columns = container.bedContainer[chrom]
+        for attribute, _ in columnsClass.ARRAY_COLUMNS:
+            data = bytes(getattr(columns, attribute))
+            chunks.append(data)
+            chunks.append(b"\0" * _padding(len(data)))
+
+    metadataCrc = zlib.crc32(metadata)
+    columnsCrc = 0
+    for chunk in chunks[1:]:
+        columnsCrc = zlib.crc32(chunk, columnsCrc)
+    payloadLength = sum(len(chunk) for chunk in chunks)
+
+    with open(BedFilePath, 'wb') as writeFile:
+        writeFile.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, columnsClass.CORE_COLUMNS,
+                                     container.isSorted, container.addExtras, len(metadata), payloadLength, metadataCrc,
+                                     columnsCrc))
+        for chunk in chunks:
+            writeFile.write(chunk)
+
+
+def loadBinary(containerClass, BedFilePath: str, mmap: bool = True, verify: bool = False):
+    """
+    Reads a binary snapshot written by :py:func:`~bedContainer.BedSnapshot.saveBinary`.
+
+    With *mmap* as *True*, the typed columns are memory mapped instead of read: loading is near-instant and the pages
+    are shared between processes reading the same snapshot. They are only copied to memory if the container is changed.
+
+    Snapshots from another format version, with a wrong size or metadata checksum (stale or corrupted) or saved from
+    another *BedContainer* class are refused with a *ValueError*. Only load snapshots from trusted sources, since the
+    metadata is a pickle.
+
+    The typed columns are only checked with *verify* as *True*: their CRC32 reads the whole file, which would undo the
+    near-instant loading (and the sharing of untouched pages) of a memory mapped snapshot.
+
+    :param type containerClass: *BedContainer* class to create (the same used to save the snapshot).
+    :param str BedFilePath: Path of the snapshot file.
+    :param bool mmap: *True* to memory map the typed columns. (default *True*)
+    :param bool verify: *True* to also check the CRC32 of the typed columns. (default *False*)
+    :return: The loaded *BedContainer*.
+    """
+    with open(BedFilePath, 'rb') as readFile:
+        if mmap:
+            data = memoryview(mmapModule.mmap(readFile.fileno(), 0, access=mmapModule.ACCESS_READ))
+        else:
+            data = memoryview(readFile.read())
+
+    if len(data) < _HEADER.size:
+        raise ValueError("{} is not a BedContainer snapshot.".format(BedFilePath))
+    magic, version, coreColumns, isSorted, addExtras, metadataLength, payloadLength, metadataCrc, columnsCrc = \
+        _HEADER.unpack(data[:_HEADER.size])
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("{} is not a BedContainer snapshot.".format(BedFilePath))
+    if version != SNAPSHOT_VERSION:
+        raise ValueError("Snapshot version {} is not supported (expected {}).".format(version, SNAPSHOT_VERSION))
+    columnsClass = containerClass._columnsClass
+    if coreColumns != columnsClass.CORE_COLUMNS:
+        raise ValueError("Snapshot has {} columns, but {} has {}.".format(coreColumns, containerClass.__name__,
+                                                                          columnsClass.CORE_COLUMNS))
+    payload = data[_HEADER.size:]
+    if len(payload) != payloadLength or zlib.crc32(payload[:metadataLength]) != metadataCrc or \
+            (verify and zlib.crc32(payload[metadataLength:]) != columnsCrc):
+        raise ValueError("Snapshot {} is stale or corrupted (checksum mismatch).".format(BedFilePath))
+
+    # Unpickling creates many objects kept alive, so the cyclic garbage collector would only waste time.
+    gcEnabled = gc.isenabled()
+    gc.disable()
+    try:
+        metadata = pickle.loads(payload[:metadataLength])
+    finally:
+        if gcEnabled:
+            gc.enable()
+    offset = metadataLength + _padding(metadataLength)
+
+    schema = metadata["schema"]
+    if schema is not None:
+        name, coreColumns, fields = schema
+        # Known schemas are restored as their preset object, unless they were changed.
+        preset = SCHEMAS.get(name)
+        schema = preset if preset is not None and preset.fields == fields else BedSchema(name, coreColumns, fields)
+    container = containerClass(bool(addExtras), schema)
+    for chrom, nRows in zip(metadata["chrList"], metadata["rows"]):
+        container._addChr(chrom)
+        columns: BedColumns = container.bedContainer[chrom]
+        for attribute, typecode in columnsClass.ARRAY_COLUMNS:
+            size = nRows * struct.calcsize(typecode)
+            setattr(columns, attribute, payload[offset:offset + size].cast(typecode))
+            offset += size + _padding(size)
+        objects: Dict[str, List] = metadata["objects"][chrom]
+        for attribute in columnsClass.OBJECT_COLUMNS:
+            setattr(columns, attribute, objects[attribute])
+        container.entryCounts += nRows
+    container._invalidateIndexes()
+    container.isSorted = bool(isSorted)
+    return container
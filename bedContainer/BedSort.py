@@ -0,0 +1,204 @@
+from bedContainer.BedIO import isHeaderLine, openBedFile, readChromSizes
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Generator, List, Tuple, Union
+import heapq
+import os
+import re
+import tempfile
+
+# Estimated memory (bytes) used by each line kept in a sorted run, besides its characters: string and key objects.
+_LINE_OVERHEAD = 160
+_MEMORY_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def naturalChromKey(chrom: str) -> List[Union[str, int]]:
+    """
+    Sort key for the natural chromosome order, where the numbers inside names are compared as numbers
+    (chr1, chr2, ..., chr10, ..., chrX).
+
+    :param str chrom: Chromosome name.
+    :return List: Sort key.
+    """
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", chrom)]
+
+
+def chromSortKey(chromOrder: Union[str, List[str], Dict[str, int]] = "natural") -> Callable[[str], Tuple]:
+    """
+    Returns a sort key for chromosome names, following *chromOrder*:
+
+    - "natural" -> chr1, chr2, ..., chr10, ... (see :py:func:`~bedContainer.BedSort.naturalChromKey`)
+    - "lexical" -> Alphabetical order (chr1, chr10, chr2, ...)
+    - List of names, or Dict with names as keys (e.g. chromosome sizes) -> Same order as given
+    - Path to a chrom-sizes file or a FASTA index (".fai") -> Same order as the file
+
+    Chromosomes missing from a given order are placed after all the others, in natural order.
+
+    :param str,List,Dict chromOrder: Chromosome order. (default "natural")
+    :return Callable: Sort key for chromosome names.
+    """
+    if chromOrder == "natural":
+        return lambda chrom: (0, naturalChromKey(chrom))
+    if chromOrder == "lexical":
+        return lambda chrom: (0, chrom)
+    if isinstance(chromOrder, str):
+        chromOrder = readChromSizes(chromOrder)
+    rank = {chrom: position for position, chrom in enumerate(chromOrder)}
+    return lambda chrom: (rank[chrom], []) if chrom in rank else (len(rank), naturalChromKey(chrom))
+
+
+def _parseMemory(memoryLimit: Union[int, str]) -> int:
+    """
+    Converts a memory size, in bytes or as a string with K, M or G suffix (e.g. "2G"), to bytes.
+    """
+    if isinstance(memoryLimit, str):
+        unit = memoryLimit[-1].upper()
+        if unit in _MEMORY_UNITS:
+            return int(float(memoryLimit[:-1]) * _MEMORY_UNITS[unit])
+        return int(memoryLimit)
+    return memoryLimit
+
+
+def _lineSortKey(chromKey: Callable[[str], Tuple]) -> Callable[[str], Tuple]:
+    """
+    Returns the sort key of Bed File lines: (chromosome key, start, end). Chromosome keys are cached.
+    """
+    chromKeys = {}
+
+    def lineKey(line: str) -> Tuple:
+        fields = line.split("\t", 3)
+        chrom = fields[0]
+        key = chromKeys.get(chrom)
+        if key is None:
+            key = chromKeys[chrom] = chromKey(chrom)
+        return key, int(fields[1]), int(fields[2])
+    return lineKey
+
+
+def _sortRun(lines: List[str], chromOrder: Union[str, List[str], Dict[str, int]], runPath: str) -> str:
+    """
+    Sorts the lines of one run and writes them to a temporary file. It runs in worker processes.
+
+    | Because of its internal function inside the module, it remains private.
+
+    :param List[str] lines: Bed File lines of the run.
+    :param str,List,Dict chromOrder: Chromosome order, as in :py:func:`~bedContainer.BedSort.chromSortKey`.
+    :param str runPath: Path of the temporary file.
+    :return str: *runPath*
+    """
+    lines.sort(key=_lineSortKey(chromSortKey(chromOrder)))
+    with open(runPath, 'w') as writeFile:
+        writeFile.writelines(lines)
+    return runPath
+
+
+def _iterRuns(BedFilePath: str, runSize: int, headers: List[str]) -> Generator[List[str], None, None]:
+    """
+    Yields the Bed File lines in runs of about *runSize* bytes of memory. Header lines are moved to *headers*.
+    """
+    run = []
+    size = 0
+    with openBedFile(BedFilePath) as readFile:
+        for line in readFile:
+            if isHeaderLine(line):
+                if line.strip():
+                    headers.append(line)
+                continue
+            if not line.endswith("\n"):
+                line += "\n"
+            run.append(line)
+            size += len(line) + _LINE_OVERHEAD
+            if size >= runSize:
+                yield run
+                run = []
+                size = 0
+    if run:
+        yield run
+
+
+def _iterRunFile(runPath: str) -> Generator[str, None, None]:
+    """
+    Yields the lines of a sorted run file.
+    """
+    with open(runPath) as readFile:
+        yield from readFile
+
+
+def sortBedFile(inPath: str, outPath: str, memoryLimit: Union[int, str] = "1G",
+                chromOrder: Union[str, List[str], Dict[str, int]] = "natural", parallel: int = 1,
+                tmpDir: Union[None, str] = None) -> None:
+    """
+    Sorts a Bed File of any size in bounded memory (external merge sort), by chromosome, start and end coordinates.
+    Lines with the same coordinates keep their input order.
+
+    The input is read in runs that fit in *memoryLimit*. Each run is sorted and written to a temporary file, and all
+    runs are then merged (k-way merge) into *outPath*. If the whole input fits in memory, it is sorted directly.
+    With *parallel* higher than 1, runs are sorted by that number of processes, each run using
+    *memoryLimit* / *parallel*.
+
+    Input and output can be compressed (see :py:func:`~bedContainer.BedIO.openBedFile`). Header lines are written at
+    the top of the output.
+
+    :param str inPath: Path to the Bed File to sort.
+    :param str outPath: Path to the sorted Bed File.
+    :param int,str memoryLimit: Memory for the sorted runs, in bytes or with K, M or G suffix. (default "1G")
+    :param str,List,Dict chromOrder: Chromosome order, as in :py:func:`~bedContainer.BedSort.chromSortKey`. (default "natural")
+    :param int parallel: Number of processes sorting runs. (default 1)
+    :param None,str tmpDir: Directory of the temporary run files. (optional)
+    """
+    runSize = max(_parseMemory(memoryLimit) // max(parallel, 1), 1)
+    lineKey = _lineSortKey(chromSortKey(chromOrder))
+    headers: List[str] = []
+    runPaths: List[str] = []
+    runs = _iterRuns(inPath, runSize, headers)
+
+    try:
+        firstRun = next(runs, [])
+        secondRun = next(runs, None)
+        if secondRun is None:
+            firstRun.sort(key=lineKey)
+            with openBedFile(outPath, 'w') as writeFile:
+                writeFile.writelines(headers)
+                writeFile.writelines(firstRun)
+            return
+
+        def newRunPath() -> str:
+            runFile, runPath = tempfile.mkstemp(prefix="sortBedFile_", suffix=".bed", dir=tmpDir)
+            os.close(runFile)
+            runPaths.append(runPath)
+            return runPath
+
+        # Only allRuns refers to the first runs, so each one is released once written.
+        allRuns = [firstRun, secondRun]
+        del firstRun, secondRun
+        if parallel > 1:
+            with ProcessPoolExecutor(parallel) as executor:
+                pending = []
+                for run in _chainRuns(allRuns, runs):
+                    pending.append(executor.submit(_sortRun, run, chromOrder, newRunPath()))
+                    # Keeps at most one run per process in memory.
+                    if len(pending) >= parallel:
+                        pending.pop(0).result()
+                for future in pending:
+                    future.result()
+        else:
+            for run in _chainRuns(allRuns, runs):
+                _sortRun(run, chromOrder, newRunPath())
+        # The last run is still referred by the loop variable.
+        del run
+
+        with openBedFile(outPath, 'w') as writeFile:
+            writeFile.writelines(headers)
+            writeFile.writelines(heapq.merge(*[_iterRunFile(runPath) for runPath in runPaths], key=lineKey))
+    finally:
+        for runPath in runPaths:
+            os.remove(runPath)
+
+
+def _chainRuns(firstRuns: List[List[str]], runs: Generator[List[str], None, None]) \
+        -> Generator[List[str], None, None]:
+    """
+    Yields the runs already read, releasing them, and then the remaining ones.
+    """
+    while firstRuns:
+        yield firstRuns.pop(0)
+    yield from runs
@@ -0,0 +1,90 @@
+from array import array
+from bisect import bisect_left
+from collections import deque
+from typing import List
+
+
+class NCList(object):
+    """
+    Nested Containment List over the rows of one chromosome, to find all the rows overlapping a region in
+    O(log n + k) time.
+
+    Rows are sorted by start coordinate and every row contained in another one is moved to the sublist of that row.
+    Inside each sublist both start and end coordinates are increasing, so the first overlapping row is found by binary
+    search on the end coordinates.
+
+    """
+
+    def __init__(self, sCoords: array, eCoords: array) -> None:
+        """
+        Builds the Nested Containment List of the given coordinate columns.
+
+        :param array sCoords: Start coordinates of the rows.
+        :param array eCoords: End coordinates of the rows.
+        """
+        nRows = len(sCoords)
+        order = sorted(range(nRows), key=lambda i: (sCoords[i], -eCoords[i]))
+
+        # Parent of each row (position in order), given by the innermost row containing it. nRows is the root.
+        children = [[] for _ in range(nRows + 1)]
+        stack = []
+        for k, row in enumerate(order):
+            while stack and eCoords[order[stack[-1]]] < eCoords[row]:
+                stack.pop()
+            children[stack[-1] if stack else nRows].append(k)
+            stack.append(k)
+
+        # Flatten the tree breadth first, so that each sublist is contiguous.
+        self.sCoords = array('q')
+        self.eCoords = array('q')
+        self.rows = array('q')
+        self.subStarts = array('q')
+        self.subEnds = array('q')
+        sublistOf = [(0, 0)] * (nRows + 1)
+        flatOrder = []
+        queue = deque([nRows])
+        while queue:
+            parent = queue.popleft()
+            first = len(flatOrder)
+            flatOrder.extend(children[parent])
+            sublistOf[parent] = (first, len(flatOrder))
+            queue.extend(children[parent])
+
+        for k in flatOrder:
+            row = order[k]
+            self.sCoords.append(sCoords[row])
+            self.eCoords.append(eCoords[row])
+            self.rows.append(row)
+        for k in flatOrder:
+            first, last = sublistOf[k]
+            self.subStarts.append(first)
+            self.subEnds.append(last)
+        self.rootStart, self.rootEnd = sublistOf[nRows]
+
+    def query(self, start: int, end: int) -> List[int]:
+        """
+        Returns the row positions overlapping the region between *start* and *end*, sorted.
+
+        It is used the same rule of *BedEntry.isOverlapping*: a row overlaps if ``sCoord <= end and start <= eCoord``.
+
+        :param int start: Start coordinate of the region.
+        :param int end: End coordinate of the region.
+        :return List[int]: Sorted row positions.
+        """
+        sCoords = self.sCoords
+        eCoords = self.eCoords
+        found = []
+        sublists = [(self.rootStart, self.rootEnd)]
+        while sublists:
+            first, last = sublists.pop()
+            position = bisect_left(eCoords, start, first, last)
+            while position < last and sCoords[position] <= end:
+                found.append(self.rows[position])
+                if self.subStarts[position] < self.subEnds[position]:
+                    sublists.append((self.subStarts[position], self.subEnds[position]))
+                position += 1
+        found.sort()
+        return found
+
+    def __len__(self) -> int:
+        return len(self.rows)
@@ -0,0 +1,200 @@
+from bedContainer.NCList import NCList
+from array import array
+from typing import Generator, List, Sequence, Tuple, Union
+
+import numpy as np
+import pysam
+
+# Reads unmapped (0x4), not primary (0x100), failing quality checks (0x200) or duplicated (0x400) are not counted.
+DEFAULT_FLAGS = 0x704
+# Regions closer than this (bp) are fetched from the BAM file together.
+WINDOW_GAP = 1000
+
+
+def _fetchWindows(sCoords: Sequence[int], eCoords: Sequence[int], flank: int) -> List[List[int]]:
+    """
+    Groups the regions of a chromosome into sorted, non-overlapping, genomic windows to fetch from the BAM file.
+    Regions closer than *WINDOW_GAP* share the same window, and each region is extended *flank* bp to the left.
+
+    | Because of its internal function inside the module, it remains private.
+
+    :param Sequence[int] sCoords: Start coordinates of the regions.
+    :param Sequence[int] eCoords: End coordinates of the regions.
+    :param int flank: Number of bp fetched before each region.
+    :return List: [start, end] of each window.
+    """
+    windows = []
+    for row in sorted(range(len(sCoords)), key=sCoords.__getitem__):
+        start = max(sCoords[row] - flank, 0)
+        end = eCoords[row]
+        if windows and start <= windows[-1][1] + WINDOW_GAP:
+            windows[-1][1] = max(windows[-1][1], end)
+        else:
+            windows.append([start, end])
+    return windows
+
+
+def countChrReads(bam: pysam.AlignmentFile, chrom: str, sCoords: Sequence[int], eCoords: Sequence[int],
+                  strands: Union[None, Sequence[int]] = None, mapq: int = 0, flags: int = DEFAULT_FLAGS,
+                  fragmentMode: bool = False, maxFragmentLength: int = 1000) -> np.ndarray:
+    """
+    Counts the reads of a BAM file overlapping each region of a chromosome, in a single pass.
+
+    The regions are grouped into sorted genomic windows, each one fetched once, and the reads are matched to the regions
+    they overlap (half-open coordinates, as *pysam.AlignmentFile.fetch*) with a Nested Containment List. Reads are
+    counted as they are read, so no alignment is kept.
+
+    With *fragmentMode*, each pair of mates is counted once, over the fragment they span (from the leftmost mate,
+    using its template length). Fragments longer than *maxFragmentLength* may be missed if only their leftmost mate
+    is outside the fetched windows. Reads not paired, or with the mate unmapped or in other chromosome, are counted
+    alone.
+
+    If *strands* are given, reads are only counted in regions of their strand. Paired reads take the strand of the
+    first mate (the strand is flipped for the second mate).
+
+    :param pysam.AlignmentFile bam: Indexed BAM file.
+    :param str chrom: Chromosome name of the regions.
+    :param Sequence[int] sCoords: Start coordinates of the regions.
+    :param Sequence[int] eCoords: End coordinates of the regions.
+    :param None,Sequence[int] strands: Strand codes (1 for "+", -1 for "-") of the regions. (optional)
+    :param int mapq: Minimum mapping quality. (default 0)
+    :param int flags: Reads with any of these SAM flags are not counted. (default 0x704)
+    :param bool fragmentMode: *True* to count fragments instead of reads. (default *False*)
+    :param int maxFragmentLength: Length (bp) fetched before each region in *fragmentMode*. (default 1000)
+    :return np.ndarray: Number of reads (or fragments) of each region, in the given order.
+    """
+    counts = [0] * len(sCoords)
+    if not counts or bam.get_tid(chrom) < 0:
+        return np.array(counts, dtype=np.int64)
+
+    query = NCList(sCoords, eCoords).query
+    windows = _fetchWindows(sCoords, eCoords, maxFragmentLength if fragmentMode else 0)
+    for read, start, end in _iterReads(bam, chrom, windows, mapq, flags, fragmentMode):
+        # Half-open overlap (sCoord < end and start < eCoord), with the inclusive rule of NCList.query.
+        rows = query(start + 1, end - 1)
+        if strands is not None:
+            strand = -1 if read.is_reverse != (read.is_paired and read.is_read2) else 1
+            rows = [row for row in rows if strands[row] == strand]
+        for row in rows:
+            counts[row] += 1
+    return np.array(counts, dtype=np.int64)
+
+
+def _iterReads(bam: pysam.AlignmentFile, chrom: str, windows: List[List[int]], mapq: int, flags: int,
+               fragmentMode: bool) -> Generator[Tuple[pysam.AlignedSegment, int, int], None, None]:
+    """
+    Yields the reads of the windows that pass the filters, each one once, with the start and end coordinates counted
+    (its fragment in *fragmentMode*, see :py:func:`~bedContainer.ReadCounting.countChrReads`).
+
+    | Because of its internal function inside the module, it remains private.
+
+    :param pysam.AlignmentFile bam: Indexed BAM file.
+    :param str chrom: Chromosome name.
+    :param List windows: Sorted, non-overlapping, [start, end] windows to fetch.
+    :param int mapq: Minimum mapping quality.
+    :param int flags: Reads with any of these SAM flags are skipped.
+    :param bool fragmentMode: *True* to yield fragments instead of reads.
+    :return: (read, start, end)
+    """
+    previousEnd = -1
+    for fetchStart, fetchEnd in windows:
+        for read in bam.fetch(chrom, fetchStart, fetchEnd):
+            start = read.reference_start
+            # Reads starting in the previous window were already fetched with it.
+            if start < previousEnd or read.flag & flags or read.mapping_quality < mapq:
+                continue
+            end = read.reference_end
+            if end is None:
+                continue
+            if fragmentMode and read.is_paired and not read.mate_is_unmapped and \
+                    read.next_reference_id == read.reference_id:
+                length = read.template_length
+                if length < 0 or (length == 0 and read.is_read2):
+                    continue
+                if length > 0:
+                    end = start + length
+            yield read, start, end
+        previousEnd = fetchEnd
+
+
+def chrReadIntervals(bam: pysam.AlignmentFile, chrom: str, sCoords: Sequence[int], eCoords: Sequence[int],
+                     mapq: int = 0, flags: int = DEFAULT_FLAGS, fragmentMode: bool = False,
+                     maxFragmentLength: int = 1000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the coordinates of the reads of a BAM file around the regions of a chromosome, fetched in a single pass
+    and filtered as in :py:func:`~bedContainer.ReadCounting.countChrReads`. Reads not overlapping any region may be
+    included (the regions are fetched in windows).
+
+    :param pysam.AlignmentFile bam: Indexed BAM file.
+    :param str chrom: Chromosome name of the regions.
+    :param Sequence[int] sCoords: Start coordinates of the regions.
+    :param Sequence[int] eCoords: End coordinates of the regions.
+    :param int mapq: Minimum mapping quality. (default 0)
+    :param int flags: Reads with any of these SAM flags are skipped. (default 0x704)
+    :param bool fragmentMode: *True* to return fragments instead of reads. (default *False*)
+    :param int maxFragmentLength: Length (bp) fetched before each region in *fragmentMode*. (default 1000)
+    :return Tuple[np.ndarray, np.ndarray]: Sorted start coordinates and sorted end coordinates of the reads.
+    """
+    starts = array('q')
+    ends = array('q')
+    if len(sCoords) and bam.get_tid(chrom) >= 0:
+        windows = _fetchWindows(sCoords, eCoords, maxFragmentLength if fragmentMode else 0)
+        for _, start, end in _iterReads(bam, chrom, windows, mapq, flags, fragmentMode):
+            starts.append(start)
+            ends.append(end)
+    return np.sort(np.frombuffer(starts, dtype=np.int64)), np.sort(np.frombuffer(ends, dtype=np.int64))
+
+
+def binnedReads(starts: np.ndarray, ends: np.ndarray, edges: np.ndarray, coverage: bool = False) -> np.ndarray:
+    """
+    Counts the reads overlapping each bin (half-open coordinates), or with *coverage*, computes the mean depth of the
+    bins, with binary searches over the sorted read coordinates (see
+    :py:func:`~bedContainer.ReadCounting.chrReadIntervals`).
+
+    :param np.ndarray starts: Sorted start coordinates of the reads.
+    :param np.ndarray ends: Sorted end coordinates of the reads.
+    :param np.ndarray edges: Bin edges, one row per region with nBin + 1 sorted coordinates.
+    :param bool coverage: *True* to compute the mean depth instead of the number of reads. (default *False*)
+    :return np.ndarray: One row per region with the value of its nBin bins (0 for empty bins).
+    """
+    left = edges[:, :-1]
+    right = edges[:, 1:]
+    if not coverage:
+        # Reads with start < right, minus the ones ending before the bin (end <= left implies start < right).
+        values = np.searchsorted(starts, right, 'left') - np.searchsorted(ends, left, 'right')
+        return np.where(left < right, values, 0)
+
+    # Bases covered before x: sum(x - start) over reads starting before x, minus sum(x - end) over reads ending before x.
+    startSums = np.concatenate(([0], np.cumsum(starts)))
+    endSums = np.concatenate(([0], np.cumsum(ends)))
+
+    def coveredBases(x: np.ndarray) -> np.ndarray:
+        nStarts = np.searchsorted(starts, x, 'left')
+        nEnds = np.searchsorted(ends, x, 'left')
+        return (nStarts - nEnds) * x - startSums[nStarts] + endSums[nEnds]
+
+    covered = coveredBases(edges)
+    widths = right - left
+    values = (covered[:, 1:] - covered[:, :-1]).astype(np.float64)
+    return np.divide(values, widths, out=np.zeros(values.shape), where=widths > 0)
+
+
+# BAM files opened by each worker process, reused by its following tasks.
+_workerBamFiles = {}
+
+
+def countChrReadsTask(BamFilePath: str, chrom: str, sCoords: Sequence[int], eCoords: Sequence[int],
+                      strands: Union[None, Sequence[int]], mapq: int, flags: int, fragmentMode: bool,
+                      maxFragmentLength: int) -> np.ndarray:
+    """
+    Runs :py:func:`~bedContainer.ReadCounting.countChrReads` in a worker process. Each worker opens its own
+    *pysam.AlignmentFile* of the BAM file (kept open for its next tasks), so only the region coordinates and the
+    count arrays are sent between processes.
+
+    :param str BamFilePath: Path to the indexed BAM file.
+    :return np.ndarray: Number of reads (or fragments) of each region, in the given order.
+    """
+    bam = _workerBamFiles.get(BamFilePath)
+    if bam is None:
+        bam = _workerBamFiles[BamFilePath] = pysam.AlignmentFile(BamFilePath)
+    return countChrReads(bam, chrom, sCoords, eCoords, strands, mapq, flags, fragmentMode, maxFragmentLength)
@@ -0,0 +1,246 @@
+from bedEntry.BedEntry import BedEntry
+from bedContainer.BedColumns import BedColumns, BedColumns6
+from collections import OrderedDict
+from typing import Generator, List, Tuple, Union
+
+import pysam
+
+
+class TabixBedContainer(object):
+    '''
+    Represents a read-only *BedContainer* over a bgzipped and tabix-indexed Bed File, without loading it in memory.
+
+    Only the file blocks required by each request are fetched (through *pysam.TabixFile*), and the *BedEntry* /
+    *BedEntry6* objects are created on demand. Region queries fetch fixed size genomic windows, and the most recently
+    used windows are kept parsed in a LRU cache.
+
+    '''
+
+    def __init__(self, BedFilePath: str, columns: int = 3, addExtras: bool = False, windowSize: int = 100000,
+                 cacheSize: int = 256) -> None:
+        """
+        Creates an instance of TabixBedContainer object.
+
+        :param str BedFilePath: Path to the bgzipped Bed File, with its tabix index (".tbi" or ".csi").
+        :param int columns: Number of core columns, 3 (*BedEntry*) or 6 (*BedEntry6*). (default 3)
+        :param bool addExtras: *True* if the Bed Entries have extra fields, *False* otherwise.
+        :param int windowSize: Size (bp) of the genomic windows fetched and cached by region queries. (default 100000)
+        :param int cacheSize: Maximum number of windows in the cache. (default 256)
+        """
+        if columns not in (3, 6):
+            raise ValueError("Number of columns {} is not 3 or 6.".format(columns))
+
+        self.addExtras: bool = addExtras
+        self.tabixFile: pysam.TabixFile = pysam.TabixFile(BedFilePath)
+        self.chrList: List[str] = list(self.tabixFile.contigs)
+        self.chrCounts: int = len(self.chrList)
+        self.windowSize: int = windowSize
+        self.cacheSize: int = cacheSize
+        self._columnsClass = BedColumns6 if columns == 6 else BedColumns
+        self._windowCache: OrderedDict = OrderedDict()
+
+    ###################
+    ##  Properties   ##
+    ###################
+
+    def select_Chromosomes(self) -> List[str]:
+        """
+        Returns all chromosome names present in the tabix index.
+
+        :return List: Return a List of strings representing chromosome names.
+        """
+        return self.chrList
+
+    def _parse(self, chrom: str, lines: List[str], region: str) -> BedColumns:
+        """
+        Parses Bed File lines of chromosome *chrom* into a column storage. Malformed lines are reported by their position
+        in the fetched *region* (the file line numbers are not known).
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param str chrom: Chromosome name of the lines.
+        :param List[str] lines: Bed File lines fetched from the tabix file.
+        :param str region: Fetched region ("chrom:start-end", or the chromosome name).
+        :return BedColumns: The parsed rows.
+        """
+        columns = self._columnsClass(chrom)
+        rows = [line.strip().split("\t") for line in lines]
+        labels = ["{} of region {}".format(position, region) for position in range(1, len(rows) + 1)]
+        columns.extendLines(rows, labels, self.addExtras)
+        return columns
+
+    def _fetch(self, chrom: str, start: Union[None, int] = None, end: Union[None, int] = None) -> BedColumns:
+        """
+        Fetches and parses the rows overlapping a region (half-open, as tabix), or a whole chromosome. Not cached.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param str chrom: Chromosome name.
+        :param None,int start: Start coordinate of the region. (optional)
+        :param None,int end: End coordinate of the region. (optional)
+        :return BedColumns: The parsed rows.
+        """
+        if chrom not in self.chrList:
+            return self._columnsClass(chrom)
+        region = chrom if start is None else "{}:{}-{}".format(chrom, start, end)
+        return self._parse(chrom, list(self.tabixFile.fetch(chrom, start, end)), region)
+
+    def _window(self, chrom: str, window: int) -> BedColumns:
+        """
+        Returns the parsed rows of a genomic window, from the LRU cache or fetching them.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param str chrom: Chromosome name.
+        :param int window: Window number (the window starts at *window* x *windowSize*).
+        :return BedColumns: The parsed rows overlapping the window.
+        """
+        key = (chrom, window)
+        columns = self._windowCache.get(key)
+        if columns is not None:
+            self._windowCache.move_to_end(key)
+            return columns
+        columns = self._fetch(chrom, window * self.windowSize, (window + 1) * self.windowSize)
+        self._windowCache[key] = columns
+        if len(self._windowCache) > self.cacheSize:
+            self._windowCache.popitem(last=False)
+        return columns
+
+    def _overlappingRows(self, chr: str, start: int, end: int) -> Generator[Tuple[BedColumns, int], None, None]:
+        """
+        Yields (window rows, row position) of every entry overlapping the region, using the same rule of
+        *BedEntry.isOverlapping*. Entries spanning several windows are only given once, by the first window.
+
+        | Because of its internal function inside the class, it remains private.
+
+        :param str chr: the chromosome where region is located
+        :param int start: the start coordinate of the region
+        :param int end: the end coordinate of the region
+        """
+        # Entries just touching the region are also overlapping, so one more bp is fetched on each side.
+        firstWindow = max(start - 1, 0) // self.windowSize
+        lastWindow = end // self.windowSize
+        for window in range(firstWindow, lastWindow + 1):
+            columns = self._window(chr, window)
+            windowStart = window * self.windowSize
+            for index in range(len(columns)):
+                sCoord = columns.sCoords[index]
+                if window > firstWindow and sCoord < windowStart:
+                    continue
+                if sCoord <= end and start <= columns.eCoords[index]:
+                    yield columns, index
+
+    def query(self, chr: str, start: int, end: int, strand: Union[None, str] = None) -> List[BedEntry]:
+        """
+        Returns all *BedEntry* (or *BedEntry6*) objects overlapping the region, fetching only the windows required.
+
+        It is used the same rule of :py:meth:`~bedEntry.BedEntry.BedEntry.isOverlapping`, so entries just touching
+        the region are also returned, as in :py:meth:`~bedContainer.BedContainer.BedContainer.query`.
+
+        :param str chr: the chromosome where region is located
+        :param int start: the start coordinate of the region
+        :param int end: the end coordinate of the region
+        :param None,"+","-" strand: If given, only entries in this DNA strand are returned (6 columns only).
+        :return List: A List of all *BedEntry* overlapping the region.
+        """
+        if strand is not None and self._columnsClass is not BedColumns6:
+            raise ValueError("Bed entries with 3 columns have no strand.")
+        if chr not in self.chrList:
+            return []
+        strandCode = None if strand is None else BedColumns6.STRAND_CODES[strand]
+        return [columns.entry(index) for columns, index in self._overlappingRows(chr, start, end)
+                if strandCode is None or columns.strands[index] == strandCode]
+
+    def findEntriesWith(self, chr="Any", sCoord="Any", eCoord="Any") -> List[BedEntry]:
+        """
+        Return all BedEntry objects having chr or sCoord or eCoord equal to the given ones.
+
+        If *sCoord* or *eCoord* are given, only the file blocks around those coordinates are fetched. Otherwise, all the
+        chromosome (or the whole file, if *chr* is not given) is read.
+
+        :param str chr: the chromosome where region is located
+        :param int sCoord: the start coordinate of the region
+        :param int eCoord: the end coordinate of the region
+        :return List: Return a list of BedEntry objects having the given features
+        """
+        if chr != "Any":
+            if chr not in self.chrList:
+                raise ValueError("{} not in Chromosome List!".format(chr))
+            chromosomes = [chr]
+        else:
+            chromosomes = self.chrList
+
+        sCoord = None if sCoord == "Any" else int(sCoord)
+        eCoord = None if eCoord == "Any" else int(eCoord)
+        if (sCoord is not None and sCoord < 0) or (eCoord is not None and eCoord <= 0):
+            # No entry has these coordinates (and tabix can't fetch negative positions).
+            return []
+
+        tmpList = []
+        for chrom in chromosomes:
+            if sCoord is not None:
+                columns = self._fetch(chrom, sCoord, sCoord + 1)
+            elif eCoord is not None:
+                columns = self._fetch(chrom, eCoord - 1, eCoord)
+            else:
+                columns = self._fetch(chrom)
+            for index in range(len(columns)):
+                if sCoord is not None and columns.sCoords[index] != sCoord:
+                    continue
+                if eCoord is not None and columns.eCoords[index] != eCoord:
+                    continue
+                tmpList.append(columns.entry(index))
+        return tmpList
+
+    def select_EntriesInChr(self, chrom: str) -> List[BedEntry]:
+        """
+        Returns all *BedEntry* objects in the specified chromosome, fetching only its blocks.
+
+        If none, an empty list is returned.
+
+        :param str chrom: Chromosome name (*chr*) of *BedEntry* objects to return
+        :return List: A List of all *BedEntry* located in *chrom*
+        """
+        return list(self._fetch(chrom))
+
+    def number_EntriesInChr(self, chrom: str) -> int:
+        """
+        Number of *BedEntry* with input chromosome name, counted by reading its blocks.
+
+        If none, 0 (zero) ir returned.
+
+        :param str chrom: Chromosome name (*chr*) of *BedEntry* objects to count
+        :return: Number of *BedEntry* with input chromosome name.
+        """
+        if chrom not in self.chrList:
+            return 0
+        return sum(1 for _ in self.tabixFile.fetch(chrom))
+
+    def close(self) -> None:
+        """
+        Closes the tabix file and empties the window cache.
+        """
+        self._windowCache.clear()
+        self.tabixFile.close()
+
+    ###########################
+    ##  Build-in Functions   ##
+    ###########################
+
+    def __iter__(self) -> Generator[BedEntry, None, None]:
+        '''
+        Iterator function for TabixBedContainer class, reading one chromosome per time.
+
+        :return BedEntry:  A BedEntry Object
+        '''
+        for chromosome in self.chrList:
+            yield from self._fetch(chromosome)
+
+    def __str__(self):
+        """
+        A meta representation of the *TabixBedContainer*
+
+        :return: String with the *TabixBedContainer* meta representation.
+        """
+        return "TABIX BED CONTAINER:\n\nFile: {}\nNumber Chromosomes: {}\nCached Windows: {}\nAdd Extra Fields: {}" \
+            .format(self.tabixFile.filename.decode(), self.chrCounts, len(self._windowCache), self.addExtras)
@@ -0,0 +1,332 @@
+from bedEntry.BedEntry6 import BedEntry6
+from bedContainer.BedContainer import BedContainer
+from bedContainer.BedContainer6 import BedContainer6
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+
+def writeRandomBed6(path, nEntries, nExtras=0, seed=0):
+    """
+    Writes a random, unsorted, Bed File with 6 columns (plus *nExtras* extra columns) to benchmark with.
+    """
+    rng = random.Random(seed)
+    chromosomes = ["chr{}".format(i) for i in range(1, 23)] + ["chrX", "chrY"]
+    with open(path, 'w') as writeFile:
+        for i in range(nEntries):
+            sCoord = rng.randrange(0, 200000000)
+            extras = "".join("\t{}".format(rng.random()) for _ in range(nExtras))
+            writeFile.write("{}\t{}\t{}\tpeak_{}\t0\t{}{}\n".format(rng.choice(chromosomes), sCoord,
+                                                                  sCoord + rng.randrange(1, 2000), i,
+                                                                  rng.choice("+-"), extras))
+
+
+class PreviousBedEntry6(object):
+    """
+    Previous *BedEntry6*, to compare the parser with: attributes in the instance ``__dict__``, set through the same
+    validating setters (with their *hasattr* checks), and the extra fields in a Dict keyed by their position.
+    """
+
+    def __init__(self, chr, sCoord, eCoord, name, score, strand):
+        self.chr = chr
+        self.sCoord = sCoord
+        self.eCoord = eCoord
+        self.extraFields = {}
+        self.name = name
+        self.score = score
+        self.strand = strand
+
+    @property
+    def chr(self):
+        return self._chr
+
+    @chr.setter
+    def chr(self, value):
+        if type(value) != str:
+            raise ValueError("Chromosome {} is not a string type.".format(value))
+        self._chr = value
+
+    @property
+    def sCoord(self):
+        return self._sCoord
+
+    @sCoord.setter
+    def sCoord(self, value):
+        if type(value) != int:
+            raise ValueError("Start Position {} is not a integer type.".format(value))
+        if value < 0:
+            raise ValueError("Start Position {} is negative.".format(value))
+        if hasattr(self, 'eCoord'):
+            if value >= self.eCoord:
+                raise ValueError("Start Coordinate higher or equal than End Coordinate")
+        self._sCoord = value
+
+    @property
+    def eCoord(self):
+        return self._eCoord
+
+    @eCoord.setter
+    def eCoord(self, value):
+        if not isinstance(value, int):
+            raise ValueError("End Position {} is not a integer type.".format(value))
+        if value < 0:
+            raise ValueError("Start Position {} is negative.".format(value))
+        if hasattr(self, 'sCoord'):
+            if value <= self.sCoord:
+                raise ValueError("End Coordinate lower or equal than Start Coordinate")
+        self._eCoord = value
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        if type(value) != str:
+            raise ValueError("Name {} is not a string type.".format(value))
+        self._name = value
+
+    @property
+    def score(self):
+        return self._score
+
+    @score.setter
+    def score(self, value):
+        if type(value) != int:
+            value = "."
+        self._score = value
+
+    @property
+    def strand(self):
+        return self._strand
+
+    @strand.setter
+    def strand(self, value):
+        if value not in ["+", "-"]:
+            raise ValueError("Strand must to be \'+\' or \'-\'")
+        self._strand = value
+
+    def addExtraField(self, extraField):
+        self.extraFields[len(self.extraFields)] = extraField
+
+
+def readAsPreviousContainer(path, addExtras):
+    """
+    Loads a Bed File as the previous *readFromBedFile* of *BedContainer6*: line by line, creating one
+    *PreviousBedEntry6* per line (see *addFrom_List*) into a Dictionary of Lists.
+    """
+    container = {}
+    chrList = []
+    with open(path) as readFile:
+        for line in readFile:
+            fields = line.strip().split("\t")
+            if fields[0] not in chrList:
+                chrList.append(fields[0])
+                container[fields[0]] = []
+            entry = PreviousBedEntry6(fields[0], int(fields[1]), int(fields[2]), fields[3], fields[4], fields[5])
+            if addExtras:
+                for field in fields[6:]:
+                    entry.addExtraField(field)
+            container[fields[0]].append(entry)
+    return container
+
+
+def readAsObjectLists(path, addExtras):
+    """
+    Loads a Bed File as a Dictionary of Lists of the current (slotted) *BedEntry6* objects, to compare with the methods
+    of *BedEntry6*.
+    """
+    container = {}
+    with open(path) as readFile:
+        for line in readFile:
+            fields = line.strip().split("\t")
+            entry = BedEntry6(fields[0], int(fields[1]), int(fields[2]), fields[3], fields[4], fields[5])
+            if addExtras:
+                for field in fields[6:]:
+                    entry.addExtraField(field)
+            container.setdefault(fields[0], []).append(entry)
+    return container
+
+
+def measure(label, function):
+    """
+    Runs *function* and prints its run time and the memory held by its result (using tracemalloc).
+    """
+    tracemalloc.start()
+    start = time.time()
+    result = function()
+    elapsed = time.time() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("{:<45}{:>10.2f} s{:>12.1f} MB{:>12.1f} MB (peak)".format(label, elapsed, current / 2 ** 20, peak / 2 ** 20))
+    return result
+
+
+def benchmarkStorage(path):
+    """
+    Compares the columnar *BedContainer6* with lists of *BedEntry6* objects (the previous layout of the container, with
+    the current slotted entries).
+    """
+    print("\n## Storage layout (load / memory held)")
+    objects = measure("list of BedEntry6 objects", lambda: readAsObjectLists(path, True))
+
+    def readColumns():
+        container = BedContainer6(addExtras=True)
+        container.readFromBedFile(path)
+        return container
+    container = measure("BedContainer6 (columns)", readColumns)
+
+    print("\n## Storage layout (sort / iterate)")
+    start = time.time()
+    for chrom in objects:
+        objects[chrom] = sorted(objects[chrom])
+    print("{:<45}{:>10.2f} s".format("sort list of BedEntry6 objects", time.time() - start))
+    start = time.time()
+    container.sort()
+    print("{:<45}{:>10.2f} s".format("sort BedContainer6 (columns)", time.time() - start))
+
+    start = time.time()
+    for chrom in objects:
+        for entry in objects[chrom]:
+            pass
+    print("{:<45}{:>10.2f} s".format("iterate list of BedEntry6 objects", time.time() - start))
+    start = time.time()
+    for entry in container:
+        pass
+    print("{:<45}{:>10.2f} s".format("iterate BedContainer6 (columns)", time.time() - start))
+    start = time.time()
+    for row in container.iterRows():
+        pass
+    print("{:<45}{:>10.2f} s".format("iterRows BedContainer6 (columns)", time.time() - start))
+    start = time.time()
+    for row in container.iterRows(addExtras=True):
+        pass
+    print("{:<45}{:>10.2f} s".format("iterRows BedContainer6, split extra fields", time.time() - start))
+
+
+def timed(label, function, reference=None):
+    """
+    Runs *function* and prints its run time (and the speedup over the *reference* time, if given).
+    """
+    start = time.time()
+    result = function()
+    elapsed = time.time() - start
+    speedup = "" if reference is None else "{:>10.1f}x".format(reference / elapsed)
+    print("{:<45}{:>10.2f} s{}".format(label, elapsed, speedup))
+    return elapsed, result
+
+
+def benchmarkParser(path):
+    """
+    Compares the bulk parser of *readFromBedFile*, with and without the trusted mode, with the previous *readFromBedFile*
+    (line by line, one *PreviousBedEntry6* per line). Loading lists of the current slotted *BedEntry6* objects is also
+    shown, as a faster reference.
+    """
+    print("\n## Bed File parser")
+    reference, _ = timed("previous readFromBedFile (__dict__ entries)", lambda: readAsPreviousContainer(path, True))
+    timed("line by line slotted BedEntry6 objects", lambda: readAsObjectLists(path, True), reference)
+
+    def readBulk(trusted):
+        container = BedContainer6(addExtras=True)
+        container.readFromBedFile(path, trusted=trusted)
+    timed("readFromBedFile", lambda: readBulk(False), reference)
+    timed("readFromBedFile(trusted=True)", lambda: readBulk(True), reference)
+
+
+def benchmarkSort(path):
+    """
+    Compares *BedContainer6.sort* (packed integer keys) with sorting lists of *BedEntry6* objects through their
+    comparison operators, on unsorted and already sorted entries.
+    """
+    print("\n## Sort")
+    objects = readAsObjectLists(path, False)
+    reference, _ = timed("sorted() of BedEntry6 objects", lambda: [sorted(objects[chrom]) for chrom in objects])
+
+    container = BedContainer6()
+    container.readFromBedFile(path, trusted=True)
+    timed("BedContainer6.sort(chromOrder=\"natural\")", lambda: container.sort(chromOrder="natural"), reference)
+    timed("BedContainer6.sort() (already sorted)", container.sort, reference)
+
+
+def benchmarkSlop(path):
+    """
+    Compares *BedContainer6.slop* and *BedContainer6.shift* (one vectorized pass per chromosome) with the per entry
+    *addLeftClip* / *addRightClip* and *shift* of *BedEntry6* objects, considering the strand.
+    """
+    print("\n## Slop / Shift")
+    objects = readAsObjectLists(path, False)
+
+    def slopObjects():
+        for entries in objects.values():
+            for entry in entries:
+                try:
+                    entry.addLeftClip(500, considerStrand=True)
+                    entry.addRightClip(200, considerStrand=True)
+                except ValueError:
+                    # Per entry setters can't clip to the chromosome start.
+                    pass
+    reference, _ = timed("BedEntry6 addLeftClip / addRightClip", slopObjects)
+
+    container = BedContainer6()
+    container.readFromBedFile(path, trusted=True)
+    timed("BedContainer6.slop(considerStrand=True)", lambda: container.slop(500, 200, considerStrand=True), reference)
+
+    def shiftObjects():
+        for entries in objects.values():
+            for entry in entries:
+                try:
+                    entry.shift(100, considerStrand=True)
+                except ValueError:
+                    pass
+    reference, _ = timed("BedEntry6 shift", shiftObjects)
+    timed("BedContainer6.shift(considerStrand=True)", lambda: container.shift(100, considerStrand=True), reference)
+
+
+def nestedIntersect(nEntries):
+    """
+    Runs *intersect(mode="overlapping")* with one long A entry containing *nEntries* short A entries, each one
+    overlapping a short B entry, and returns its run time. Fails if an A entry is missing from the result.
+    """
+    containerA = BedContainer()
+    containerB = BedContainer()
+    containerA.addFrom_List(["chr1", 0, 10 * nEntries + 100])
+    for i in range(nEntries):
+        containerA.addFrom_List(["chr1", 10 * i + 1, 10 * i + 5])
+        containerB.addFrom_List(["chr1", 10 * i + 2, 10 * i + 4])
+    start = time.time()
+    overlapping = containerA.intersect(containerB, mode="overlapping")
+    elapsed = time.time() - start
+    assert len(overlapping) == nEntries + 1, "intersect missed A entries overlapping B entries"
+    return elapsed
+
+
+def checkNestedIntersect(nEntries=20000):
+    """
+    Regression check of *intersect* with nested intervals (a long A entry before many short ones), which were rescanned
+    for every A entry: doubling the entries must not take close to 4 times longer (quadratic time).
+    """
+    print("\n## Intersect with nested intervals")
+    elapsed = nestedIntersect(nEntries)
+    print("{:<45}{:>10.2f} s".format("{} nested entries".format(nEntries), elapsed))
+    elapsedDouble = nestedIntersect(2 * nEntries)
+    print("{:<45}{:>10.2f} s".format("{} nested entries".format(2 * nEntries), elapsedDouble))
+    assert elapsedDouble < 3 * elapsed, "intersect of nested intervals is quadratic ({:.2f} s -> {:.2f} s)" \
+        .format(elapsed, elapsedDouble)
+
+
+if __name__ == '__main__':
+    nEntries = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with tempfile.TemporaryDirectory() as tmpDir:
+        bedPath = os.path.join(tmpDir, "benchmark.bed")
+        writeRandomBed6(bedPath, nEntries, nExtras=4)
+        print("Benchmark with {} entries".format(nEntries))
+
+        benchmarkStorage(bedPath)
+        benchmarkParser(bedPath)
+        benchmarkSort(bedPath)
+        benchmarkSlop(bedPath)
+    checkNestedIntersect()
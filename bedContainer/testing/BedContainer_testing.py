@@ -1,10 +1,374 @@
 from bedContainer.BedContainer import BedContainer
 from bedContainer.BedContainer6 import BedContainer6
 from bedContainer.BedContainer12 import BedContainer12
+from bedContainer.BedIO import iterBedFile
+from bedContainer.BedSnapshot import _HEADER
+from bedContainer.BedSort import sortBedFile
+from bedContainer.TabixBedContainer import TabixBedContainer
 
+import os
+import tempfile
 import time
 
+import pysam
+
+CHROM_SIZES = {"chr1": 100, "chr2": 50}
+
+
+def coords(entries):
+    """
+    Returns the (*chr*, *sCoord*, *eCoord*) of each entry.
+    """
+    return [(entry.chr, entry.sCoord, entry.eCoord) for entry in entries]
+
+
+def newContainer6(rows):
+    """
+    Returns a *BedContainer6* with the *rows* (Lists of fields).
+    """
+    container = BedContainer6(addExtras=True)
+    for fields in rows:
+        container.addFrom_List(fields)
+    return container
+
+
+def sampleA():
+    """
+    Returns the A *BedContainer6* of the checks: unsorted, with a nested entry.
+    """
+    return newContainer6([["chr1", 50, 60, "c", 3, "+"], ["chr1", 10, 20, "a", 1, "+"], ["chr1", 15, 30, "b", 2, "-"],
+                          ["chr2", 5, 10, "d", 4, "-"]])
+
+
+def sampleB():
+    """
+    Returns the B *BedContainer6* of the checks.
+    """
+    return newContainer6([["chr1", 18, 55, "x", 0, "+"], ["chr2", 30, 40, "y", 0, "+"]])
+
+
+def writeBed(tmpDir, name, lines):
+    """
+    Writes *lines* (Lists of fields) as a Bed File in *tmpDir* and returns its path.
+    """
+    path = os.path.join(tmpDir, name)
+    with open(path, 'w') as writeFile:
+        writeFile.writelines("\t".join(str(field) for field in fields) + "\n" for fields in lines)
+    return path
+
+
+def checkScoreAggregation(tmpDir):
+    """
+    *mergeIntervals* aggregates the scores of a *BedContainer6* read from a Bed File, ignoring "." scores.
+    """
+    path = writeBed(tmpDir, "scores.bed", [["chr1", 1, 10, "a", 5, "+"], ["chr1", 5, 20, "b", 7, "+"],
+                                           ["chr1", 30, 40, "c", ".", "-"], ["chr2", 1, 3, "d", 900, "-"]])
+    container = BedContainer6()
+    container.readFromBedFile(path)
+    assert [entry.score for entry in container] == [5, 7, ".", 900]
+
+    merged = container.mergeIntervals(aggregate={"score": ["count", "sum", "max", "mean"]})
+    assert [list(entry.extraFields.values()) for entry in merged] == \
+        [["2", "12", "7", "6.0"], ["1", ".", ".", "."], ["1", "900", "900", "900.0"]]
+
+
+def checkReadFromBedFile(tmpDir):
+    """
+    *readFromBedFile* skips headers, keeps extra fields, and reports malformed lines with their line number, unless
+    *trusted* for the coordinate rules.
+    """
+    path = writeBed(tmpDir, "read.bed", [["track name=sample"], ["chr2", 5, 10, "d", 4, "-", "X", "Y"],
+                                         ["chr1", 10, 20, "a", ".", "+", "Z", "W"]])
+    container = BedContainer6(addExtras=True)
+    container.readFromBedFile(path)
+    assert container.chrList == ["chr2", "chr1"] and len(container) == 2
+    assert [list(entry.extraFields.values()) for entry in container] == [["X", "Y"], ["Z", "W"]]
+
+    path = writeBed(tmpDir, "malformed.bed", [["chr1", 10, 20], ["chr1", 30, 25]])
+    try:
+        BedContainer().readFromBedFile(path)
+        raise AssertionError("A start coordinate higher than the end coordinate was read.")
+    except ValueError as error:
+        assert "line 2" in str(error)
+    trusted = BedContainer()
+    trusted.readFromBedFile(path, trusted=True)
+    assert coords(trusted) == [("chr1", 10, 20), ("chr1", 30, 25)]
+
+
+def checkRemoveAndFilter():
+    """
+    *removeEntries*, *removeWhere* and *filter* keep the other entries in order, and the counters updated.
+    """
+    container = sampleA()
+    container.removeEntries([container[0], container[3]])
+    assert coords(container) == [("chr1", 10, 20), ("chr1", 15, 30)]
+    assert container.chrList == ["chr1"] and container.entryCounts == 2
+
+    container = sampleA()
+    assert container.removeWhere(lambda entry: entry.strand == "-") == 2
+    assert coords(container) == [("chr1", 50, 60), ("chr1", 10, 20)]
+
+    selected = sampleA().filter(lambda entry: entry.score > 1)
+    assert type(selected) == BedContainer6
+    assert [entry.name for entry in selected] == ["c", "b", "d"]
+
+
+def checkIteration(tmpDir):
+    """
+    Iterating over the entries and *iterRows* give the same rows, in the *BedContainer* order.
+    """
+    container = sampleA()
+    container.addFrom_List(["chr2", 20, 30, "e", ".", "+", "X", "Y"])
+    assert [str(entry) for entry in container] == ["\t".join(map(str, row)) for row in container.iterRows()]
+    assert [entry.extras for entry in container] == [row[-1] for row in container.iterRows(addExtras=True)]
+    assert list(container.iterRows("chr2", addExtras=True)) == [("chr2", 5, 10, "d", 4, "-", ()),
+                                                                ("chr2", 20, 30, "e", ".", "+", ("X", "Y"))]
+    assert list(container.iterRows("chr3")) == []
+
+    path = writeBed(tmpDir, "rows.bed", [["chr1", 10, 20, "A"], ["chr1", 30, 40]])
+    container = BedContainer(addExtras=True)
+    container.readFromBedFile(path)
+    assert list(container.iterRows(addExtras=True)) == [("chr1", 10, 20, ("A",)), ("chr1", 30, 40, ())]
+    assert [entry.extras for entry in container] == [("A",), ()]
+
+
+def checkFindEntriesWith():
+    """
+    *findEntriesWith* of *BedContainer6* selects by name, strand and extra fields.
+    """
+    container = sampleA()
+    container.addFrom_List(["chr1", 70, 80, "e", 5, "+", "X"])
+    assert [entry.name for entry in container.findEntriesWith(strand="-")] == ["b", "d"]
+    assert [entry.name for entry in container.findEntriesWith(chr="chr1", name="a")] == ["a"]
+    assert [entry.name for entry in container.findEntriesWith(extraFields={0: "X"})] == ["e"]
+
+
+def checkOverlaps():
+    """
+    *buildOverlapIndex* / *query*, *intersect*, *subtract* and *closest*, leaving B unchanged.
+    """
+    containerA = sampleA()
+    containerB = sampleB()
+    containerA.buildOverlapIndex()
+    assert [entry.name for entry in containerA.query("chr1", 18, 52)] == ["c", "a", "b"]
+    assert [entry.name for entry in containerA.query("chr1", 18, 52, strand="-")] == ["b"]
+    assert containerA.query("chr3", 0, 10) == []
+
+    pairs = containerA.intersect(containerB)
+    assert [(entryA.name, entryB.name) for entryA, entryB in pairs] == [("a", "x"), ("b", "x"), ("c", "x")]
+    assert [entry.name for entry in containerA.intersect(containerB, mode="overlapping")] == ["a", "b", "c"]
+    assert [entry.name for entry in containerA.intersect(containerB, mode="notOverlapping")] == ["d"]
+    assert [entry.name for entry in containerA.intersect(containerB, considerStrand=True, mode="overlapping")] == \
+        ["a", "c"]
+
+    pieces = containerA.subtract(containerB)
+    assert coords(pieces) == [("chr1", 10, 18), ("chr1", 15, 18), ("chr1", 55, 60), ("chr2", 5, 10)]
+    assert [entry.name for entry in pieces] == ["a", "b", "c", "d"]
+    assert coords(containerB) == [("chr1", 18, 55), ("chr2", 30, 40)]
+
+    closest = containerA.closest(containerB)
+    assert [(entryA.name, entryB.name, distance) for entryA, entryB, distance in closest] == \
+        [("a", "x", 0), ("b", "x", 0), ("c", "x", 0), ("d", "y", 20)]
+    closest = containerA.closest(containerB, considerStrand=True)
+    assert [(entryA.name, entryB.name) for entryA, entryB, _ in closest] == [("a", "x"), ("c", "x")]
+
+
+def checkSlopShiftFlank():
+    """
+    *slop*, *shift* and *flank* follow the strand and are clipped to the chromosome sizes.
+    """
+    container = newContainer6([["chr1", 10, 20, "a", 1, "+"], ["chr1", 90, 95, "b", 2, "-"]])
+    assert container.slop(5, 2, considerStrand=True, chromSizes=CHROM_SIZES) == 0
+    assert coords(container) == [("chr1", 5, 22), ("chr1", 88, 100)]
+    container.shift(-10, chromSizes=CHROM_SIZES)
+    assert coords(container) == [("chr1", 0, 12), ("chr1", 78, 90)]
+
+    container = newContainer6([["chr1", 10, 20, "a", 1, "+"], ["chr1", 90, 95, "b", 2, "-"]])
+    flanks = container.flank(5, 2, considerStrand=True, chromSizes=CHROM_SIZES)
+    assert coords(flanks) == [("chr1", 5, 10), ("chr1", 20, 22), ("chr1", 88, 90), ("chr1", 95, 100)]
+    assert [entry.name for entry in flanks] == ["a", "a", "b", "b"]
+
+
+def checkMergeComplementCoverage(tmpDir):
+    """
+    *mergeIntervals*, *complement*, *iterCoverage*, *coverage* and *writeBedGraph* on the same entries.
+    """
+    container = sampleA()
+    merged = container.mergeIntervals(aggregate={"name": "distinct"})
+    assert coords(merged) == [("chr1", 10, 30), ("chr1", 50, 60), ("chr2", 5, 10)]
+    assert [list(entry.extraFields.values()) for entry in merged] == [["a,b"], ["c"], ["d"]]
+    assert coords(container.mergeIntervals(distance=20)) == [("chr1", 10, 60), ("chr2", 5, 10)]
+
+    assert coords(container.complement(CHROM_SIZES)) == [("chr1", 0, 10), ("chr1", 30, 50), ("chr1", 60, 100),
+                                                         ("chr2", 0, 5), ("chr2", 10, 50)]
+
+    runs = [("chr1", 10, 15, 1), ("chr1", 15, 20, 2), ("chr1", 20, 30, 1), ("chr1", 50, 60, 1), ("chr2", 5, 10, 1)]
+    assert list(container.iterCoverage()) == runs
+    assert list(container.iterCoverage(chromSizes={"chr2": 12, "chr1": 100}))[:3] == [("chr2", 0, 5, 0),
+                                                                                     ("chr2", 5, 10, 1),
+                                                                                     ("chr2", 10, 12, 0)]
+    assert [(entry.chr, entry.sCoord, entry.eCoord, int(entry.extraFields[0])) for entry in container.coverage()] == runs
+    stranded = container.coverage(considerStrand=True)
+    assert [(entry.sCoord, entry.eCoord, entry.score, entry.strand) for entry in stranded] == \
+        [(10, 20, 1, "+"), (15, 30, 1, "-"), (50, 60, 1, "+"), (5, 10, 1, "-")]
+
+    path = os.path.join(tmpDir, "coverage.bedGraph")
+    container.writeBedGraph(path)
+    with open(path) as readFile:
+        assert [line.split() for line in readFile][0] == ["chr1", "10", "15", "1"]
+
+
+def checkSchema(tmpDir):
+    """
+    *schema*, *schemaColumn*, *filterField* and *topN* over the typed fields of a narrowPeak file.
+    """
+    path = writeBed(tmpDir, "peaks.narrowPeak", [["chr1", 10, 20, "p1", 0, "+", 5.5, 3, 1.0, 4],
+                                                 ["chr1", 30, 40, "p2", 0, "-", 2.0, 8, 6.0, 2],
+                                                 ["chr2", 5, 15, "p3", 0, "+", 9.0, 1, 3.5, 7]])
+    container = BedContainer6(schema="narrowPeak")
+    container.readFromBedFile(path)
+    assert container.schema.name == "narrowPeak" and container.addExtras
+    assert list(container.schemaColumn("signalValue")) == [5.5, 2.0, 9.0]
+    assert list(container.schemaColumn("qValue", chrom="chr1")) == [1.0, 6.0]
+    assert [entry.name for entry in container.filterField("qValue", ">", 2)] == ["p2", "p3"]
+    assert [entry.name for entry in container.topN("signalValue", 2)] == ["p3", "p1"]
+    assert [entry.name for entry in container.topN("signalValue", 1, largest=False).toContainer()] == ["p2"]
+
+
+def writeBam(tmpDir):
+    """
+    Writes an indexed BAM file with 10 bp reads on chr1: 3 in [10, 20), 1 in [50, 60) on the "-" strand and 1 in
+    [90, 100). Returns its path.
+    """
+    path = os.path.join(tmpDir, "reads.bam")
+    header = {"HD": {"VN": "1.0", "SO": "coordinate"}, "SQ": [{"SN": name, "LN": size}
+                                                              for name, size in CHROM_SIZES.items()]}
+    with pysam.AlignmentFile(path, "wb", header=header) as bamFile:
+        for i, (start, reverse) in enumerate([(10, False), (10, False), (10, False), (50, True), (90, False)]):
+            read = pysam.AlignedSegment()
+            read.query_name = "read{}".format(i)
+            read.query_sequence = "A" * 10
+            read.flag = 16 if reverse else 0
+            read.reference_id = 0
+            read.reference_start = start
+            read.mapping_quality = 30
+            read.cigarstring = "10M"
+            read.query_qualities = pysam.qualitystring_to_array("I" * 10)
+            bamFile.write(read)
+    pysam.index(path)
+    return path
+
+
+def checkReadCounting(tmpDir):
+    """
+    *countReads*, *countReadsMatrix* and *profileMatrix* over a small BAM file.
+    """
+    bam = writeBam(tmpDir)
+    container = newContainer6([["chr1", 12, 18, "a", 0, "+"], ["chr1", 40, 70, "b", 0, "+"],
+                               ["chr2", 0, 10, "c", 0, "-"]])
+    assert list(container.countReads(bam)) == [3, 1, 0]
+    assert list(container.countReads(bam, considerStrand=True)) == [3, 0, 0]
+    assert container.countReadsMatrix([bam, bam]).tolist() == [[3, 1, 0], [3, 1, 0]]
+    assert container.countReadsMatrix([bam, bam], processes=2).tolist() == [[3, 1, 0], [3, 1, 0]]
+
+    profile = container.profileMatrix(bam, nBin=3)
+    assert profile.shape == (3, 3)
+    assert profile[1].tolist() == [0, 1, 0]
+
+
+def writeCorrupted(path, data, position):
+    """
+    Writes *data* to *path* with the byte in *position* flipped.
+    """
+    with open(path, 'wb') as writeFile:
+        writeFile.write(data[:position] + bytes([data[position] ^ 0xFF]) + data[position + 1:])
+
+
+def assertRefused(load):
+    """
+    Fails unless calling *load* raises *ValueError*.
+    """
+    try:
+        load()
+    except ValueError:
+        return
+    raise AssertionError("A corrupted snapshot was loaded.")
+
+
+def checkSnapshotsAndArrow(tmpDir):
+    """
+    *save_binary* / *load_binary* and the Arrow, pandas and Parquet conversions keep every field.
+    """
+    container = sampleA()
+    container.addFrom_List(["chr2", 20, 30, "e", ".", "+", "X", "Y"])
+    expected = [str(entry) for entry in container]
+
+    path = os.path.join(tmpDir, "snapshot.bin")
+    container.save_binary(path)
+    assert [str(entry) for entry in BedContainer6.load_binary(path)] == expected
+    assert [str(entry) for entry in BedContainer6.load_binary(path, mmap=False, verify=True)] == expected
+
+    # The typed columns (end of the file) are only checked with verify, the metadata (after the header) always.
+    with open(path, 'rb') as readFile:
+        data = readFile.read()
+    corrupted = os.path.join(tmpDir, "corrupted.bin")
+    writeCorrupted(corrupted, data, len(data) - 1)
+    BedContainer6.load_binary(corrupted)
+    assertRefused(lambda: BedContainer6.load_binary(corrupted, verify=True))
+    writeCorrupted(corrupted, data, _HEADER.size + 8)
+    assertRefused(lambda: BedContainer6.load_binary(corrupted))
+
+    table = container.to_arrow()
+    assert table.num_rows == 5 and table.column("start").to_pylist() == [50, 10, 15, 5, 20]
+    assert [str(entry) for entry in BedContainer6.from_arrow(table)] == expected
+    assert [str(entry) for entry in BedContainer6.from_pandas(container.to_pandas())] == expected
+
+    arrowPath = os.path.join(tmpDir, "container.arrow")
+    container.save_arrow(arrowPath)
+    assert [str(entry) for entry in BedContainer6.load_arrow(arrowPath)] == expected
+    parquetPath = os.path.join(tmpDir, "container.parquet")
+    container.save_parquet(parquetPath)
+    assert [str(entry) for entry in BedContainer6.load_parquet(parquetPath)] == expected
+
+
+def checkBedFiles(tmpDir):
+    """
+    *sortBedFile*, *iterBedFile* and *TabixBedContainer* over a Bed File larger than the sort memory limit.
+    """
+    path = writeBed(tmpDir, "unsorted.bed", [["chr{}".format(10 - i % 9), i * 7 % 50, i * 7 % 50 + 5, "n{}".format(i),
+                                              0, "+"] for i in range(200)])
+    sortedPath = os.path.join(tmpDir, "sorted.bed")
+    sortBedFile(path, sortedPath, memoryLimit=2000)
+    entries = list(iterBedFile(sortedPath, columns=6))
+    assert len(entries) == 200
+    assert coords(entries) == sorted(coords(entries), key=lambda row: (int(row[0][3:]), row[1], row[2]))
+
+    pysam.tabix_index(sortedPath, preset="bed", force=True)
+    tabix = TabixBedContainer(sortedPath + ".gz", columns=6)
+    assert tabix.select_Chromosomes() == ["chr2", "chr3", "chr4", "chr5", "chr6", "chr7", "chr8", "chr9", "chr10"]
+    # Entries just touching the region are also returned, as in BedContainer.query.
+    assert coords(tabix.query("chr2", 0, 10)) == [entry for entry in coords(entries) if entry[0] == "chr2" and
+                                                  entry[1] <= 10]
+    assert tabix.number_EntriesInChr("chr10") == len([entry for entry in entries if entry.chr == "chr10"])
+    tabix.close()
+
+
 if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmpDir:
+        checkReadFromBedFile(tmpDir)
+        checkScoreAggregation(tmpDir)
+        checkRemoveAndFilter()
+        checkIteration(tmpDir)
+        checkFindEntriesWith()
+        checkOverlaps()
+        checkSlopShiftFlank()
+        checkMergeComplementCoverage(tmpDir)
+        checkSchema(tmpDir)
+        checkReadCounting(tmpDir)
+        checkSnapshotsAndArrow(tmpDir)
+        checkBedFiles(tmpDir)
+    print("Checks OK")
+
     start = time.time()
     container1 = BedContainer6(addExtras=True)
     container2 = BedContainer6(addExtras=True)
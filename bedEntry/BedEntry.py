@@ -1,13 +1,88 @@
-from typing import List, Dict, Union
+from collections.abc import MutableMapping
+from typing import Iterator, List, Tuple, Union
 import pysam
 
 
+class ExtraFieldsView(MutableMapping):
+    """
+    Dict-like view of the extra fields of a *BedEntry*, keyed by their position (see
+    :py:attr:`~bedEntry.BedEntry.BedEntry.extraFields`). Changes are written back into the extra fields of the entry.
+
+    Positions are contiguous, as the extra fields of a Bed line: a new field can only be added after the last one, and
+    only the last field can be removed.
+
+    """
+
+    __slots__ = ("_entry",)
+
+    def __init__(self, entry: "BedEntry") -> None:
+        """
+        Creates the view of the extra fields of *entry*.
+
+        :param BedEntry entry: BedEntry object.
+        """
+        self._entry = entry
+
+    def __getitem__(self, key: int) -> object:
+        extras = self._entry.extras
+        if type(key) != int or not 0 <= key < len(extras):
+            raise KeyError(key)
+        return extras[key]
+
+    def __setitem__(self, key: int, value: object) -> None:
+        extras = self._entry.extras
+        if type(key) != int or not 0 <= key <= len(extras):
+            raise KeyError("Extra field position {} is not between 0 and {}.".format(key, len(extras)))
+        self._entry._extras = extras[:key] + (value,) + extras[key + 1:]
+
+    def __delitem__(self, key: int) -> None:
+        extras = self._entry.extras
+        if key not in self:
+            raise KeyError(key)
+        if key != len(extras) - 1:
+            raise KeyError("Only the last extra field (position {}) can be removed.".format(len(extras) - 1))
+        self._entry._extras = extras[:-1]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self._entry.extras)))
+
+    def __len__(self) -> int:
+        return len(self._entry.extras)
+
+    def popitem(self) -> Tuple[int, object]:
+        """
+        Removes and returns the last extra field, as (position, value).
+
+        :return Tuple: (position, value)
+        """
+        extras = self._entry.extras
+        if not extras:
+            raise KeyError("popitem(): no extra fields")
+        self._entry._extras = extras[:-1]
+        return len(extras) - 1, extras[-1]
+
+    def clear(self) -> None:
+        """
+        Removes all the extra fields.
+        """
+        self._entry._extras = ()
+
+    def __repr__(self) -> str:
+        return repr(dict(enumerate(self._entry.extras)))
+
+
 class BedEntry(object):
     """
     Represents a Bed line of Bed file, composed by 3 core column.
 
+    Attributes are kept in ``__slots__`` (no instance ``__dict__``) and the extra fields in a tuple, so millions of
+    entries can be kept in memory. Entries read from Bed Files may keep the extra fields as the raw tail of the line,
+    split only when they are read.
+
     """
 
+    __slots__ = ("_chr", "_sCoord", "_eCoord", "_extras")
+
     def __init__(self, chr: str, sCoord: int, eCoord: int, extraFields: Union[None, List] = None) -> None:
         """
         Create an instance of BedEntry object.
@@ -22,11 +97,26 @@ class BedEntry(object):
         self.chr = chr
         self.sCoord = sCoord
         self.eCoord = eCoord
-        self.extraFields = {}
+        self._extras = tuple(extraFields) if extraFields is not None else ()
+
+    @classmethod
+    def fromValidated(cls, chr: str, sCoord: int, eCoord: int, extras: Tuple = ()) -> "BedEntry":
+        """
+        Creates an instance of BedEntry object from values already validated (e.g. stored in a *BedContainer*), skipping
+        the checks of the property setters.
 
-        if extraFields is not None:
-            for field in extraFields:
-                self.addExtraField(field)
+        :param str chr: the chromosome where region is located
+        :param int sCoord: the start coordinate of the region
+        :param int eCoord: the end coordinate of the region
+        :param Tuple,str extras: Additional fields to the standard 3 columns, or their tab separated raw string. (optional)
+        :return BedEntry: A new BedEntry object.
+        """
+        obj = cls.__new__(cls)
+        obj._chr = chr
+        obj._sCoord = sCoord
+        obj._eCoord = eCoord
+        obj._extras = extras
+        return obj
 
     ###################
     ##  Properties   ##
@@ -139,31 +229,63 @@ class BedEntry(object):
         self._eCoord = None
 
     @property
-    def extraFields(self) -> Dict:
+    def extraFields(self) -> ExtraFieldsView:
         """
-        Get the Extra Fields (*extraFields*) in a Dict format.
+        Get the Extra Fields (*extraFields*) in a Dict format, keyed by their position.
 
-        - Key1 -> Value1
-        - Key2 -> Value2
+        - 0 -> Value1
+        - 1 -> Value2
         - ...
 
-        :getter: Returns end coordinate
-        :setter: In case of List as input, it restores the Dict of ExtraFields with the elements in the input List.
-        :type: List,None
+        Fields changed through it (e.g. ``entry.extraFields[0] = value``) are changed in the BedEntry (see
+        :py:class:`~bedEntry.BedEntry.ExtraFieldsView`).
+
+        :getter: Returns the extra fields
+        :setter: Sets the extra fields from a Dict (in the format above) or a List.
+        :type: Dict,List
 
         """
-        return self._extraFields
+        return ExtraFieldsView(self)
 
     @extraFields.setter
     def extraFields(self, value):
-        self._extraFields = value
+        if isinstance(value, dict):
+            value = [value[key] for key in sorted(value)]
+        self._extras = tuple(value)
 
     @extraFields.deleter
     def extraFields(self):
         """
-        Empty extraFields to an empty Dict
+        Empty extraFields
         """
-        self._extraFields = {}
+        self._extras = ()
+
+    @property
+    def extras(self) -> Tuple:
+        """
+        Get the Extra Fields (*extras*) as a tuple, in their order.
+
+        :getter: Returns the extra fields
+        :type: Tuple
+
+        """
+        if type(self._extras) == str:
+            self._extras = tuple(self._extras.split("\t"))
+        return self._extras
+
+    @property
+    def rawExtras(self) -> str:
+        """
+        Get the Extra Fields (*rawExtras*) as they are written in a Bed File line: tab separated, without splitting them
+        if they are still the raw tail of the line read.
+
+        :getter: Returns the extra fields string
+        :type: str
+
+        """
+        if type(self._extras) == str:
+            return self._extras
+        return "\t".join(self._extras)
 
     ##################
     ##  Functions   ##
@@ -175,8 +297,7 @@ class BedEntry(object):
 
         :param List extraField: List of extra Fields in the required order
         """
-        n_extra_fields = self.lenExtraFields()
-        self.extraFields[n_extra_fields] = extraField
+        self._extras = self.extras + (extraField,)
 
     def hasExtraFields(self) -> bool:
         """
@@ -184,7 +305,7 @@ class BedEntry(object):
 
         :return bool: True / False
         """
-        return self.lenExtraFields() > 0
+        return len(self._extras) > 0
 
     def lenExtraFields(self) -> int:
         """
@@ -192,7 +313,7 @@ class BedEntry(object):
 
         :return int: Number of Extra fields
         """
-        return len(self.extraFields.keys())
+        return len(self.extras)
 
     def isOverlapping(self, other):
         """
@@ -263,6 +384,9 @@ class BedEntry(object):
         """
         from bedContainer.BedContainer import BedContainer
 
+        if nBin > len(self):
+            raise ValueError("Number of bins {} higher than the region length {}.".format(nBin, len(self)))
+
         # Initialize BedContainer to return
         bedContainerToReturn = BedContainer(addExtras=True)
         quotient, remainder = divmod(len(self), nBin)
@@ -277,7 +401,7 @@ class BedEntry(object):
                 int_sCoord += number_bp_per_bin[i-1]
                 int_eCoord += number_bp_per_bin[i]
             # Create BedEntry object
-            newBin = BedEntry(self.chr, int_sCoord, int_eCoord, list(self.extraFields.values()))
+            newBin = BedEntry.fromValidated(self.chr, int_sCoord, int_eCoord, self.extras)
 
             # Add to BedContainer
             bedContainerToReturn.addFrom_BedEntryObj(newBin)
@@ -1,5 +1,5 @@
 from .BedEntry import BedEntry
-from typing import TypeVar
+from typing import Tuple, TypeVar, Union
 
 BedContainer6 = TypeVar('BedContainer6')
 
@@ -10,6 +10,8 @@ class BedEntry6(BedEntry):
 
     """
 
+    __slots__ = ("_name", "_score", "_strand")
+
     def __init__(self, chr, sCoord, eCoord, name, score, strand, extraFields=None):
         """
 
@@ -26,6 +28,33 @@ class BedEntry6(BedEntry):
         self.score = score
         self.strand = strand
 
+    @classmethod
+    def fromValidated(cls, chr: str, sCoord: int, eCoord: int, name: str, score: Union[int, str], strand: str,
+                      extras: Tuple = ()) -> "BedEntry6":
+        """
+        Creates an instance of BedEntry6 object from values already validated (e.g. stored in a *BedContainer6*),
+        skipping the checks of the property setters.
+
+        :param str chr: chromosome name where region is located
+        :param int sCoord: start coordinate of region
+        :param int eCoord: end coordinate of region
+        :param str name: name of genomic feature
+        :param int,str score: score of genomic feature
+        :param "+","-" strand: DNA strand where the region belongs
+        :param Tuple,str extras: Additional fields to the standard 6 columns, or their tab separated raw string. (optional)
+        :return BedEntry6: A new BedEntry6 object.
+        """
+        # Slots are set here instead of calling super(), since it is used for every row read from a *BedContainer6*.
+        obj = cls.__new__(cls)
+        obj._chr = chr
+        obj._sCoord = sCoord
+        obj._eCoord = eCoord
+        obj._extras = extras
+        obj._name = name
+        obj._score = score
+        obj._strand = strand
+        return obj
+
     ###################
     ##  Properties   ##
     ###################
@@ -209,6 +238,9 @@ class BedEntry6(BedEntry):
         :return BedContainer: A *BedContainer* where are storage the *BedEntry* bins created
         """
 
+        if nBin > len(self):
+            raise ValueError("Number of bins {} higher than the region length {}.".format(nBin, len(self)))
+
         # Initialize BedContainer to return
         from bedContainer.BedContainer6 import BedContainer6
 
@@ -226,8 +258,8 @@ class BedEntry6(BedEntry):
                 int_eCoord += number_bp_per_bin[i]
 
             # Create BedEntry object
-            newBin = BedEntry6(self.chr, int_sCoord, int_eCoord, self.name, self.score, self.strand,
-                               list(self.extraFields.values()))
+            newBin = BedEntry6.fromValidated(self.chr, int_sCoord, int_eCoord, self.name, self.score, self.strand,
+                                             self.extras)
 
             # Add to BedContainer
             bedContainerToReturn.addFrom_BedEntryObj(newBin)
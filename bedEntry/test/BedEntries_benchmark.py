@@ -0,0 +1,65 @@
+from bedEntry.BedEntry import BedEntry
+from bedEntry.BedEntry6 import BedEntry6
+
+import sys
+import time
+import tracemalloc
+
+
+class DictBedEntry6(object):
+    """
+    Previous layout of *BedEntry6*, to compare with: attributes in the instance ``__dict__`` and the extra fields in
+    a Dict keyed by their position.
+    """
+
+    def __init__(self, chr, sCoord, eCoord, name, score, strand, extraFields=None):
+        self._chr = chr
+        self._sCoord = sCoord
+        self._eCoord = eCoord
+        self._extraFields = dict(enumerate(extraFields)) if extraFields else {}
+        self._name = name
+        self._score = score
+        self._strand = strand
+
+
+def measureEntries(label, nEntries, build):
+    """
+    Creates *nEntries* entries with *build* and prints the run time and the memory held by each entry (using
+    tracemalloc). Coordinates, names and extra fields are created before, so only the entries are measured.
+    """
+    sCoords = list(range(1000000, 1000000 + nEntries))
+    eCoords = [sCoord + 500 for sCoord in sCoords]
+    names = ["peak_{}".format(i) for i in range(nEntries)]
+
+    tracemalloc.start()
+    start = time.time()
+    entries = [build(sCoord, eCoord, name) for sCoord, eCoord, name in zip(sCoords, eCoords, names)]
+    elapsed = time.time() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("{:<50}{:>10.2f} s{:>10.1f} bytes/entry".format(label, elapsed, current / len(entries)))
+    return current / len(entries)
+
+
+if __name__ == '__main__':
+    nEntries = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    extras = ["A", "B"]
+    print("Benchmark with {} entries".format(nEntries))
+
+    print("\n## BedEntry6 without extra fields")
+    reference = measureEntries("__dict__ layout", nEntries,
+                               lambda s, e, name: DictBedEntry6("chr1", s, e, name, 0, "+"))
+    measureEntries("BedEntry6()", nEntries, lambda s, e, name: BedEntry6("chr1", s, e, name, 0, "+"))
+    slotted = measureEntries("BedEntry6.fromValidated()", nEntries,
+                             lambda s, e, name: BedEntry6.fromValidated("chr1", s, e, name, 0, "+"))
+    print("{:<50}{:>21.1f}x".format("memory reduction", reference / slotted))
+
+    print("\n## BedEntry6 with 2 extra fields")
+    reference = measureEntries("__dict__ layout", nEntries,
+                               lambda s, e, name: DictBedEntry6("chr1", s, e, name, 0, "+", extras))
+    slotted = measureEntries("BedEntry6()", nEntries, lambda s, e, name: BedEntry6("chr1", s, e, name, 0, "+", extras))
+    print("{:<50}{:>21.1f}x".format("memory reduction", reference / slotted))
+
+    print("\n## BedEntry")
+    measureEntries("BedEntry()", nEntries, lambda s, e, name: BedEntry("chr1", s, e))
+    measureEntries("BedEntry.fromValidated()", nEntries, lambda s, e, name: BedEntry.fromValidated("chr1", s, e))
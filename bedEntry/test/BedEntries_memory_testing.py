@@ -0,0 +1,30 @@
+from bedEntry.BedEntry6 import BedEntry6
+from bedEntry.test.BedEntries_benchmark import DictBedEntry6, measureEntries
+
+import sys
+
+# Minimum memory reduction of the slotted BedEntry6 over the previous __dict__ layout.
+MIN_REDUCTION = 2.0
+
+
+def checkMemoryReduction(label, nEntries, extras):
+    """
+    Measures (with tracemalloc) the memory held by *nEntries* BedEntry6 objects, with the previous ``__dict__`` layout
+    and with ``__slots__``, and fails if the reduction is lower than *MIN_REDUCTION*.
+    """
+    print("\n## {}".format(label))
+    reference = measureEntries("__dict__ layout", nEntries,
+                               lambda s, e, name: DictBedEntry6("chr1", s, e, name, 0, "+", extras))
+    slotted = measureEntries("BedEntry6()", nEntries, lambda s, e, name: BedEntry6("chr1", s, e, name, 0, "+", extras))
+    reduction = reference / slotted
+    print("{:<50}{:>21.1f}x".format("memory reduction", reduction))
+    assert reduction >= MIN_REDUCTION, "BedEntry6 memory reduction {:.2f}x is lower than {}x ({})" \
+        .format(reduction, MIN_REDUCTION, label)
+
+
+if __name__ == '__main__':
+    nEntries = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print("Memory check with {} entries".format(nEntries))
+    checkMemoryReduction("BedEntry6 without extra fields", nEntries, None)
+    checkMemoryReduction("BedEntry6 with 2 extra fields", nEntries, ["A", "B"])
+    print("\nOK")
@@ -4,7 +4,55 @@ from bedEntry.BedEntry12 import BedEntry12
 import time
 import pysam
 
+
+def checkFromValidated():
+    """
+    *fromValidated* builds the same entries as the constructors, keeping a raw tail of extra fields until it is split.
+    """
+    entry = BedEntry.fromValidated("chr1", 10, 20, ("A", "B"))
+    assert entry == BedEntry("chr1", 10, 20, ["A", "B"]) and entry.extras == ("A", "B")
+
+    entry6 = BedEntry6.fromValidated("chr1", 10, 20, "gene", 5, "-", "A\tB")
+    assert (entry6.name, entry6.score, entry6.strand) == ("gene", 5, "-")
+    assert entry6.rawExtras == "A\tB"
+    assert entry6.extras == ("A", "B") and entry6.rawExtras == "A\tB"
+    assert str(entry6) == str(BedEntry6("chr1", 10, 20, "gene", 5, "-", ["A", "B"]))
+
+
+def checkExtraFieldsView():
+    """
+    *extraFields* is a mapping of contiguous positions, written back into the entry.
+    """
+    entry = BedEntry6("chr1", 10, 20, "gene", 0, "+", ["A", "B"])
+    view = entry.extraFields
+    assert dict(view) == {0: "A", 1: "B"} and len(view) == 2
+    view[1] = "C"
+    view[2] = "D"
+    assert entry.extras == ("A", "C", "D")
+    for key in (4, "0"):
+        try:
+            view[key] = "E"
+            raise AssertionError("Extra field added in position {!r}.".format(key))
+        except KeyError:
+            pass
+    try:
+        del view[0]
+        raise AssertionError("An extra field that is not the last was removed.")
+    except KeyError:
+        pass
+    del view[2]
+    assert view.popitem() == (1, "C") and entry.extras == ("A",)
+    entry.addExtraField("Z")
+    assert entry.rawExtras == "A\tZ"
+    view.clear()
+    assert entry.extras == () and len(view) == 0 and str(entry) == "chr1\t10\t20\tgene\t0\t+"
+
+
 if __name__ == '__main__':
+    checkFromValidated()
+    checkExtraFieldsView()
+    print("Checks OK")
+
     s =time.time()
     bam = pysam.AlignmentFile("test.bam")
 
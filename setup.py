@@ -4,7 +4,8 @@ setup(
     name='BIORSL',
     version='0.0.7',
     packages=['bedEntry', 'bedContainer'],
-    install_requires=['pysam'],
+    install_requires=['pysam', 'numpy'],
+    extras_require={'arrow': ['pyarrow', 'pandas']},
     url='https://github.com/rluis/BIORSL',
     license='GPL-3.0',
     author='rluis',